@@ -0,0 +1,53 @@
+"""
+Сравнение отбора ребер по одному (исходная реализация) и векторизованного отбора `EdgeFilter`
+
+    python -m benchmarks.filter_edges
+"""
+from itertools import combinations
+from time import perf_counter
+
+from shapely import LineString, MultiPolygon
+
+from benchmarks.zones import synthetic_zones
+from optimal_route.utils.visibility import filter_visible_edges
+
+
+def legacy_filter_edges(edges, zone: MultiPolygon) -> set:
+    """Исходная реализация: проверка каждого ребра против всего MultiPolygon"""
+
+    filtered_edges = set()
+
+    for edge in edges:
+        line = LineString(edge)
+        if not line.crosses(zone) and not zone.contains(line):
+            filtered_edges.add(edge)
+
+    return filtered_edges
+
+
+def main() -> None:
+    print(f"{'вершин':>8} {'ребер':>10} {'по одному, с':>14} {'векторно, с':>12} {'ускорение':>10}")
+
+    for vertex_count in (50, 100, 200, 400, 800):
+        zone = synthetic_zones(vertex_count)
+        vertices = {coords for polygon in zone.geoms for coords in polygon.exterior.coords}
+        edges = list(combinations(vertices, 2))
+
+        started = perf_counter()
+        expected = legacy_filter_edges(edges, zone)
+        legacy_time = perf_counter() - started
+
+        started = perf_counter()
+        actual = filter_visible_edges(edges, zone)
+        vectorized_time = perf_counter() - started
+
+        assert actual == expected, "Наборы ребер не совпадают"
+
+        print(
+            f"{len(vertices):>8} {len(edges):>10} {legacy_time:>14.3f} "
+            f"{vectorized_time:>12.3f} {legacy_time / vectorized_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
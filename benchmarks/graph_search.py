@@ -0,0 +1,147 @@
+"""
+Сравнение графа `networkx.Graph` с вершинами-координатами и компактного графа `CsrGraph`:
+память на ребро и время поиска кратчайшего пути
+
+    python -m benchmarks.graph_search
+"""
+import tracemalloc
+from time import perf_counter
+from typing import Callable, Hashable
+
+import numpy as np
+from networkx import Graph
+from networkx.algorithms.shortest_paths.astar import astar_path
+from networkx.exception import NetworkXNoPath
+from pyproj import Geod
+from shapely import LineString, Point
+
+from benchmarks.zones import synthetic_zones
+from optimal_route.engine import RouteEngine
+from optimal_route.utils.route import CsrGraph, find_fastest_route_in_vertices
+
+
+def find_fastest_route_in_graph(
+    graph: Graph,
+    start_point: Point,
+    finish_point: Point,
+    edge_weight: str | Callable,
+    heuristic: Callable | None = None
+) -> LineString:
+    """Исходный поиск A* средствами networkx по графу с вершинами-координатами"""
+
+    source = (start_point.x, start_point.y)
+    target = (finish_point.x, finish_point.y)
+
+    try:
+        return LineString(astar_path(graph, source, target, heuristic=heuristic, weight=edge_weight))  # type: ignore
+    except NetworkXNoPath:
+        raise ValueError("Невозможно проложить маршрут: нет пути между начальной и конечной точками")
+
+
+class GeodesicHeuristic:
+    """
+    Эвристика A* для графа networkx: геодезическое расстояние от вершины графа до конечной точки,
+    расстояния до всех вершин вычисляются одним вызовом `Geod.inv`
+    """
+
+    def __init__(self, geod: Geod, graph: Graph, target: tuple[float, float]) -> None:
+        nodes = list(graph.nodes)
+        coords = np.array(nodes, dtype=float).reshape(-1, 2)
+
+        target_lons = np.full(len(nodes), target[0])
+        target_lats = np.full(len(nodes), target[1])
+        distances = geod.inv(coords[:, 0], coords[:, 1], target_lons, target_lats)[2]
+
+        self._distances = dict(zip(nodes, np.asarray(distances).tolist()))
+
+    def __call__(self, u: Hashable, v: Hashable) -> float:
+        return self._distances[u]
+
+
+def build_networkx_graph(coords: np.ndarray, graph: CsrGraph) -> Graph:
+    """Исходное представление: вершины - кортежи координат, длины ребер в атрибуте `weight`"""
+
+    vertices = list(map(tuple, coords.tolist()))
+    sources = np.repeat(np.arange(graph.number_of_nodes), np.diff(graph.indptr))
+    upper = sources < graph.indices
+
+    networkx_graph = Graph()
+    networkx_graph.add_nodes_from(vertices)
+    networkx_graph.add_weighted_edges_from(
+        (vertices[i], vertices[j], weight)
+        for i, j, weight in zip(sources[upper].tolist(), graph.indices[upper].tolist(), graph.weights[upper].tolist())
+    )
+
+    return networkx_graph
+
+
+def with_itself(graph: CsrGraph, node: int) -> tuple[np.ndarray, np.ndarray]:
+    """Ребра концевой точки, совпадающей с вершиной графа: соседи вершины и сама вершина на нулевом расстоянии"""
+
+    indices, weights = graph.neighbours(node)
+    return np.append(indices, node), np.append(weights, 0.0)
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, memory
+
+
+def main() -> None:
+    geod = Geod(ellps="WGS84")
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'вершин':>8} {'ребер':>10} {'networkx, Б/ребро':>18} {'CSR, Б/ребро':>13} "
+        f"{'networkx, мс':>13} {'CSR, мс':>8} {'ускорение':>10}"
+    )
+
+    for vertex_count in (200, 400, 800, 1600):
+        route_engine = RouteEngine(synthetic_zones(vertex_count), graph_builder="visibility")
+        route_engine.compile()
+
+        coords = route_engine._vertices_coords
+        csr_graph = route_engine._graph
+        assert csr_graph is not None
+
+        networkx_graph, networkx_memory = measure_memory(lambda: build_networkx_graph(coords, csr_graph))
+        _, csr_memory = measure_memory(lambda: CsrGraph(csr_graph.indptr.copy(), csr_graph.indices.copy(), csr_graph.weights.copy()))
+
+        pairs = rng.choice(len(coords), size=(50, 2))
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        networkx_time = csr_time = 0.0
+
+        for start, finish in pairs.tolist():
+            start_point, finish_point = Point(coords[start]), Point(coords[finish])
+
+            started = perf_counter()
+            heuristic = GeodesicHeuristic(geod, networkx_graph, tuple(coords[finish].tolist()))
+            expected = find_fastest_route_in_graph(networkx_graph, start_point, finish_point, "weight", heuristic)
+            networkx_time += perf_counter() - started
+
+            started = perf_counter()
+            distances = np.asarray(geod.inv(
+                coords[:, 0], coords[:, 1],
+                np.full(len(coords), coords[finish, 0]), np.full(len(coords), coords[finish, 1])
+            )[2])
+            actual = find_fastest_route_in_vertices(
+                coords, start_point, finish_point,
+                with_itself(csr_graph, start), with_itself(csr_graph, finish), csr_graph.neighbours, distances
+            )
+            csr_time += perf_counter() - started
+
+            assert abs(geod.geometry_length(actual) - geod.geometry_length(expected)) < 1e-6, "Длины маршрутов не совпадают"
+
+        edge_count = csr_graph.number_of_edges
+        print(
+            f"{len(coords):>8} {edge_count:>10} {networkx_memory / edge_count:>18.0f} {csr_memory / edge_count:>13.0f} "
+            f"{networkx_time / len(pairs) * 1000:>13.2f} {csr_time / len(pairs) * 1000:>8.2f} "
+            f"{networkx_time / csr_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Нагрузочный тест HTTP сервиса: задержка (p50, p99) и пропускная способность при параллельных запросах.
+
+По умолчанию запускает сервис на свободном порту, с `--host` и `--port` нагружает уже запущенный.
+Запросы выбираются из `--unique` различных, поэтому часть одновременных запросов совпадает и объединяется
+
+    python -m benchmarks.load_test --requests 400 --connections 32
+"""
+import argparse
+import asyncio
+import json
+from collections import Counter
+from time import perf_counter
+
+import numpy as np
+from shapely import to_geojson
+
+from benchmarks.zones import synthetic_zones
+from optimal_route.service import RouteService, serve
+
+
+def route_requests(count: int, vertex_count: int, seed: int = 0) -> list[bytes]:
+    """Запросы с одними и теми же запретными зонами и случайными точками по разные стороны от них"""
+
+    rng = np.random.default_rng(seed)
+    zones = json.loads(to_geojson(synthetic_zones(vertex_count, seed=seed)))
+    requests = []
+
+    for _ in range(count):
+        start = [68.0, float(rng.uniform(50, 60))]
+        finish = [92.0, float(rng.uniform(50, 60))]
+        requests.append(json.dumps({
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "geometry": {"type": "Point", "coordinates": start}, "properties": {"name": "start_point"}},
+                {"type": "Feature", "geometry": {"type": "Point", "coordinates": finish}, "properties": {"name": "finish_point"}},
+                {"type": "Feature", "geometry": zones, "properties": {"name": "restricted_polygons", "buffer_distance": 1000}}
+            ]
+        }).encode())
+
+    return requests
+
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str, body: bytes = b"") -> tuple[int, bytes]:
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    return status, await reader.readexactly(int(headers["content-length"]))
+
+
+async def _client(host: str, port: int, requests: list[bytes], latencies: list[float], statuses: Counter) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        while requests:
+            body = requests.pop()
+            start = perf_counter()
+            status, _ = await _request(reader, writer, "POST", "/route", body)
+            latencies.append(perf_counter() - start)
+            statuses[status] += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(host: str, port: int, requests: list[bytes], connections: int) -> None:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    pending = list(requests)
+
+    start = perf_counter()
+    await asyncio.gather(*(_client(host, port, pending, latencies, statuses) for _ in range(connections)))
+    elapsed = perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, stats = await _request(reader, writer, "GET", "/stats")
+    writer.close()
+    await writer.wait_closed()
+
+    print(f"запросов: {len(latencies)}, соединений: {connections}, время: {elapsed:.2f} с")
+    print(f"пропускная способность: {len(latencies) / elapsed:.1f} запросов/с")
+    print(f"задержка p50: {np.percentile(latencies, 50) * 1000:.1f} мс, p99: {np.percentile(latencies, 99) * 1000:.1f} мс")
+    print(f"коды ответов: {dict(sorted(statuses.items()))}")
+    print(f"состояние сервиса: {stats.decode()}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="адрес запущенного сервиса")
+    parser.add_argument("--port", type=int, help="порт запущенного сервиса")
+    parser.add_argument("--requests", type=int, default=400, help="количество запросов")
+    parser.add_argument("--unique", type=int, default=100, help="количество различных запросов")
+    parser.add_argument("--connections", type=int, default=32, help="количество одновременных соединений")
+    parser.add_argument("--vertices", type=int, default=600, help="количество вершин запретных зон")
+    parser.add_argument("--workers", type=int, help="количество процессов запускаемого сервиса")
+    parser.add_argument("--max-queue", type=int, default=100, help="размер очереди запускаемого сервиса")
+    args = parser.parse_args()
+
+    unique = route_requests(args.unique, args.vertices)
+    rng = np.random.default_rng(1)
+    requests = [unique[i] for i in rng.integers(0, len(unique), args.requests)]
+
+    if args.port is not None:
+        await run(args.host or "127.0.0.1", args.port, requests, args.connections)
+        return
+
+    service = RouteService(args.workers, max_queue=args.max_queue)
+    server = await serve(service, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    try:
+        async with server:
+            await run("127.0.0.1", port, requests, args.connections)
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Зависимость времени поиска маршрута от допуска упрощения запретных зон:
+вершины зон после упрощения, время от создания `RouteEngine` до найденного маршрута и удлинение маршрута
+
+    python -m benchmarks.simplification
+"""
+from time import perf_counter
+
+import numpy as np
+import shapely
+from pyproj import Geod
+from shapely import MultiPolygon, Point, Polygon, unary_union
+
+from optimal_route.engine import RouteEngine
+from optimal_route.profiling import RouteProfiler
+from optimal_route.utils.visibility import EdgeFilter
+
+
+BUFFER_DISTANCE = 1000
+
+
+def detailed_zones(polygon_count: int, vertices_per_polygon: int = 300, seed: int = 0) -> MultiPolygon:
+    """Зоны с подробной границей, как у зон из ГИС: крупная форма и мелкие неровности до ~500 м"""
+
+    rng = np.random.default_rng(seed)
+    polygons = []
+
+    for _ in range(polygon_count):
+        center = rng.uniform((70, 50), (90, 60))
+        angles = np.linspace(0, 2 * np.pi, vertices_per_polygon, endpoint=False)
+
+        # Крупная форма из нескольких гармоник и мелкий шум вдоль границы
+        harmonics = rng.uniform(-0.08, 0.08, (2, 4))
+        radii = 0.4 + sum(
+            harmonics[0, k] * np.cos((k + 2) * angles) + harmonics[1, k] * np.sin((k + 2) * angles)
+            for k in range(4)
+        )
+        radii += rng.uniform(-0.005, 0.005, vertices_per_polygon)
+
+        ring = center + np.column_stack((np.cos(angles), np.sin(angles))) * radii[:, None]
+        polygons.append(Polygon(ring))
+
+    union = unary_union(polygons)
+
+    if isinstance(union, Polygon):
+        return MultiPolygon([union])
+
+    return union
+
+
+def main() -> None:
+    geod = Geod(ellps="WGS84")
+    rng = np.random.default_rng(0)
+
+    zones = detailed_zones(12)
+
+    # Маршруты и проверка пересечения строятся по исходным буферизованным зонам
+    original = RouteEngine(zones, BUFFER_DISTANCE).restricted_polygons
+    assert original is not None
+    original_filter = EdgeFilter(original)
+
+    pairs = []
+    while len(pairs) < 10:
+        start_point, finish_point = Point(rng.uniform((70, 50), (90, 60))), Point(rng.uniform((70, 50), (90, 60)))
+        if not (original.contains(start_point) or original.contains(finish_point)):
+            pairs.append((start_point, finish_point))
+
+    print(f"{'допуск, м':>10} {'вершин':>8} {'время, мс':>10} {'удлинение, %':>13}")
+
+    baseline_lengths = None
+
+    for tolerance in (None, 10, 50, 100, 500, 1000, 5000):
+        profiler = RouteProfiler()
+        lengths = []
+        elapsed = 0.0
+
+        for start_point, finish_point in pairs:
+            started = perf_counter()
+            route_engine = RouteEngine(zones, BUFFER_DISTANCE, profiler=profiler, simplify_tolerance=tolerance)
+            try:
+                route = route_engine.find_route(start_point, finish_point, profiler, corridor_pruning=True)
+            except ValueError:
+                route = None
+            elapsed += perf_counter() - started
+
+            if route is None:
+                lengths.append(np.inf)
+                continue
+
+            # Маршрут в обход упрощенных зон не проходит через исходные
+            coords = np.asarray(route.coords)
+            assert original_filter.visible(coords[:-1], coords[1:]).all(), "Маршрут проходит через запретную зону"
+
+            lengths.append(geod.geometry_length(route))
+
+        vertices = shapely.get_num_coordinates(route_engine.restricted_polygons)
+
+        lengths = np.array(lengths)
+        if baseline_lengths is None:
+            baseline_lengths = lengths
+
+        reachable = np.isfinite(lengths) & np.isfinite(baseline_lengths)
+        excess = np.mean(lengths[reachable] / baseline_lengths[reachable] - 1) * 100 if reachable.any() else 0.0
+
+        print(f"{tolerance or 0:>10} {vertices:>8} {elapsed / len(pairs) * 1000:>10.1f} {excess:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Набор бенчмарков на синтетических запретных зонах разной формы, расположения и размера.
+
+Для каждого набора зон замеряются буферизация, отбор видимых ребер, разбор и формирование GeoJSON
+и поиск маршрута целиком с длительностями этапов из `RouteProfiler`. Каждый замер выполняется в отдельном
+процессе, для него записывается прирост пикового потребления памяти процессом. Результаты сохраняются в JSON,
+режим `compare` сравнивает два запуска и отмечает замедления и рост памяти
+
+    python -m benchmarks.suite run -o before.json
+    python -m benchmarks.suite run -o after.json --vertices 100 1000
+    python -m benchmarks.suite compare before.json after.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, get_args
+
+import numpy as np
+import shapely
+from shapely import LineString, MultiPolygon, Point
+
+from benchmarks.zones import ZONES_AREA, ZoneLayout, ZoneShape, synthetic_zones, vertex_count_of
+from optimal_route.main import find_optimal_route, parse_route_request, serialize_route
+from optimal_route.profiling import RouteProfiler
+from optimal_route.utils import buffer
+from optimal_route.utils.buffer import buffer_geometry_in_metres
+from optimal_route.utils.visibility import EdgeFilter
+
+
+BUFFER_DISTANCE = 1000
+
+# Количество случайных пар вершин, видимость которых проверяется в `filter_edges`
+EDGE_SAMPLE_SIZE = 100_000
+
+# Наибольшее число вершин зон, для которого запускается поиск маршрута с данным способом построения графа:
+# полный граф видимости растет квадратично и на десятках тысяч вершин строится минутами
+ROUTE_BENCHMARKS = {
+    "route_visibility": ("visibility", 1_000),
+    "route_tangent": ("tangent", 5_000),
+    "route_lazy": ("lazy", None)
+}
+
+BENCHMARKS = ["buffer", "filter_edges", "geojson_pydantic", "geojson_fast", *ROUTE_BENCHMARKS]
+
+# Порог относительного замедления по умолчанию и изменения, которые не превышают погрешность замера
+DEFAULT_THRESHOLD = 0.1
+_TIME_NOISE = 0.005
+_MEMORY_NOISE = 2.0
+
+
+def route_points(zones: MultiPolygon) -> tuple[Point, Point]:
+    """Точки западнее и восточнее области зон на широте центра наибольшей зоны, маршрут между ними огибает зоны"""
+
+    (min_x, _), (max_x, _) = ZONES_AREA
+    latitude = max(zones.geoms, key=lambda polygon: polygon.area).centroid.y
+
+    return Point(min_x - 2, latitude), Point(max_x + 2, latitude)
+
+
+def route_geojson(start_point: Point, finish_point: Point, zones: MultiPolygon) -> str:
+    """Запрос поиска маршрута в формате `RouteFindDTO`"""
+
+    return json.dumps({
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": json.loads(shapely.to_geojson(start_point)), "properties": {"name": "start_point"}},
+            {"type": "Feature", "geometry": json.loads(shapely.to_geojson(finish_point)), "properties": {"name": "finish_point"}},
+            {
+                "type": "Feature",
+                "geometry": json.loads(shapely.to_geojson(zones)),
+                "properties": {"name": "restricted_polygons", "buffer_distance": BUFFER_DISTANCE}
+            }
+        ]
+    })
+
+
+def run_benchmark(name: str, shape: ZoneShape, layout: ZoneLayout, vertex_count: int, repeat: int) -> dict[str, Any]:
+    """Замер одного бенчмарка для одного набора зон, выполняется в отдельном процессе"""
+
+    zones = synthetic_zones(vertex_count, shape, layout)
+    start_point, finish_point = route_points(zones)
+    run = _prepare(name, zones, start_point, finish_point)
+
+    memory_before = _peak_memory()
+    times = []
+    stages: dict[str, float] = {}
+
+    for _ in range(repeat):
+        # Буферизованные зоны запоминаются по содержимому, каждый повтор должен буферизовать их заново
+        buffer._buffered_cache.clear()
+
+        profiler = RouteProfiler()
+        started = perf_counter()
+        run(profiler)
+        times.append(perf_counter() - started)
+
+        if times[-1] == min(times):
+            stages = {record.name: record.duration for record in profiler.stages}
+
+    return {
+        "case": f"{shape}-{layout}-{vertex_count}",
+        "benchmark": name,
+        "shape": shape,
+        "layout": layout,
+        "vertices": vertex_count_of(zones),
+        "polygons": len(zones.geoms),
+        "time": min(times),
+        "median_time": median(times),
+        "times": times,
+        "stages": stages,
+        "peak_memory_mb": max(0.0, _peak_memory() - memory_before)
+    }
+
+
+def _prepare(name: str, zones: MultiPolygon, start_point: Point, finish_point: Point) -> Callable[[RouteProfiler], object]:
+    """Замеряемый вызов и подготовленные для него данные, подготовка в замер не входит"""
+
+    if name == "buffer":
+        return lambda profiler: buffer_geometry_in_metres(zones, BUFFER_DISTANCE)
+
+    if name == "filter_edges":
+        rng = np.random.default_rng(0)
+        coords = shapely.get_coordinates(zones)
+        pairs = rng.integers(0, len(coords), (EDGE_SAMPLE_SIZE, 2))
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        return lambda profiler: EdgeFilter(zones).visible(coords[pairs[:, 0]], coords[pairs[:, 1]])
+
+    if name in ("geojson_pydantic", "geojson_fast"):
+        geojson = route_geojson(start_point, finish_point, zones)
+        # Маршрут в обход наибольшей зоны по всем ее вершинам: сериализация маршрута не зависит от поиска
+        largest = max(zones.geoms, key=lambda polygon: polygon.area)
+        route = LineString([start_point, *largest.exterior.coords, finish_point])
+
+        fast_io = name == "geojson_fast"
+        return lambda profiler: (parse_route_request(geojson, fast_io), serialize_route(route, fast_io))
+
+    graph_builder, _ = ROUTE_BENCHMARKS[name]
+    return lambda profiler: find_optimal_route(
+        start_point, finish_point, zones, BUFFER_DISTANCE, graph_builder=graph_builder, profiler=profiler  # type: ignore[arg-type]
+    )
+
+
+def _peak_memory() -> float:
+    """Пиковое потребление памяти процессом в МБ (`ru_maxrss` в Linux - КБ, в macOS - байты)"""
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def run_suite(
+    vertex_counts: list[int],
+    shapes: list[ZoneShape],
+    layouts: list[ZoneLayout],
+    benchmarks: list[str],
+    repeat: int
+) -> dict[str, Any]:
+    results = []
+
+    # Новый процесс для каждого замера: пиковая память процесса не переносится между замерами
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"), max_tasks_per_child=1) as executor:
+        for vertex_count, shape, layout, name in product(vertex_counts, shapes, layouts, benchmarks):
+            if name in ROUTE_BENCHMARKS:
+                _, limit = ROUTE_BENCHMARKS[name]
+                if limit is not None and vertex_count > limit:
+                    continue
+
+            result = executor.submit(run_benchmark, name, shape, layout, vertex_count, repeat).result()
+            results.append(result)
+
+            print(
+                f"{result['case']:>26} {name:>17} {result['vertices']:>7} "
+                f"{result['time'] * 1000:>11.1f} {result['peak_memory_mb']:>9.1f}",
+                flush=True
+            )
+
+    return {"metadata": _metadata(repeat), "results": results}
+
+
+def _metadata(repeat: int) -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "numpy": np.__version__,
+        "shapely": shapely.__version__,
+        "geos": shapely.geos_version_string,
+        "repeat": repeat
+    }
+
+
+def compare(base: dict[str, Any], new: dict[str, Any], threshold: float) -> list[str]:
+    """
+    Сравнение двух запусков по совпадающим замерам, возвращаются описания регрессий.
+
+    Замедлением считается рост лучшего времени замера или длительности этапа больше чем на `threshold`
+    и больше чем на 5 мс, ростом памяти - рост пикового потребления больше чем на `threshold` и на 2 МБ
+    """
+
+    base_results = {(result["case"], result["benchmark"]): result for result in base["results"]}
+    regressions = []
+
+    print(f"{'набор зон':>26} {'бенчмарк':>17} {'было, мс':>10} {'стало, мс':>10} {'изменение':>10}")
+
+    for result in new["results"]:
+        key = (result["case"], result["benchmark"])
+        previous = base_results.get(key)
+        if previous is None:
+            continue
+
+        ratio = result["time"] / previous["time"] if previous["time"] else float("inf")
+        flags = []
+
+        if _regressed(previous["time"], result["time"], threshold, _TIME_NOISE):
+            flags.append("время")
+            regressions.append(f"{key[0]} {key[1]}: {previous['time'] * 1000:.1f} -> {result['time'] * 1000:.1f} мс")
+
+        for stage, duration in result["stages"].items():
+            previous_duration = previous["stages"].get(stage)
+            if previous_duration is not None and _regressed(previous_duration, duration, threshold, _TIME_NOISE):
+                flags.append(stage)
+                regressions.append(
+                    f"{key[0]} {key[1]} этап {stage}: {previous_duration * 1000:.1f} -> {duration * 1000:.1f} мс"
+                )
+
+        if _regressed(previous["peak_memory_mb"], result["peak_memory_mb"], threshold, _MEMORY_NOISE):
+            flags.append("память")
+            regressions.append(
+                f"{key[0]} {key[1]}: память {previous['peak_memory_mb']:.1f} -> {result['peak_memory_mb']:.1f} МБ"
+            )
+
+        print(
+            f"{key[0]:>26} {key[1]:>17} {previous['time'] * 1000:>10.1f} {result['time'] * 1000:>10.1f} "
+            f"{ratio:>9.2f}x {'  ! ' + ', '.join(flags) if flags else ''}"
+        )
+
+    return regressions
+
+
+def _regressed(before: float, after: float, threshold: float, noise: float) -> bool:
+    return after - before > max(before * threshold, noise)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="запуск бенчмарков")
+    run.add_argument("-o", "--output", default="benchmark_results.json", help="файл для результатов в JSON")
+    run.add_argument("--vertices", type=int, nargs="+", default=[100, 1_000, 5_000, 20_000], help="количество вершин зон")
+    run.add_argument("--shapes", nargs="+", choices=get_args(ZoneShape), default=list(get_args(ZoneShape)), help="форма зон")
+    run.add_argument("--layouts", nargs="+", choices=get_args(ZoneLayout), default=list(get_args(ZoneLayout)), help="расположение зон")
+    run.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=BENCHMARKS, help="замеряемые вызовы")
+    run.add_argument("--repeat", type=int, default=3, help="количество повторов, в результат записывается лучшее время")
+
+    comparison = commands.add_parser("compare", help="сравнение двух запусков")
+    comparison.add_argument("base", help="результаты до изменений")
+    comparison.add_argument("new", help="результаты после изменений")
+    comparison.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="допустимое относительное замедление")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        print(f"{'набор зон':>26} {'бенчмарк':>17} {'вершин':>7} {'время, мс':>11} {'память, МБ':>9}")
+        report = run_suite(args.vertices, args.shapes, args.layouts, args.benchmarks, args.repeat)
+
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        return
+
+    with open(args.base, encoding="utf-8") as file:
+        base = json.load(file)
+    with open(args.new, encoding="utf-8") as file:
+        new = json.load(file)
+
+    regressions = compare(base, new, args.threshold)
+
+    if regressions:
+        print(f"\nРегрессии ({len(regressions)}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+    print("\nРегрессий нет")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Построение касательного графа для наборов зон из тысяч вершин: число перебираемых пар вершин
+по сравнению со всеми парами, время этапов профилировщика и полное время компиляции зон
+
+    python -m benchmarks.tangent_graph
+    python -m benchmarks.tangent_graph --vertices 5000 10000 20000 --shapes convex
+"""
+import argparse
+from time import perf_counter
+
+from benchmarks.zones import ZoneShape, synthetic_zones, vertex_count_of
+from optimal_route.engine import RouteEngine
+from optimal_route.profiling import RouteProfiler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vertices", type=int, nargs="+", default=[5000, 10000, 20000])
+    parser.add_argument("--shapes", nargs="+", default=["convex", "concave"])
+    args = parser.parse_args()
+
+    print(
+        f"{'зоны':>8} {'вершин':>7} {'в графе':>8} {'всех пар':>11} {'пар':>11} {'кандидатов':>11} {'ребер':>8} "
+        f"{'перебор, с':>11} {'видимость, с':>13} {'всего, с':>9}"
+    )
+
+    for vertex_count in args.vertices:
+        shape: ZoneShape
+        for shape in args.shapes:
+            zone = synthetic_zones(vertex_count, shape=shape)
+            profiler = RouteProfiler()
+
+            started = perf_counter()
+            route_engine = RouteEngine(zone, graph_builder="tangent", profiler=profiler)
+            route_engine.compile(profiler)
+            total = perf_counter() - started
+
+            stages = {record.name: record for record in profiler.stages}
+            generation, filtering = stages["edge_generation"], stages["edge_filtering"]
+            graph_vertices = len(route_engine._vertices_coords)
+
+            print(
+                f"{shape:>8} {vertex_count_of(zone):>7} {graph_vertices:>8} "
+                f"{graph_vertices * (graph_vertices - 1) // 2:>11} {generation.sizes.get('pairs', 0):>11} "
+                f"{generation.sizes.get('candidate_edges', 0):>11} {filtering.sizes.get('kept_edges', 0):>8} "
+                f"{generation.duration:>11.2f} {filtering.duration:>13.2f} {total:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from typing import Literal
+
+import numpy as np
+import shapely
+from shapely import MultiPolygon, Polygon, unary_union
+
+
+ZoneShape = Literal["convex", "concave", "holes"]
+ZoneLayout = Literal["scattered", "clustered"]
+
+# Область, в которой располагаются зоны; начальные и конечные точки маршрутов лежат западнее и восточнее нее
+ZONES_AREA = ((70.0, 50.0), (90.0, 60.0))
+
+
+def synthetic_zones(
+    vertex_count: int,
+    shape: ZoneShape = "concave",
+    layout: ZoneLayout = "scattered",
+    seed: int = 0
+) -> MultiPolygon:
+    """
+    Генерация валидного набора запретных зон примерно из `vertex_count` вершин.
+
+    - `convex` - выпуклые многоугольники с вершинами на эллипсе;
+    - `concave` - звездчатые многоугольники со случайным радиусом вершин;
+    - `holes` - звездчатые многоугольники с эллиптическим отверстием, на которое приходится треть вершин.
+
+    При `scattered` центры зон равномерно распределены по области, при `clustered` собраны в несколько групп,
+    в которых зоны перекрываются и объединяются. Число и подробность зон растут вместе с `vertex_count`,
+    поэтому итоговое количество вершин после объединения может отличаться от заданного
+    """
+
+    rng = np.random.default_rng(seed)
+    (min_x, min_y), (max_x, max_y) = ZONES_AREA
+
+    vertices_per_polygon = max(8, int(np.sqrt(vertex_count)))
+    polygon_count = max(1, vertex_count // vertices_per_polygon)
+    # Общая площадь зон не зависит от их количества
+    scale = min(1.0, np.sqrt(50 / polygon_count))
+
+    if layout == "clustered":
+        clusters = rng.uniform((min_x + 2, min_y + 2), (max_x - 2, max_y - 2), (max(1, polygon_count // 20), 2))
+        centers = clusters[rng.integers(0, len(clusters), polygon_count)] + rng.normal(0, 0.8, (polygon_count, 2))
+        centers = np.clip(centers, (min_x, min_y), (max_x, max_y))
+    else:
+        centers = rng.uniform((min_x, min_y), (max_x, max_y), (polygon_count, 2))
+
+    polygons = []
+
+    for center in centers:
+        size = rng.uniform(0.2, 0.6) * scale
+        hole_count = vertices_per_polygon // 3 if shape == "holes" else 0
+        # Углы вершин смещены не больше чем на 0.4 шага, поэтому стороны не подходят близко к центру
+        outer_count = vertices_per_polygon - hole_count
+        angles = (np.arange(outer_count) + rng.uniform(-0.4, 0.4, outer_count)) * (2 * np.pi / outer_count)
+
+        if shape == "convex":
+            axes = size * rng.uniform(0.5, 1.0, 2)
+            rotation = rng.uniform(0, np.pi)
+            ring = np.column_stack((axes[0] * np.cos(angles), axes[1] * np.sin(angles)))
+            ring = ring @ np.array([[np.cos(rotation), np.sin(rotation)], [-np.sin(rotation), np.cos(rotation)]])
+        else:
+            radii = size * rng.uniform(0.5, 1.0, len(angles))
+            ring = np.column_stack((np.cos(angles), np.sin(angles))) * radii[:, None]
+
+        holes = []
+        if hole_count:
+            # Отверстие лежит внутри наименьшего радиуса внешнего кольца
+            hole_angles = np.linspace(0, 2 * np.pi, max(3, hole_count), endpoint=False)
+            hole_axes = size * rng.uniform(0.1, 0.25, 2)
+            holes.append(center + np.column_stack((hole_axes[0] * np.cos(hole_angles), hole_axes[1] * np.sin(hole_angles))))
+
+        polygons.append(Polygon(center + ring, holes))
+
+    union = unary_union(polygons)
+
+    if isinstance(union, Polygon):
+        return MultiPolygon([union])
+
+    return union
+
+
+def vertex_count_of(zones: MultiPolygon) -> int:
+    """Количество вершин зон без замыкающих координат колец"""
+
+    return int(shapely.get_num_coordinates(zones) - sum(1 + len(polygon.interiors) for polygon in zones.geoms))
@@ -1,5 +1,28 @@
-from .main import find_optimal_route, find_optimal_route_with_pydantic_model, find_optimal_route_with_geojson
-from .models.routes import RouteFindDTO, RouteSendDTO
+from .cache import RouteCache, MemoryRouteCache, SqliteRouteCache, RouteCacheStats, route_fingerprint
+from .engine import RouteEngine, DistanceMatrix, ApproximateRoute, WaypointRoute
+from .profiling import RouteProfiler, StageRecord
+from .main import (
+    find_optimal_route,
+    find_optimal_route_with_pydantic_model,
+    find_optimal_route_with_geojson,
+    find_optimal_route_with_geojson_stream,
+    find_optimal_routes,
+    find_optimal_routes_with_pydantic_model,
+    find_optimal_routes_with_geojson,
+    route_distance_matrix,
+    find_approximate_route,
+    find_optimal_routes_with_wkb,
+    find_optimal_routes_with_geoarrow,
+    WkbRouteResults,
+    GeoArrowRouteResults,
+    find_optimal_route_through_waypoints,
+    find_optimal_route_through_waypoints_with_geojson,
+    RouteResult,
+    RouteSearch,
+    parse_route_request,
+    serialize_route,
+)
+from .models.routes import RouteFindDTO, RouteSendDTO, RouteBatchFindDTO, RouteBatchSendDTO, RouteWaypointsSendDTO
 
 
 __all__ = [
@@ -8,4 +31,34 @@ __all__ = [
     "RouteFindDTO",
     "RouteSendDTO",
     "find_optimal_route_with_geojson",
+    "RouteEngine",
+    "find_optimal_routes",
+    "find_optimal_routes_with_pydantic_model",
+    "find_optimal_routes_with_geojson",
+    "RouteResult",
+    "RouteBatchFindDTO",
+    "RouteBatchSendDTO",
+    "RouteCache",
+    "MemoryRouteCache",
+    "SqliteRouteCache",
+    "RouteCacheStats",
+    "route_fingerprint",
+    "RouteProfiler",
+    "StageRecord",
+    "route_distance_matrix",
+    "DistanceMatrix",
+    "find_approximate_route",
+    "ApproximateRoute",
+    "find_optimal_route_with_geojson_stream",
+    "find_optimal_routes_with_wkb",
+    "find_optimal_routes_with_geoarrow",
+    "WkbRouteResults",
+    "GeoArrowRouteResults",
+    "find_optimal_route_through_waypoints",
+    "find_optimal_route_through_waypoints_with_geojson",
+    "WaypointRoute",
+    "RouteWaypointsSendDTO",
+    "RouteSearch",
+    "parse_route_request",
+    "serialize_route",
 ]
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import contextlib
+import os
+import signal
+import sys
+from typing import get_args
+
+from optimal_route.batch import run_batch
+from optimal_route.engine import GraphBuilder
+from optimal_route.service import RouteService, serve
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="optimal_route", description="Поиск оптимальных маршрутов в обход запретных зон")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch",
+        help="потоковая обработка запросов в формате NDJSON",
+        description=(
+            "Чтение запросов (FeatureCollection в формате RouteFindDTO, по одному в строке) и запись "
+            "результатов (Feature с маршрутом или ошибкой в свойстве error) в том же порядке"
+        )
+    )
+    batch.add_argument("input", nargs="?", default="-", help="файл с запросами, по умолчанию stdin")
+    batch.add_argument("-o", "--output", default="-", help="файл для результатов, по умолчанию stdout")
+    batch.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="количество процессов")
+    batch.add_argument("--graph-builder", choices=get_args(GraphBuilder), default="visibility", help="способ построения графа")
+    batch.add_argument("--fast-io", action="store_true", help="разбор и формирование GeoJSON без pydantic моделей")
+
+    server = commands.add_parser(
+        "serve",
+        help="HTTP сервис поиска маршрутов",
+        description=(
+            "POST /route принимает GeoJSON в формате RouteFindDTO и возвращает маршрут, "
+            "GET /stats возвращает состояние очереди запросов"
+        )
+    )
+    server.add_argument("--host", default="127.0.0.1", help="адрес сервера")
+    server.add_argument("--port", type=int, default=8080, help="порт сервера")
+    server.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="количество процессов")
+    server.add_argument("--max-concurrency", type=int, help="количество одновременно вычисляемых маршрутов")
+    server.add_argument("--max-queue", type=int, default=100, help="количество запросов в очереди до отказа с кодом 503")
+    server.add_argument("--timeout", type=float, default=30.0, help="время ожидания маршрута в секундах до ответа с кодом 504")
+    server.add_argument("--fast-io", action="store_true", help="разбор и формирование GeoJSON без pydantic моделей")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(_serve(args))
+        return
+
+    # Результаты передаются получателю построчно, по мере их готовности
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output_file = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", buffering=1)
+    if output_file is sys.stdout:
+        sys.stdout.reconfigure(line_buffering=True)  # type: ignore[union-attr]
+
+    try:
+        run_batch(input_file, output_file.write, args.workers, args.graph_builder, args.fast_io)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    service = RouteService(args.workers, args.max_concurrency, args.max_queue, args.timeout, args.fast_io)
+
+    # Остановка по SIGTERM, как и по Ctrl+C, дожидается вычислений и завершает процессы пула
+    task = asyncio.current_task()
+    assert task is not None
+    with contextlib.suppress(NotImplementedError):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+
+    try:
+        server = await serve(service, args.host, args.port)
+        async with server:
+            with contextlib.suppress(asyncio.CancelledError):
+                await server.serve_forever()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    main()
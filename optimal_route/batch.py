@@ -0,0 +1,99 @@
+import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable
+
+from optimal_route.engine import GraphBuilder, RouteEngine, compiled_zones_key
+from optimal_route.main import parse_route_request, serialize_route
+
+
+# Количество запросов на один процесс, которые могут ожидать обработки или записи результата
+_PENDING_PER_WORKER = 4
+
+
+def run_batch(
+    lines: Iterable[str],
+    write: Callable[[str], object],
+    workers: int | None = None,
+    graph_builder: GraphBuilder = "visibility",
+    fast_io: bool = False
+) -> int:
+    """
+    Функция для потоковой обработки запросов поиска маршрута в формате NDJSON.
+
+    Каждая непустая строка `lines` - FeatureCollection в формате `RouteFindDTO`. Для каждой строки
+    в `write` передается строка результата - Feature с найденным маршрутом или с пустой геометрией
+    и причиной ошибки в свойстве `error`. Результаты записываются в порядке входных строк.
+
+    Строки читаются по мере обработки: одновременно в работе находится не больше `_PENDING_PER_WORKER`
+    запросов на процесс, поэтому память не зависит от размера входных данных, а медленная запись
+    результатов приостанавливает чтение. Процесс, получивший подряд запросы с одними и теми же
+    запретными зонами, использует скомпилированные зоны повторно. Возвращается количество обработанных строк
+    """
+
+    requests = (line for line in lines if line.strip())
+    count = 0
+
+    if not workers or workers <= 1:
+        for line in requests:
+            write(_route_line(line, graph_builder, fast_io) + "\n")
+            count += 1
+        return count
+
+    pending: deque[Future[str]] = deque()
+
+    with ProcessPoolExecutor(workers) as executor:
+        for line in requests:
+            # Результат записывается до чтения следующей строки, если очередь заполнена
+            if len(pending) >= workers * _PENDING_PER_WORKER:
+                write(pending.popleft().result() + "\n")
+                count += 1
+
+            pending.append(executor.submit(_route_line, line, graph_builder, fast_io))
+
+        while pending:
+            write(pending.popleft().result() + "\n")
+            count += 1
+
+    return count
+
+
+_worker_route_engine: RouteEngine | None = None
+
+
+def _route_line(line: str, graph_builder: GraphBuilder, fast_io: bool) -> str:
+    """Поиск маршрута для одной строки запроса, результат - Feature в GeoJSON"""
+
+    global _worker_route_engine
+
+    try:
+        route_search_data = parse_route_request(line, fast_io)
+
+        key = compiled_zones_key(
+            route_search_data.restricted_polygons, route_search_data.buffer_distance, "WGS84", graph_builder, None
+        )
+
+        # Повторный запрос с теми же зонами: граф строится один раз для всех следующих запросов,
+        # для первого запроса достаточно зон в коридоре маршрута
+        reused = _worker_route_engine is not None and _worker_route_engine.key == key
+        if not reused:
+            _worker_route_engine = RouteEngine(
+                route_search_data.restricted_polygons, route_search_data.buffer_distance, graph_builder=graph_builder
+            )
+
+        assert _worker_route_engine is not None
+
+        optimal_route = _worker_route_engine.find_route(
+            route_search_data.start_point, route_search_data.finish_point, corridor_pruning=not reused
+        )
+    except Exception as error:
+        # Ошибка в одной строке не прерывает обработку остальных строк
+        return _feature(json.dumps({"error": str(error)}, ensure_ascii=False, separators=(",", ":")), "null")
+
+    return _feature("{}", serialize_route(optimal_route, fast_io))
+
+
+def _feature(properties: str, geometry: str) -> str:
+    """Feature в том же виде, что и в `RouteBatchSendDTO`"""
+
+    return '{"type":"Feature","properties":' + properties + ',"geometry":' + geometry + '}'
@@ -0,0 +1,234 @@
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from hashlib import blake2b
+from pathlib import Path
+from threading import Lock
+from typing import Literal, NamedTuple
+
+import numpy as np
+import shapely
+from shapely import MultiPolygon, Point
+
+from optimal_route.engine import GraphBuilder
+
+
+# Количество знаков после запятой, до которого округляются координаты при вычислении отпечатка (~0.1 мм)
+_FINGERPRINT_DECIMALS = 9
+
+
+RouteCacheStats = NamedTuple(
+    "RouteCacheStats",
+    [
+        ("hits", int),
+        ("misses", int),
+        ("evictions", int)
+    ]
+)
+
+
+class RouteCache(ABC):
+    """
+    Кэш найденных маршрутов.
+
+    Ключ - отпечаток входных данных (`route_fingerprint`), значение - маршрут, сериализованный в GeoJSON.
+    Учитывает количество попаданий, промахов и вытесненных записей
+    """
+
+    def __init__(self) -> None:
+        self._stats_lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def stats(self) -> RouteCacheStats:
+        """Количество попаданий, промахов и вытесненных записей"""
+
+        with self._stats_lock:
+            return RouteCacheStats(self._hits, self._misses, self._evictions)
+
+    def get(self, key: str) -> str | None:
+        """Маршрут в GeoJSON по ключу или `None`, если маршрута нет в кэше"""
+
+        value = self._get(key)
+
+        with self._stats_lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Сохранение маршрута в GeoJSON по ключу"""
+
+        self._set(key, value)
+
+    def _count_evictions(self, count: int) -> None:
+        with self._stats_lock:
+            self._evictions += count
+
+    @abstractmethod
+    def _get(self, key: str) -> str | None:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, value: str) -> None:
+        ...
+
+
+class MemoryRouteCache(RouteCache):
+    """
+    Кэш маршрутов в памяти процесса.
+
+    Хранит не более `maxsize` записей, при переполнении вытесняются давно не использованные.
+    Записи старше `ttl` секунд считаются устаревшими и вытесняются при обращении к ним
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        super().__init__()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            created, value = entry
+            if self._ttl is not None and time.monotonic() - created > self._ttl:
+                del self._entries[key]
+                self._count_evictions(1)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+
+            evicted = 0
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+
+        self._count_evictions(evicted)
+
+
+class SqliteRouteCache(RouteCache):
+    """
+    Кэш маршрутов в базе данных SQLite, сохраняется между запусками и может использоваться несколькими процессами.
+
+    При `maxsize` хранится не более заданного числа записей, вытесняются давно не использованные.
+    Записи старше `ttl` секунд считаются устаревшими
+    """
+
+    def __init__(self, path: str | Path, maxsize: int | None = None, ttl: float | None = None) -> None:
+        super().__init__()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = Lock()
+
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS routes ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "created REAL NOT NULL, "
+            "accessed REAL NOT NULL"
+            ")"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS routes_accessed ON routes (accessed)")
+
+    def close(self) -> None:
+        """Закрытие соединения с базой данных"""
+
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str) -> str | None:
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute("SELECT value, created FROM routes WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            value, created = row
+            if self._ttl is not None and now - created > self._ttl:
+                self._connection.execute("DELETE FROM routes WHERE key = ?", (key,))
+                self._count_evictions(1)
+                return None
+
+            self._connection.execute("UPDATE routes SET accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO routes (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+
+            if self._maxsize is None:
+                return
+
+            evicted = self._connection.execute(
+                "DELETE FROM routes WHERE key IN ("
+                "SELECT key FROM routes ORDER BY accessed DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self._maxsize,)
+            ).rowcount
+
+        self._count_evictions(evicted)
+
+
+def route_fingerprint(
+    start_point: Point,
+    finish_point: Point,
+    restricted_polygons: MultiPolygon | None = None,
+    buffer_distance: float | None = None,
+    coord_system: str = "WGS84",
+    graph_builder: GraphBuilder = "visibility",
+    simplify_tolerance: float | None = None,
+    output: Literal["route", "geojson"] = "route"
+) -> str:
+    """
+    Функция для вычисления отпечатка входных данных поиска маршрута.
+
+    Координаты округляются, а запретные зоны приводятся к нормальной форме (порядок многоугольников
+    и начальные вершины колец), поэтому одинаковые по содержанию данные дают одинаковый отпечаток.
+    `output` - вид сохраняемого результата: маршрут `find_optimal_route` (`route`) или готовый ответ
+    функций, работающих с GeoJSON (`geojson`), которые хранятся под разными ключами
+    """
+
+    fingerprint = blake2b(digest_size=20)
+
+    for point in (start_point, finish_point):
+        fingerprint.update(np.round(shapely.get_coordinates(point), _FINGERPRINT_DECIMALS).tobytes())
+
+    if restricted_polygons:
+        zone = shapely.transform(
+            shapely.normalize(restricted_polygons),
+            lambda coords: np.round(coords, _FINGERPRINT_DECIMALS)
+        )
+        fingerprint.update(shapely.to_wkb(zone))
+
+    parameters = (float(buffer_distance or 0), coord_system, graph_builder, float(simplify_tolerance or 0), output)
+    fingerprint.update("".join(f"|{parameter}" for parameter in parameters).encode())
+
+    return fingerprint.hexdigest()
@@ -0,0 +1,1345 @@
+from functools import partial
+from hashlib import blake2b
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Literal, NamedTuple, Sequence, get_args
+import numpy as np
+import shapely
+from pyproj import Geod
+from shapely import MultiPolygon, Point, LineString, Polygon, STRtree
+from shapely.geometry.base import BaseGeometry
+from shapely.validation import explain_validity
+
+from optimal_route.profiling import NULL_PROFILER, RouteProfiler
+from optimal_route.utils.buffer import buffer_geometry_in_metres
+from optimal_route.utils.corridor import corridor_polygon
+from optimal_route.utils.raster import (
+    OCTILE_FACTOR, RasterGrid, corner_coords, fill_cells, lattice_distances, lattice_path, raster_grid
+)
+from optimal_route.utils.route import (
+    CsrGraph, find_fastest_route_with_length_in_vertices, find_shortest_distances, route_through_vertices
+)
+from optimal_route.utils.simplify import simplify_geometry_in_metres
+from optimal_route.utils.storage import read_arrays, write_arrays
+from optimal_route.utils.visibility import (
+    EdgeFilter, ZoneVertices, convex_vertices, tangent_mask, tangent_pairs, vertex_pairs
+)
+
+
+GraphBuilder = Literal["visibility", "tangent", "lazy"]
+
+# Версия формата файла скомпилированных зон, меняется при изменении состава или смысла сохраняемых массивов
+_COMPILED_FORMAT_VERSION = 1
+
+# Размер блока пар вершин, которые проверяются за один раз при обновлении графа
+_UPDATE_BLOCK_SIZE = 2_000_000
+
+# Начальная длина коридора относительно геодезического расстояния между точками и ее рост при расширении
+_CORRIDOR_INITIAL_EXCESS = 0.1
+_CORRIDOR_EXCESS_GROWTH = 3
+
+
+# Приближенный поиск по сетке: наибольшее число ячеек, метров в градусе широты в плоскости сетки,
+# наибольшая широта, по которой выбирается масштаб долготы, запас сужения зон на погрешность аппроксимации
+# окружностей при буферизации, запас отношения геодезических длин к длинам в плоскости и начальное окно спрямления
+_MAX_RASTER_CELLS = 25_000_000
+_METRES_PER_DEGREE = 111_320.0
+_MAX_RASTER_LATITUDE = 85.0
+_RASTER_EROSION_MARGIN = 0.01
+_RASTER_RATIO_MARGIN = 0.001
+_STRAIGHTENING_WINDOW = 64
+
+
+ApproximateRoute = NamedTuple(
+    "ApproximateRoute",
+    [
+        ("route", LineString),
+        ("length", float),
+        ("error_bound", float)
+    ]
+)
+
+
+WaypointRoute = NamedTuple(
+    "WaypointRoute",
+    [
+        ("route", LineString),
+        ("leg_lengths", list[float]),
+        ("length", float)
+    ]
+)
+
+
+DistanceMatrix = NamedTuple(
+    "DistanceMatrix",
+    [
+        ("distances", np.ndarray),
+        ("routes", list[list[LineString | None]] | None)
+    ]
+)
+
+
+class RouteEngine:
+    """
+    Скомпилированный набор запретных зон для многократного поиска маршрутов.
+
+    Проверка валидности, буферизация зон и построение графа видимости между вершинами зон
+    выполняются один раз. При поиске маршрута к графу присоединяются только начальная
+    и конечная точки.
+
+    Способы построения графа (`graph_builder`):
+    - `visibility` - все пары вершин, видимых друг из друга;
+    - `tangent` - только касательные к многоугольникам ребра. Кратчайший маршрут проходит только по ним,
+      а проверка касания выполняется до дорогой проверки видимости, что позволяет работать
+      с наборами зон из десятков тысяч вершин;
+    - `lazy` - граф заранее не строится: касательные ребра вершины проверяются на видимость только тогда,
+      когда поиск раскрывает эту вершину, и запоминаются для следующих маршрутов. Подходит для маршрутов,
+      которые огибают несколько зон из большого набора
+
+    При `simplify_tolerance` запретные зоны после буферизации объединяются и упрощаются наружу с допуском
+    в метрах (`simplify_geometry_in_metres`): упрощенные зоны содержат исходные, а в графе становится
+    меньше вершин.
+
+    Скомпилированный набор зон сохраняется в файл методом `save` и загружается методом `load`
+    без повторной буферизации и построения графа, `open` загружает файл или создает его
+    """
+
+    def __init__(
+        self,
+        restricted_polygons: MultiPolygon | None = None,
+        buffer_distance: float | None = None,
+        coord_system: str = "WGS84",
+        graph_builder: GraphBuilder = "visibility",
+        profiler: RouteProfiler | None = None,
+        simplify_tolerance: float | None = None
+    ) -> None:
+        profiler = profiler or NULL_PROFILER
+
+        if graph_builder not in get_args(GraphBuilder):
+            raise ValueError(f"Неизвестный способ построения графа: {graph_builder}")
+
+        self._init_state(
+            compiled_zones_key(restricted_polygons, buffer_distance, coord_system, graph_builder, simplify_tolerance),
+            coord_system,
+            graph_builder
+        )
+
+        # Исходные запретные зоны по идентификаторам для добавления и удаления зон
+        self._buffer_distance = buffer_distance
+        self._simplify_tolerance = simplify_tolerance
+        self._sources: dict[int, Polygon | MultiPolygon] | None = dict(
+            enumerate(restricted_polygons.geoms if restricted_polygons else ())
+        )
+        self._next_zone_id = len(self._sources)
+
+        # Проверка на наличие запретных зон
+        if not restricted_polygons:
+            self._zone = None
+            return
+
+        # Проверка на валидность запретных зон
+        with profiler.stage("zone_validation") as sizes:
+            sizes["zone_vertices"] = shapely.get_num_coordinates(restricted_polygons)
+            if not restricted_polygons.is_valid:
+                raise ValueError("Запретные зоны не валидны: " + explain_validity(restricted_polygons))
+
+        self._set_zone(self._processed_zone(restricted_polygons, profiler), None, profiler)
+
+    @classmethod
+    def load(cls, path: str | Path, key: str | None = None, mmap: bool = True) -> "RouteEngine":
+        """
+        Загрузка набора запретных зон, сохраненного `save`.
+
+        При `mmap` массивы вершин и графа не читаются в память процесса, а отображаются из файла,
+        поэтому загрузка занимает миллисекунды, а процессы, загрузившие один файл, используют общие
+        страницы памяти. Если передан `key`, проверяется, что файл построен для тех же входных данных
+        """
+
+        metadata, arrays = read_arrays(path, mmap)
+
+        if metadata.get("version") != _COMPILED_FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия файла скомпилированных зон: {metadata.get('version')}")
+
+        if key is not None and metadata["key"] != key:
+            raise ValueError("Файл скомпилированных зон построен для других запретных зон или параметров")
+
+        route_engine = cls.__new__(cls)
+        route_engine._init_state(metadata["key"], metadata["coord_system"], metadata["graph_builder"])
+
+        # Исходные зоны в файле не хранятся, поэтому загруженный набор зон нельзя изменить
+        route_engine._sources = None
+
+        if "zone" not in arrays:
+            route_engine._zone = None
+            return route_engine
+
+        zone = _make_multipolygon(shapely.from_wkb(arrays["zone"].tobytes()))
+        zone_vertices = ZoneVertices(arrays["vertices"], arrays["vertices_prev"], arrays["vertices_next"])
+        route_engine._set_zone(zone, zone_vertices, NULL_PROFILER)
+
+        if "graph_indptr" in arrays:
+            route_engine._graph = CsrGraph(arrays["graph_indptr"], arrays["graph_indices"], arrays["graph_weights"])
+
+        return route_engine
+
+    @classmethod
+    def open(
+        cls,
+        path: str | Path,
+        restricted_polygons: MultiPolygon | None = None,
+        buffer_distance: float | None = None,
+        coord_system: str = "WGS84",
+        graph_builder: GraphBuilder = "visibility",
+        simplify_tolerance: float | None = None
+    ) -> "RouteEngine":
+        """
+        Загрузка скомпилированного набора зон из файла, если он построен для тех же входных данных,
+        иначе компиляция зон и сохранение результата в файл для следующих запусков
+        """
+
+        key = compiled_zones_key(restricted_polygons, buffer_distance, coord_system, graph_builder, simplify_tolerance)
+
+        try:
+            return cls.load(path, key)
+        except (FileNotFoundError, ValueError):
+            pass
+
+        route_engine = cls(
+            restricted_polygons, buffer_distance, coord_system, graph_builder, simplify_tolerance=simplify_tolerance
+        )
+        route_engine.save(path)
+
+        return route_engine
+
+    @property
+    def key(self) -> str:
+        """Отпечаток входных данных: запретных зон, расстояния буферизации и параметров построения графа"""
+
+        return self._key
+
+    @property
+    def restricted_polygons(self) -> MultiPolygon | None:
+        """Запретные зоны после буферизации"""
+
+        return self._zone
+
+    def save(self, path: str | Path) -> None:
+        """
+        Сохранение скомпилированного набора зон в файл: зоны после буферизации в WKB, вершины зон,
+        граф в формате CSR и длины его ребер. Граф строится перед сохранением, если он еще не построен
+        """
+
+        self.compile()
+
+        metadata = {
+            "version": _COMPILED_FORMAT_VERSION,
+            "key": self._key,
+            "coord_system": self._coord_system,
+            "graph_builder": self._graph_builder
+        }
+        arrays: dict[str, np.ndarray] = {}
+
+        if self._zone is not None:
+            arrays["zone"] = np.frombuffer(shapely.to_wkb(self._zone), dtype=np.uint8)
+            arrays["vertices"], arrays["vertices_prev"], arrays["vertices_next"] = self._zone_vertices
+
+            if self._graph is not None:
+                arrays["graph_indptr"] = self._graph.indptr
+                arrays["graph_indices"] = self._graph.indices
+                arrays["graph_weights"] = self._graph.weights
+
+        write_arrays(path, metadata, arrays)
+
+    def add_zone(self, polygon: Polygon | MultiPolygon, profiler: RouteProfiler | None = None) -> int:
+        """
+        Добавление запретной зоны без полного перестроения графа, возвращается идентификатор зоны для `remove_zone`.
+
+        Зона буферизуется и упрощается так же, как и исходные зоны. Из графа удаляются только ребра,
+        которые проходят через добавленную область, и добавляются ребра новых вершин.
+        Граф совпадает с графом, построенным заново для всех зон. Идентификаторы исходных зон -
+        номера многоугольников в `restricted_polygons`, переданном при создании
+        """
+
+        profiler = profiler or NULL_PROFILER
+
+        if not polygon.is_valid:
+            raise ValueError("Запретная зона не валидна: " + explain_validity(polygon))
+
+        with self._lock:
+            sources = self._editable_sources()
+
+            zone_id = self._next_zone_id
+            self._next_zone_id += 1
+            sources[zone_id] = polygon
+
+            self._update_zone(profiler)
+
+        return zone_id
+
+    def remove_zone(self, zone_id: int, profiler: RouteProfiler | None = None) -> None:
+        """
+        Удаление запретной зоны без полного перестроения графа.
+
+        Проверяются только пары вершин, отрезки между которыми проходят рядом с освободившейся областью,
+        и ребра вершин, которые появились или изменились. Граф совпадает с графом, построенным заново
+        для оставшихся зон
+        """
+
+        profiler = profiler or NULL_PROFILER
+
+        with self._lock:
+            sources = self._editable_sources()
+
+            if zone_id not in sources:
+                raise ValueError(f"Запретная зона не найдена: {zone_id}")
+
+            del sources[zone_id]
+
+            self._update_zone(profiler)
+
+    def compile(self, profiler: RouteProfiler | None = None) -> None:
+        """Построение графа видимости между вершинами запретных зон заранее, до первого поиска маршрута"""
+
+        if self._zone is None or self._graph_builder == "lazy":
+            return
+
+        with self._lock:
+            self._zone_graph(profiler or NULL_PROFILER)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+        # Подготовленные геометрии не сохраняются при сериализации
+        if self._zone is not None:
+            shapely.prepare(self._zone)
+            shapely.prepare(self._holes)
+
+    def find_route(
+        self,
+        start_point: Point,
+        finish_point: Point,
+        profiler: RouteProfiler | None = None,
+        corridor_pruning: bool = False
+    ) -> LineString:
+        """
+        Поиск оптимального маршрута между двумя точками в обход запретных зон.
+
+        При `corridor_pruning`, если граф еще не построен, маршрут ищется только среди зон,
+        пересекающих коридор вокруг начальной и конечной точек (`_find_route_in_corridor`)
+        """
+
+        profiler = profiler or NULL_PROFILER
+
+        fastest_route = LineString([start_point, finish_point])
+
+        # Проверка на наличие запретных зон
+        if self._zone is None:
+            return fastest_route
+
+        with profiler.stage("point_checks"):
+            if self._is_direct_route(fastest_route, start_point, finish_point):
+                return fastest_route
+
+        if corridor_pruning and self._graph is None:
+            corridor_route = self._find_route_in_corridor(start_point, finish_point, profiler)
+            if corridor_route is not None:
+                return corridor_route
+
+        if self._graph_builder == "lazy":
+            neighbours = partial(self._neighbours_of, profiler=profiler)
+        else:
+            with self._lock:
+                neighbours = self._zone_graph(profiler).neighbours
+
+        route, _ = self._search(start_point, finish_point, profiler, neighbours)
+        return route
+
+    def find_waypoint_route(self, points: Sequence[Point], profiler: RouteProfiler | None = None) -> WaypointRoute:
+        """
+        Поиск оптимального маршрута через точки в заданном порядке: от первой точки к последней через промежуточные.
+
+        Граф между вершинами запретных зон строится один раз, вершины, видимые из каждой точки, вычисляются
+        один раз и используются в обоих участках маршрута, которые начинаются и заканчиваются в этой точке.
+        Возвращается общий маршрут, длины участков и длина всего маршрута в метрах. Длины участков,
+        проложенных в обход зон, берутся из поиска, а не вычисляются заново по маршруту
+        """
+
+        profiler = profiler or NULL_PROFILER
+        points = list(points)
+
+        if len(points) < 2:
+            raise ValueError("Маршрут должен содержать не менее двух точек")
+
+        neighbours: Callable[[int], tuple[np.ndarray, np.ndarray]] | None = None
+        visible_vertices: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+        def visible_from(index: int) -> tuple[np.ndarray, np.ndarray]:
+            if index not in visible_vertices:
+                visible_vertices[index] = self._visible_vertices_from((points[index].x, points[index].y), profiler)
+            return visible_vertices[index]
+
+        coords: list[tuple[float, float]] = [(points[0].x, points[0].y)]
+        leg_lengths = []
+
+        for index, (start_point, finish_point) in enumerate(zip(points, points[1:])):
+            leg = LineString([start_point, finish_point])
+
+            if self._zone is not None:
+                with profiler.stage("point_checks"):
+                    is_direct = self._is_direct_route(leg, start_point, finish_point)
+            else:
+                is_direct = True
+
+            if is_direct:
+                length = self._geod.inv(start_point.x, start_point.y, finish_point.x, finish_point.y)[2]
+            else:
+                if neighbours is None:
+                    if self._graph_builder == "lazy":
+                        neighbours = partial(self._neighbours_of, profiler=profiler)
+                    else:
+                        with self._lock:
+                            neighbours = self._zone_graph(profiler).neighbours
+
+                leg, length = self._search(
+                    start_point, finish_point, profiler, neighbours, visible_from(index), visible_from(index + 1)
+                )
+
+            # Точка между участками входит в маршрут один раз
+            coords.extend(leg.coords[1:])
+            leg_lengths.append(float(length))
+
+        return WaypointRoute(LineString(coords), leg_lengths, float(sum(leg_lengths)))
+
+    def distance_matrix(
+        self,
+        origins: Sequence[Point],
+        destinations: Sequence[Point],
+        return_routes: bool = False,
+        profiler: RouteProfiler | None = None
+    ) -> DistanceMatrix:
+        """
+        Длины кратчайших маршрутов в метрах от каждой начальной точки до каждой конечной.
+
+        Граф между вершинами запретных зон строится один раз, к нему присоединяются все точки,
+        и для каждой начальной точки выполняется один поиск Дейкстры, который находит расстояния
+        до всех вершин, видимых из конечных точек. Если маршрута нет (точка в запретной зоне
+        или в отверстии многоугольника), расстояние равно `inf`, а маршрут - `None`
+        """
+
+        profiler = profiler or NULL_PROFILER
+
+        origin_coords = shapely.get_coordinates(list(origins)).reshape(-1, 2)
+        destination_coords = shapely.get_coordinates(list(destinations)).reshape(-1, 2)
+        shape = (len(origin_coords), len(destination_coords))
+
+        # Маршруты по прямой, если отрезок между точками не проходит через запретные зоны
+        with profiler.stage("direct_edges") as sizes:
+            starts = np.repeat(origin_coords, shape[1], axis=0)
+            ends = np.tile(destination_coords, (shape[0], 1))
+
+            distances = self._edge_lengths(starts, ends)
+            if self._zone is not None:
+                distinct = np.any(starts != ends, axis=1)
+                distances[distinct & ~self._edge_filter.visible(starts, ends)] = np.inf
+            distances = distances.reshape(shape)
+
+            sizes["pairs"] = distances.size
+
+        # Последняя вершина запретных зон перед конечной точкой для маршрутов в обход зон
+        last_vertices = np.full(shape, -1)
+        parents = {}
+
+        if self._zone is not None:
+            with profiler.stage("point_checks"):
+                reachable_origins = np.array(list(map(self._is_reachable, origins)), dtype=bool)
+                reachable_destinations = np.array(list(map(self._is_reachable, destinations)), dtype=bool)
+
+            if self._graph_builder == "lazy":
+                neighbours = partial(self._neighbours_of, profiler=profiler)
+            else:
+                with self._lock:
+                    neighbours = self._zone_graph(profiler).neighbours
+
+            # Ребра от всех конечных точек до видимых из них вершин в общих массивах
+            destination_edges = [
+                self._visible_vertices_from(point, profiler)
+                for point in map(tuple, destination_coords[reachable_destinations].tolist())
+            ]
+            edge_vertices = np.concatenate([np.empty(0, dtype=int)] + [indices for indices, _ in destination_edges])
+            edge_lengths = np.concatenate([np.empty(0)] + [lengths for _, lengths in destination_edges])
+            edge_destinations = np.repeat(
+                np.flatnonzero(reachable_destinations), [len(indices) for indices, _ in destination_edges]
+            )
+
+            # Ребра упорядочиваются по конечным точкам, чтобы выбирать лучшее ребро каждой точки
+            edge_order = np.argsort(edge_destinations, kind="stable")
+            edge_vertices, edge_lengths = edge_vertices[edge_order], edge_lengths[edge_order]
+            edge_destinations = edge_destinations[edge_order]
+            destinations_with_edges, first_edges = np.unique(edge_destinations, return_index=True)
+
+            for i in np.flatnonzero(reachable_origins).tolist():
+                start_edges = self._visible_vertices_from(tuple(origin_coords[i].tolist()), profiler)
+
+                with profiler.stage("search") as sizes:
+                    vertex_distances, parents[i] = find_shortest_distances(
+                        len(self._vertices_coords), start_edges, neighbours, edge_vertices
+                    )
+
+                    # Длина маршрута через каждую вершину, видимую из конечной точки, и лучшая из них
+                    totals = vertex_distances[edge_vertices] + edge_lengths
+                    if len(totals):
+                        best = np.minimum.reduceat(totals, first_edges)
+                        best_edges = first_edges + _argmin_in_groups(totals, first_edges)
+
+                        improved = best < distances[i, destinations_with_edges]
+                        improved_destinations = destinations_with_edges[improved]
+                        distances[i, improved_destinations] = best[improved]
+                        last_vertices[i, improved_destinations] = edge_vertices[best_edges[improved]]
+
+                    sizes["targets"] = len(edge_vertices)
+
+            # Точки в запретных зонах и отверстиях многоугольников недостижимы
+            distances[~reachable_origins, :] = np.inf
+            distances[:, ~reachable_destinations] = np.inf
+
+        if not return_routes:
+            return DistanceMatrix(distances, None)
+
+        routes: list[list[LineString | None]] = []
+        for i, origin in enumerate(origins):
+            row: list[LineString | None] = []
+
+            for j, destination in enumerate(destinations):
+                if distances[i, j] == np.inf:
+                    row.append(None)
+                elif last_vertices[i, j] == -1:
+                    row.append(LineString([origin, destination]))
+                else:
+                    row.append(route_through_vertices(
+                        self._vertices_coords, parents[i], origin, destination, last_vertices[i, j]
+                    ))
+
+            routes.append(row)
+
+        return DistanceMatrix(distances, routes)
+
+    def find_approximate_route(
+        self,
+        start_point: Point,
+        finish_point: Point,
+        resolution: float = 1000.0,
+        profiler: RouteProfiler | None = None
+    ) -> ApproximateRoute:
+        """
+        Приближенный поиск маршрута по растровой сетке для наборов зон из сотен тысяч вершин.
+
+        Зоны растеризуются в плоскости, где отрезки между координатами остаются отрезками (широта
+        и долгота, умноженная на косинус наибольшей широты зон, в метрах), в сетку с шагом `resolution`.
+        Путь ищется по углам свободных ячеек в 16 направлениях (`lattice_distances` с ходами коня), ячейки
+        считаются занятыми с запасом, поэтому путь не проходит через зоны. Затем путь спрямляется: из каждой точки
+        маршрут идет в самую дальнюю точку пути, отрезок до которой не пересекает запретные зоны.
+
+        Вместе с маршрутом возвращается его длина и оценка превышения над длиной точного маршрута `find_route`:
+        нижняя граница длины точного маршрута вычисляется на той же сетке, где заняты только ячейки,
+        целиком лежащие в зонах. Чем меньше `resolution`, тем точнее маршрут и тем больше время поиска
+        """
+
+        profiler = profiler or NULL_PROFILER
+
+        fastest_route = LineString([start_point, finish_point])
+        direct_length = self._geod.inv(start_point.x, start_point.y, finish_point.x, finish_point.y)[2]
+
+        if self._zone is None:
+            return ApproximateRoute(fastest_route, direct_length, 0.0)
+
+        with profiler.stage("point_checks"):
+            if self._is_direct_route(fastest_route, start_point, finish_point):
+                return ApproximateRoute(fastest_route, direct_length, 0.0)
+
+        points = np.array([[start_point.x, start_point.y], [finish_point.x, finish_point.y]])
+
+        with profiler.stage("rasterization") as sizes:
+            with self._lock:
+                scale, blocked_zone, relaxed_zone = self._raster_zones(resolution)
+
+            plane_points = points * scale
+            bounds = np.concatenate((
+                np.minimum(blocked_zone.bounds[:2], plane_points.min(axis=0)),
+                np.maximum(blocked_zone.bounds[2:], plane_points.max(axis=0))
+            ))
+            grid = raster_grid(tuple(bounds), resolution)
+
+            if grid.shape[0] * grid.shape[1] > _MAX_RASTER_CELLS:
+                raise ValueError(f"Слишком мелкая сетка для этих запретных зон: {grid.shape[0]} x {grid.shape[1]} ячеек")
+
+            free = ~fill_cells(blocked_zone, grid)
+            relaxed_free = ~fill_cells(relaxed_zone, grid)
+
+            sizes["cells"] = free.size
+            sizes["blocked_cells"] = free.size - np.count_nonzero(free)
+
+        with profiler.stage("grid_search") as sizes:
+            start_corners, start_distances = self._raster_terminal(points[0], grid, free, scale)
+            finish_corners, finish_distances = self._raster_terminal(points[1], grid, free, scale)
+
+            distances = lattice_distances(free, resolution, finish_corners, finish_distances, knight_moves=True).reshape(-1)
+            totals = distances[start_corners] + start_distances
+
+            if not len(totals) or np.isinf(totals.min()):
+                raise ValueError(
+                    f"Невозможно проложить маршрут по сетке с шагом {resolution} м, уменьшите шаг или используйте find_route"
+                )
+
+            initial = np.full(len(distances), np.inf)
+            np.minimum.at(initial, finish_corners, finish_distances)
+            corners = lattice_path(
+                distances.reshape(grid.shape[0] + 1, grid.shape[1] + 1), free, resolution, initial,
+                start_corners[np.argmin(totals)], knight_moves=True
+            )
+
+            sizes["path_corners"] = len(corners)
+
+        with profiler.stage("smoothing") as sizes:
+            path = np.concatenate(([points[0]], corner_coords(grid, corners) / scale, [points[1]]))
+            route_coords = self._straightened_path(path)
+            length = float(self._edge_lengths(route_coords[:-1], route_coords[1:]).sum())
+
+            sizes["route_vertices"] = len(route_coords)
+
+        with profiler.stage("error_bound"):
+            lower_bound = max(direct_length, self._raster_lower_bound(grid, relaxed_free, plane_points, scale))
+
+        return ApproximateRoute(LineString(route_coords), length, max(0.0, length - lower_bound))
+
+    def _raster_zones(self, resolution: float) -> tuple[np.ndarray, BaseGeometry, BaseGeometry]:
+        """
+        Масштаб плоскости растеризации и запретные зоны в ней: расширенные на шаг сетки, чтобы любая ячейка,
+        центр которой лежит вне расширенных зон, не пересекала зоны, и суженные на половину диагонали ячейки,
+        чтобы ячейка с центром в суженных зонах целиком лежала в зонах. Запоминаются по шагу сетки
+        """
+
+        assert self._zone is not None
+
+        if resolution not in self._raster_zone_cache:
+            min_y, max_y = self._zone.bounds[1], self._zone.bounds[3]
+            max_latitude = min(max(abs(min_y), abs(max_y)), _MAX_RASTER_LATITUDE)
+            scale = np.array([np.cos(np.radians(max_latitude)), 1.0]) * _METRES_PER_DEGREE
+
+            zone = shapely.transform(self._zone, lambda coords: coords * scale)
+            self._raster_zone_cache[resolution] = (
+                scale,
+                shapely.buffer(zone, resolution, join_style="mitre"),
+                shapely.buffer(zone, -resolution * np.sqrt(2) / 2 * (1 + _RASTER_EROSION_MARGIN))
+            )
+
+        return self._raster_zone_cache[resolution]
+
+    def _raster_terminal(
+        self,
+        point: np.ndarray,
+        grid: RasterGrid,
+        free: np.ndarray,
+        scale: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Углы сетки рядом с точкой, отрезки до которых не пересекают запретные зоны, и длины этих отрезков
+        в плоскости сетки. Окно поиска углов увеличивается вдвое, пока в нем нет подходящих углов
+        """
+
+        rows, cols = grid.shape
+        padded = np.pad(free, 1, constant_values=True)
+        # Из угла есть переходы, если свободна хотя бы одна из прилегающих к нему ячеек
+        usable = padded[:-1, :-1] | padded[:-1, 1:] | padded[1:, :-1] | padded[1:, 1:]
+
+        row, col = ((point * scale - grid.origin) // grid.resolution).astype(int)[::-1]
+        radius = 1
+
+        while True:
+            row_range = np.arange(max(row - radius + 1, 0), min(row + radius, rows) + 1)
+            col_range = np.arange(max(col - radius + 1, 0), min(col + radius, cols) + 1)
+            window_rows, window_cols = np.meshgrid(row_range, col_range, indexing="ij")
+            window = (window_rows * (cols + 1) + window_cols)[usable[window_rows, window_cols]]
+
+            ends = corner_coords(grid, window) / scale
+            visible = self._edge_filter.visible(np.broadcast_to(point, ends.shape), ends)
+
+            if visible.any() or (len(row_range) == rows + 1 and len(col_range) == cols + 1):
+                corners = window[visible]
+                return corners, np.hypot(*(corner_coords(grid, corners) - point * scale).T)
+
+            radius *= 2
+
+    def _straightened_path(self, path: np.ndarray) -> np.ndarray:
+        """Спрямление пути: из каждой точки маршрут идет в самую дальнюю точку пути, видимую из нее"""
+
+        kept = [0]
+        current = 0
+
+        while current < len(path) - 1:
+            window = _STRAIGHTENING_WINDOW
+
+            while True:
+                candidates = np.arange(current + 1, min(len(path), current + 1 + window))
+                visible = self._edge_filter.visible(np.broadcast_to(path[current], (len(candidates), 2)), path[candidates])
+
+                if not visible.any():
+                    raise ValueError("Путь по сетке пересекает запретные зоны, уменьшите шаг сетки")
+
+                farthest = candidates[visible][-1]
+                if farthest < candidates[-1] or farthest == len(path) - 1:
+                    break
+
+                window *= 2
+
+            kept.append(farthest)
+            current = farthest
+
+        return path[kept]
+
+    def _raster_lower_bound(self, grid: RasterGrid, relaxed_free: np.ndarray, plane_points: np.ndarray, scale: np.ndarray) -> float:
+        """
+        Нижняя граница длины точного маршрута в метрах.
+
+        Маршрут в обход ячеек, целиком лежащих в зонах, не длиннее точного, а его повороты приходятся на углы ячеек.
+        Путь по решетке углов в 8 направлениях длиннее отрезка между теми же углами не более чем в `OCTILE_FACTOR`
+        раз, начальная и конечная точки соединяются с углами своих ячеек без длины. Длина в плоскости сетки
+        переводится в геодезическую наименьшим отношением геодезического расстояния к расстоянию в плоскости,
+        оцененным по точкам области сетки
+        """
+
+        cols = grid.shape[1]
+
+        def cell_corners(point: np.ndarray) -> np.ndarray:
+            col, row = np.clip((point - grid.origin) // grid.resolution, 0, np.array(grid.shape[::-1]) - 1).astype(int)
+            return np.array([row * (cols + 1) + col, row * (cols + 1) + col + 1, (row + 1) * (cols + 1) + col, (row + 1) * (cols + 1) + col + 1])
+
+        finish_corners = cell_corners(plane_points[1])
+        distances = lattice_distances(relaxed_free, grid.resolution, finish_corners, np.zeros(len(finish_corners)))
+        lattice_length = distances.reshape(-1)[cell_corners(plane_points[0])].min()
+
+        if np.isinf(lattice_length):
+            return 0.0
+
+        plane_length = lattice_length / OCTILE_FACTOR - 2 * np.sqrt(2) * grid.resolution
+
+        # Отношение длин по парам точек сетки 9 x 9 на области сетки и по коротким отрезкам из этих точек
+        min_x, min_y = np.array(grid.origin) / scale
+        max_x, max_y = (np.array(grid.origin) + np.array(grid.shape[::-1]) * grid.resolution) / scale
+        xs, ys = np.meshgrid(np.linspace(min_x, max_x, 9), np.linspace(min_y, max_y, 9))
+        samples = np.column_stack((xs.ravel(), ys.ravel()))
+
+        first, second = np.triu_indices(len(samples), 1)
+        angles = np.linspace(0, 2 * np.pi, 16, endpoint=False)
+        offsets = np.column_stack((np.cos(angles), np.sin(angles))) * grid.resolution / scale
+        starts = np.concatenate((samples[first], np.repeat(samples, len(offsets), axis=0)))
+        ends = np.concatenate((samples[second], (samples[:, None] + offsets).reshape(-1, 2)))
+
+        ratio = (self._edge_lengths(starts, ends) / np.hypot(*((ends - starts) * scale).T)).min()
+
+        return max(0.0, plane_length * ratio * (1 - _RASTER_RATIO_MARGIN))
+
+    def _is_direct_route(self, fastest_route: LineString, start_point: Point, finish_point: Point) -> bool:
+        """
+        Прямая от начальной точки до конечной не проходит через запретные зоны. Если проходит,
+        проверяется, что точки не находятся в запретных зонах и в отверстиях многоугольников
+        """
+
+        assert self._zone is not None
+
+        # Проверка на пересечение самого оптимального маршрута (прямая от стартовой точки до финишной)
+        # с запретными зонами
+        if not (
+            fastest_route.crosses(self._zone) or
+            self._zone.contains(fastest_route)
+        ):
+            return True
+
+        # Проверка на наличие точек в запретных зонах
+        if (
+            self._zone.contains(start_point) or
+            self._zone.contains(finish_point)
+        ):
+            raise ValueError("Точки не могут находиться в запретной зоне")
+
+        # Проверка на наличие маршрута от начальной точки до финишной
+        # (проверяется, не запечатана ли начальная или конечная точки, т.е.не находится ли какая-то из этих точек
+        # в отверстии, которое находится в одном из многоугольников)
+        for holes in self._holes:
+            if _exists_point_in_multipolygon(holes, start_point):
+                raise ValueError("Невозможно проложить маршрут: начальная точка находится в отверстии одного из полигонов")
+            elif _exists_point_in_multipolygon(holes, finish_point):
+                raise ValueError("Невозможно проложить маршрут: конечная точка находится в отверстии одного из полигонов")
+
+        return False
+
+    def _is_reachable(self, point: Point) -> bool:
+        """Точка не находится в запретной зоне или в отверстии многоугольника"""
+
+        assert self._zone is not None
+
+        return not (
+            self._zone.contains(point) or
+            any(_exists_point_in_multipolygon(holes, point) for holes in self._holes)
+        )
+
+    def _init_state(self, key: str, coord_system: str, graph_builder: GraphBuilder) -> None:
+        self._key = key
+        self._geod = Geod(ellps=coord_system)
+        self._coord_system = coord_system
+        self._graph_builder = graph_builder
+        self._lock = Lock()
+        self._graph: CsrGraph | None = None
+        self._neighbours: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._raster_zone_cache: dict[float, tuple[np.ndarray, BaseGeometry, BaseGeometry]] = {}
+
+    def _set_zone(self, zone: MultiPolygon, zone_vertices: ZoneVertices | None, profiler: RouteProfiler) -> None:
+        """Подготовка запретных зон к поиску маршрутов, вершины зон вычисляются, если они не переданы"""
+
+        self._zone = zone
+        shapely.prepare(self._zone)
+
+        # Отверстия многоугольников, в которых не могут находиться начальная и конечная точки
+        with profiler.stage("holes") as sizes:
+            self._holes = [
+                MultiPolygon(tuple(Polygon(interior) for interior in polygon.interiors))
+                for polygon in zone.geoms
+                if polygon.interiors
+            ]
+            shapely.prepare(self._holes)
+            sizes["holes"] = sum(len(holes.geoms) for holes in self._holes)
+
+        # Вершины запретных зон, через которые может проходить кратчайший маршрут
+        with profiler.stage("vertices") as sizes:
+            self._zone_vertices = convex_vertices(zone) if zone_vertices is None else zone_vertices
+            self._vertices_coords = self._zone_vertices.coords
+            sizes["vertices"] = len(self._vertices_coords)
+
+        with profiler.stage("edge_filter_index"):
+            self._edge_filter = EdgeFilter(zone)
+
+    def _processed_zone(self, restricted_polygons: MultiPolygon, profiler: RouteProfiler) -> MultiPolygon:
+        """Буферизация и упрощение запретных зон"""
+
+        # Буферизация запретных зон
+        if self._buffer_distance:
+            with profiler.stage("buffering") as sizes:
+                buffered = buffer_geometry_in_metres(restricted_polygons, self._buffer_distance, self._coord_system)
+                restricted_polygons = _make_multipolygon(buffered)
+                sizes["zone_vertices"] = shapely.get_num_coordinates(restricted_polygons)
+
+        # Объединение и упрощение запретных зон наружу
+        if self._simplify_tolerance:
+            with profiler.stage("simplification") as sizes:
+                sizes["zone_vertices_before"] = shapely.get_num_coordinates(restricted_polygons)
+                restricted_polygons = simplify_geometry_in_metres(
+                    restricted_polygons, self._simplify_tolerance, self._coord_system
+                )
+                sizes["zone_vertices_after"] = shapely.get_num_coordinates(restricted_polygons)
+
+        return restricted_polygons
+
+    def _editable_sources(self) -> dict[int, Polygon | MultiPolygon]:
+        if self._sources is None:
+            raise ValueError("Набор зон, загруженный из файла, нельзя изменить")
+
+        return self._sources
+
+    def _update_zone(self, profiler: RouteProfiler) -> None:
+        """Пересчет запретных зон по исходным зонам и обновление графа по изменившимся областям"""
+
+        assert self._sources is not None
+
+        polygons = [part for source in self._sources.values() for part in shapely.get_parts(source)]
+        restricted_polygons = MultiPolygon(polygons) if polygons else None
+
+        self._key = compiled_zones_key(
+            restricted_polygons, self._buffer_distance, self._coord_system, self._graph_builder, self._simplify_tolerance
+        )
+
+        # Касательные ребра ленивого графа запоминаются по индексам вершин, которые меняются вместе с зонами
+        self._neighbours = {}
+        self._raster_zone_cache = {}
+
+        if restricted_polygons is None:
+            self._zone = None
+            self._graph = None
+            return
+
+        # Зоны без буферизации могут перекрываться, при буферизации они объединяются
+        if not self._buffer_distance and not restricted_polygons.is_valid:
+            restricted_polygons = _make_multipolygon(shapely.union_all(polygons))
+
+        previous_zone, previous_graph = self._zone, self._graph
+        previous_vertices = self._zone_vertices if previous_zone is not None else None
+
+        self._set_zone(self._processed_zone(restricted_polygons, profiler), None, profiler)
+
+        if previous_zone is None or previous_vertices is None or previous_graph is None:
+            self._graph = None
+            return
+
+        self._graph = self._updated_graph(previous_zone, previous_vertices, previous_graph, profiler)
+
+    def _updated_graph(
+        self,
+        previous_zone: MultiPolygon,
+        previous_vertices: ZoneVertices,
+        previous_graph: CsrGraph,
+        profiler: RouteProfiler
+    ) -> CsrGraph:
+        """
+        Граф для измененных запретных зон, построенный из графа для прежних зон.
+
+        Вершина сохраняется, если у нее не изменились координаты и соседние вершины кольца:
+        касание ребер в ней остается прежним. Видимость ребра между сохраненными вершинами
+        может измениться, только если отрезок проходит через добавленную или освободившуюся область:
+        - прежние ребра, ограничивающие прямоугольники которых пересекают добавленную область, проверяются заново;
+        - пары сохраненных вершин, не соединенные ребром, проверяются, если их отрезки проходят рядом
+          с освободившейся областью;
+        - ребра новых и изменившихся вершин строятся полностью
+        """
+
+        coords = self._vertices_coords
+        count = len(coords)
+
+        with profiler.stage("zone_update") as sizes:
+            added_bounds = _parts_bounds(shapely.difference(self._zone, previous_zone))
+            released_bounds = _parts_bounds(shapely.difference(previous_zone, self._zone))
+
+            # Соответствие прежних вершин новым по координатам вершины и соседних вершин кольца
+            new_index = {key: i for i, key in enumerate(map(tuple, np.hstack(self._zone_vertices).tolist()))}
+            old_to_new = np.array(
+                [new_index.get(key, -1) for key in map(tuple, np.hstack(previous_vertices).tolist())], dtype=int
+            )
+            kept_vertices = np.zeros(count, dtype=bool)
+            kept_vertices[old_to_new[old_to_new >= 0]] = True
+
+            # Прежние ребра между сохраненными вершинами
+            old_u = np.repeat(np.arange(previous_graph.number_of_nodes), np.diff(previous_graph.indptr))
+            old_v = previous_graph.indices
+            upper = old_u < old_v
+            u, v = old_to_new[old_u[upper]], old_to_new[old_v[upper]]
+            lengths = previous_graph.weights[upper]
+            kept = (u >= 0) & (v >= 0)
+            u, v, lengths = np.minimum(u[kept], v[kept]), np.maximum(u[kept], v[kept]), lengths[kept]
+
+            # Ребра, которые могут проходить через добавленную область
+            recheck = _segments_near_bounds(coords[u], coords[v], added_bounds)
+            sizes["rechecked_edges"] = np.count_nonzero(recheck)
+
+        with profiler.stage("edge_filtering") as sizes:
+            blocked = np.flatnonzero(recheck)[~self._edge_filter.visible(coords[u[recheck]], coords[v[recheck]])]
+            u, v, lengths = np.delete(u, blocked), np.delete(v, blocked), np.delete(lengths, blocked)
+            sizes["blocked_edges"] = len(blocked)
+
+        edges = [(u, v, lengths)]
+        existing = u * count + v
+
+        # Ребра новых и изменившихся вершин со всеми вершинами
+        changed_vertices = np.flatnonzero(~kept_vertices)
+        rows = max(1, _UPDATE_BLOCK_SIZE // max(count, 1))
+
+        for row_start in range(0, len(changed_vertices), rows):
+            with profiler.stage("edge_generation") as sizes:
+                pair_u = np.repeat(changed_vertices[row_start:row_start + rows], count)
+                pair_v = np.tile(np.arange(count), len(pair_u) // count)
+
+                # Пара двух изменившихся вершин проверяется один раз
+                pair_mask = (pair_u != pair_v) & (kept_vertices[pair_v] | (pair_v > pair_u))
+                pair_u, pair_v = pair_u[pair_mask], pair_v[pair_mask]
+                sizes["pairs"] = len(pair_u)
+
+            edges.append(self._visible_edges(pair_u, pair_v, profiler))
+
+        # Пары сохраненных вершин, отрезки которых могут проходить через освободившуюся область
+        if len(released_bounds):
+            kept_indices = np.flatnonzero(kept_vertices)
+
+            if self._graph_builder == "tangent":
+                kept_pairs = tangent_pairs(
+                    coords[kept_indices],
+                    self._zone_vertices.prev[kept_indices],
+                    self._zone_vertices.next[kept_indices],
+                    _UPDATE_BLOCK_SIZE
+                )
+            else:
+                kept_pairs = vertex_pairs(len(kept_indices), _UPDATE_BLOCK_SIZE)
+
+            for block_u, block_v in kept_pairs:
+                with profiler.stage("edge_generation") as sizes:
+                    pair_u, pair_v = kept_indices[block_u], kept_indices[block_v]
+
+                    near = _segments_near_bounds(coords[pair_u], coords[pair_v], released_bounds)
+                    near &= ~np.isin(pair_u * count + pair_v, existing)
+                    pair_u, pair_v = pair_u[near], pair_v[near]
+                    sizes["pairs"] = len(pair_u)
+
+                edges.append(self._visible_edges(pair_u, pair_v, profiler))
+
+        with profiler.stage("graph_construction") as sizes:
+            graph = CsrGraph.from_edges(
+                count,
+                np.concatenate([edge_u for edge_u, _, _ in edges]),
+                np.concatenate([edge_v for _, edge_v, _ in edges]),
+                np.concatenate([edge_lengths for _, _, edge_lengths in edges])
+            )
+            sizes["graph_bytes"] = graph.nbytes
+
+        return graph
+
+    def _visible_edges(
+        self,
+        u: np.ndarray,
+        v: np.ndarray,
+        profiler: RouteProfiler
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Отбор ребер графа из пар вершин `u[i] - v[i]` и вычисление их длин"""
+
+        coords, prev_coords, next_coords = self._zone_vertices
+
+        # Касательный граф: отбрасываются ребра, которые не касаются многоугольников в обеих вершинах
+        with profiler.stage("edge_generation") as sizes:
+            if self._graph_builder == "tangent":
+                tangent = (
+                    tangent_mask(coords[u], prev_coords[u], next_coords[u], coords[v]) &
+                    tangent_mask(coords[v], prev_coords[v], next_coords[v], coords[u])
+                )
+                u, v = u[tangent], v[tangent]
+
+            sizes["candidate_edges"] = len(u)
+
+        # Отбор тех ребер, которые не пересекают запретные зоны
+        with profiler.stage("edge_filtering") as sizes:
+            visible = self._edge_filter.visible(coords[u], coords[v])
+            u, v = u[visible], v[visible]
+            sizes["kept_edges"] = len(u)
+
+        # Длины ребер вычисляются одним вызовом для всего массива
+        with profiler.stage("edge_lengths"):
+            return u, v, self._edge_lengths(coords[u], coords[v])
+
+    def _zone_graph(self, profiler: RouteProfiler) -> CsrGraph:
+        """Граф видимости между вершинами запретных зон, строится при первом обращении"""
+
+        if self._graph is None:
+            coords = self._vertices_coords
+
+            edges: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+
+            # Ребра перебираются блоками, чтобы не хранить все O(n²) пар вершин одновременно.
+            # Для касательного графа перебираются только пары с общими касательными направлениями
+            if self._graph_builder == "tangent":
+                pairs = tangent_pairs(*self._zone_vertices)
+            else:
+                pairs = vertex_pairs(len(coords))
+            while True:
+                with profiler.stage("edge_generation") as sizes:
+                    block = next(pairs, None)
+                    if block is None:
+                        break
+
+                    sizes["pairs"] = len(block[0])
+
+                edges.append(self._visible_edges(*block, profiler))
+
+            # Создание графа
+            with profiler.stage("graph_construction") as sizes:
+                self._graph = CsrGraph.from_edges(
+                    len(coords),
+                    np.concatenate([np.empty(0, dtype=int)] + [edge_u for edge_u, _, _ in edges]),
+                    np.concatenate([np.empty(0, dtype=int)] + [edge_v for _, edge_v, _ in edges]),
+                    np.concatenate([np.empty(0)] + [edge_lengths for _, _, edge_lengths in edges])
+                )
+                sizes["graph_bytes"] = self._graph.nbytes
+
+        return self._graph
+
+    def _find_route_in_corridor(self, start_point: Point, finish_point: Point, profiler: RouteProfiler) -> LineString | None:
+        """
+        Поиск маршрута только среди зон, пересекающих коридор - эллипс с фокусами в начальной и конечной точках.
+
+        Без части зон кратчайший маршрут не может стать длиннее, поэтому, если маршрут, найденный среди зон
+        коридора, не проходит через остальные зоны, он оптимален и для всех зон. Иначе коридор расширяется,
+        а пересеченные маршрутом зоны добавляются к нему. Если коридор охватывает все зоны, возвращается `None`.
+
+        Зоны коридора не подготавливаются заново: поиск идет по вершинам графа, принадлежащим многоугольникам
+        коридора, а видимость проверяется общим `EdgeFilter` с маской этих многоугольников
+        """
+
+        polygons = shapely.get_parts(self._zone)
+        polygons_tree = STRtree(polygons)
+        kept = np.zeros(len(polygons), dtype=bool)
+
+        # Многоугольники, которым принадлежат вершины графа: общая вершина касающихся многоугольников - нескольким
+        vertex_idx, vertex_polygon_idx = polygons_tree.query(
+            shapely.points(self._vertices_coords), predicate="intersects"
+        )
+
+        start_coords = np.array([[start_point.x, start_point.y]])
+        finish_coords = np.array([[finish_point.x, finish_point.y]])
+        direct_length = self._geod.inv(start_point.x, start_point.y, finish_point.x, finish_point.y)[2]
+        excess = _CORRIDOR_INITIAL_EXCESS
+
+        while True:
+            with profiler.stage("corridor") as sizes:
+                corridor = corridor_polygon(
+                    self._geod, start_point, finish_point, direct_length * (1 + excess), self._coord_system
+                )
+
+                if corridor is None:
+                    kept[:] = True
+                else:
+                    kept[polygons_tree.query(corridor, predicate="intersects")] = True
+
+                sizes["zones"] = len(polygons)
+                sizes["kept_zones"] = np.count_nonzero(kept)
+
+            if kept.all():
+                return None
+
+            corridor_polygons = kept.copy()
+            vertices = np.unique(vertex_idx[corridor_polygons[vertex_polygon_idx]])
+
+            if self._edge_filter.visible(start_coords, finish_coords, corridor_polygons)[0]:
+                route = LineString([start_point, finish_point])
+            else:
+                route, _ = self._search(
+                    start_point,
+                    finish_point,
+                    profiler,
+                    self._corridor_neighbours(vertices, corridor_polygons, profiler),
+                    self._visible_vertices_from((start_point.x, start_point.y), profiler, vertices, corridor_polygons),
+                    self._visible_vertices_from((finish_point.x, finish_point.y), profiler, vertices, corridor_polygons)
+                )
+
+            # Проверка маршрута на пересечение с зонами вне коридора
+            with profiler.stage("corridor_check"):
+                coords = shapely.get_coordinates(route)
+                if self._edge_filter.visible(coords[:-1], coords[1:]).all():
+                    return route
+
+                kept[polygons_tree.query(route, predicate="intersects")] = True
+
+            excess *= _CORRIDOR_EXCESS_GROWTH
+
+    def _corridor_neighbours(
+        self,
+        vertices: np.ndarray,
+        polygons: np.ndarray,
+        profiler: RouteProfiler
+    ) -> Callable[[int], tuple[np.ndarray, np.ndarray]]:
+        """Касательные ребра между вершинами коридора `vertices` с учетом только многоугольников `polygons`"""
+
+        neighbours: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+        def corridor_neighbours(node: int) -> tuple[np.ndarray, np.ndarray]:
+            if node not in neighbours:
+                neighbours[node] = self._tangent_edges(node, profiler, vertices, polygons)
+            return neighbours[node]
+
+        return corridor_neighbours
+
+    def _search(
+        self,
+        start_point: Point,
+        finish_point: Point,
+        profiler: RouteProfiler,
+        neighbours: Callable[[int], tuple[np.ndarray, np.ndarray]],
+        start_edges: tuple[np.ndarray, np.ndarray] | None = None,
+        finish_edges: tuple[np.ndarray, np.ndarray] | None = None
+    ) -> tuple[LineString, float]:
+        """
+        Поиск кратчайшего пути A* по вершинам запретных зон с временно присоединенными начальной и конечной точками.
+        Возвращается маршрут и его длина в метрах
+        """
+
+        # Ребра от начальной и конечной точек до видимых вершин запретных зон, если они не переданы
+        if start_edges is None:
+            start_edges = self._visible_vertices_from((start_point.x, start_point.y), profiler)
+        if finish_edges is None:
+            finish_edges = self._visible_vertices_from((finish_point.x, finish_point.y), profiler)
+
+        with profiler.stage("search") as sizes:
+            # Геодезическое расстояние до конечной точки не превышает длины любого пути до нее
+            coords = self._vertices_coords
+            heuristic = self._edge_lengths(coords, np.broadcast_to([finish_point.x, finish_point.y], coords.shape))
+
+            expanded_nodes = 0
+
+            def counted_neighbours(node: int) -> tuple[np.ndarray, np.ndarray]:
+                nonlocal expanded_nodes
+                expanded_nodes += 1
+                return neighbours(node)
+
+            try:
+                return find_fastest_route_with_length_in_vertices(
+                    coords, start_point, finish_point, start_edges, finish_edges, counted_neighbours, heuristic
+                )
+            finally:
+                sizes["expanded_nodes"] = expanded_nodes + 1
+
+    def _neighbours_of(self, node: int, profiler: RouteProfiler) -> tuple[np.ndarray, np.ndarray]:
+        """Касательные ребра от вершины запретных зон до видимых из нее вершин, запоминаются при первом обращении"""
+
+        if node not in self._neighbours:
+            self._neighbours[node] = self._tangent_edges(node, profiler)
+
+        return self._neighbours[node]
+
+    def _tangent_edges(
+        self,
+        node: int,
+        profiler: RouteProfiler,
+        vertices: np.ndarray | None = None,
+        polygons: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Касательные ребра от вершины запретных зон до видимых из нее вершин `vertices` (по умолчанию всех)
+        с учетом многоугольников, отмеченных в `polygons` (по умолчанию всех)
+        """
+
+        with profiler.stage("lazy_edges") as sizes:
+            coords, prev_coords, next_coords = self._zone_vertices
+            indices = np.arange(len(coords)) if vertices is None else vertices
+            indices = indices[indices != node]
+            point = np.broadcast_to(coords[node], (len(indices), 2))
+
+            # Отбрасываются ребра, которые не касаются многоугольников в обеих вершинах
+            candidates = (
+                tangent_mask(
+                    point,
+                    np.broadcast_to(prev_coords[node], point.shape),
+                    np.broadcast_to(next_coords[node], point.shape),
+                    coords[indices]
+                ) &
+                tangent_mask(coords[indices], prev_coords[indices], next_coords[indices], point)
+            )
+            indices = indices[candidates]
+
+            # Отбор тех ребер, которые не пересекают запретные зоны
+            visible = self._edge_filter.visible(point[:len(indices)], coords[indices], polygons)
+            indices = indices[visible]
+            lengths = self._edge_lengths(point[:len(indices)], coords[indices])
+
+            sizes["candidate_edges"] = len(visible)
+            sizes["kept_edges"] = len(indices)
+
+        return indices, lengths
+
+    def _visible_vertices_from(
+        self,
+        point: tuple[float, float],
+        profiler: RouteProfiler,
+        vertices: np.ndarray | None = None,
+        polygons: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Индексы вершин запретных зон, видимых из точки, и длины ребер до них. Если переданы вершины коридора
+        `vertices` и маска его многоугольников `polygons`, ищутся касательные ребра до вершин коридора
+        """
+
+        with profiler.stage("terminal_edges") as sizes:
+            coords, prev_coords, next_coords = self._zone_vertices
+
+            candidates = np.any(coords != point, axis=1)
+            if self._graph_builder in ("tangent", "lazy") or vertices is not None:
+                starts = np.broadcast_to(np.asarray(point, dtype=float), coords.shape)
+                candidates &= tangent_mask(coords, prev_coords, next_coords, starts)
+
+            if vertices is not None:
+                in_corridor = np.zeros(len(coords), dtype=bool)
+                in_corridor[vertices] = True
+                candidates &= in_corridor
+
+            indices = np.flatnonzero(candidates)
+            starts = np.broadcast_to(np.asarray(point, dtype=float), (len(indices), 2))
+
+            visible = self._edge_filter.visible(starts, coords[indices], polygons)
+            indices = indices[visible]
+            lengths = self._edge_lengths(starts[visible], coords[indices])
+
+            sizes["candidate_edges"] = len(visible)
+            sizes["kept_edges"] = len(indices)
+
+            return indices, lengths
+
+    def _edge_lengths(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Геодезические длины ребер в метрах"""
+
+        if not len(starts):
+            return np.empty(0)
+
+        return np.asarray(self._geod.inv(starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1])[2])
+
+
+def compiled_zones_key(
+    restricted_polygons: MultiPolygon | None,
+    buffer_distance: float | None,
+    coord_system: str,
+    graph_builder: GraphBuilder,
+    simplify_tolerance: float | None
+) -> str:
+    """
+    Функция для вычисления отпечатка входных данных `RouteEngine` (`RouteEngine.key`): по нему проверяется
+    соответствие файла скомпилированных зон и возможность повторно использовать уже скомпилированные зоны
+    """
+
+    fingerprint = blake2b(digest_size=20)
+
+    if restricted_polygons:
+        fingerprint.update(shapely.to_wkb(restricted_polygons))
+
+    fingerprint.update(
+        f"|{float(buffer_distance or 0)!r}|{coord_system}|{graph_builder}|{float(simplify_tolerance or 0)!r}".encode()
+    )
+
+    return fingerprint.hexdigest()
+
+
+def _parts_bounds(geometry: BaseGeometry) -> np.ndarray:
+    """Ограничивающие прямоугольники непустых частей геометрии"""
+
+    parts = shapely.get_parts(geometry)
+    return shapely.bounds(parts[~shapely.is_empty(parts)]).reshape(-1, 4)
+
+
+def _segments_near_bounds(starts: np.ndarray, ends: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """Отрезки, ограничивающие прямоугольники которых пересекают хотя бы один из прямоугольников `bounds`"""
+
+    min_x, max_x = np.minimum(starts[:, 0], ends[:, 0]), np.maximum(starts[:, 0], ends[:, 0])
+    min_y, max_y = np.minimum(starts[:, 1], ends[:, 1]), np.maximum(starts[:, 1], ends[:, 1])
+
+    near = np.zeros(len(starts), dtype=bool)
+    for box_min_x, box_min_y, box_max_x, box_max_y in bounds.tolist():
+        near |= (min_x <= box_max_x) & (max_x >= box_min_x) & (min_y <= box_max_y) & (max_y >= box_min_y)
+
+    return near
+
+
+def _argmin_in_groups(values: np.ndarray, group_starts: np.ndarray) -> np.ndarray:
+    """Позиции минимальных значений внутри групп, заданных началами групп, относительно начала группы"""
+
+    group_ids = np.repeat(np.arange(len(group_starts)), np.diff(np.append(group_starts, len(values))))
+    order = np.lexsort((values, group_ids))
+    return order[np.searchsorted(group_ids[order], np.arange(len(group_starts)))] - group_starts
+
+
+def _make_multipolygon(geometry: Polygon | MultiPolygon) -> MultiPolygon:
+    """
+    Функция для создания объекта типа MultiPolygon
+    """
+
+    if isinstance(geometry, MultiPolygon):
+        return geometry
+
+    return MultiPolygon([geometry])
+
+
+def _exists_point_in_multipolygon(polygon: MultiPolygon, point: Point) -> bool:
+    return any((polygon.contains(point), polygon.touches(point)))
@@ -1,41 +1,137 @@
-from itertools import combinations
-from typing import Any, Iterable, NamedTuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from os import PathLike
+from typing import BinaryIO, Iterable, NamedTuple, Sequence, TextIO
+
+import numpy as np
+import shapely
+from shapely import MultiPolygon, Point, LineString
+
+from optimal_route.cache import RouteCache, route_fingerprint
+from optimal_route.engine import ApproximateRoute, DistanceMatrix, GraphBuilder, RouteEngine, WaypointRoute
+from optimal_route.profiling import NULL_PROFILER, RouteProfiler
+from optimal_route.utils.binary import (
+    geodesic_lengths,
+    points_from_geoarrow,
+    points_from_wkb,
+    routes_to_geoarrow,
+    routes_to_wkb,
+    zone_from_geoarrow,
+    zone_from_wkb
+)
+from optimal_route.utils.geojson import parse_route_geojson, parse_route_geojson_stream, serialize_route_to_geojson
+from optimal_route.models.routes import (
+    RouteFindDTO, RouteSendDTO, RouteBatchFindDTO, RouteBatchSendDTO, RouteWaypointsSendDTO
+)
+
+
+def find_optimal_route_with_geojson(
+    geojson: str,
+    cache: RouteCache | None = None,
+    fast_io: bool = False,
+    profiler: RouteProfiler | None = None
+) -> str:
+    """
+    Функция для нахождения оптимального пути с помощью GeoJSON.
+
+    Если передан кэш, в нем сохраняется сформированный GeoJSON маршрута, а при повторном запросе
+    с теми же данными он возвращается без изменений, без поиска маршрута и без pydantic моделей.
+
+    При `fast_io` GeoJSON разбирается и формируется без pydantic моделей (`parse_route_request`,
+    `serialize_route`), ошибки в данных возвращаются в виде `ValueError`
+    """
+
+    profiler = profiler or NULL_PROFILER
+
+    with profiler.capture():
+        with profiler.stage("parsing") as sizes:
+            sizes["input_bytes"] = len(geojson)
+            route_search_data = parse_route_request(geojson, fast_io)
+
+        if cache is not None:
+            with profiler.stage("cache_lookup"):
+                key = route_fingerprint(**route_search_data._asdict(), output="geojson")
+                cached_geojson = cache.get(key)
+
+            if cached_geojson is not None:
+                return cached_geojson
 
-from pyproj import Geod
-from networkx import Graph
-from shapely import MultiPolygon, Point, LineString, Polygon
-from shapely.validation import explain_validity
+        optimal_route = find_optimal_route(**route_search_data._asdict(), profiler=profiler)
 
-from optimal_route.models.routes import RouteFindDTO, RouteSendDTO
-from optimal_route.utils.buffer import buffer_geometry_in_metres
-from optimal_route.utils.route import find_fastest_route_in_graph
+        with profiler.stage("serialization") as sizes:
+            geojson_to_send = serialize_route(optimal_route, fast_io)
+            sizes["output_bytes"] = len(geojson_to_send)
 
+        if cache is not None:
+            cache.set(key, geojson_to_send)
 
-def find_optimal_route_with_geojson(geojson: str) -> str:
+        return geojson_to_send
+
+
+def find_optimal_route_with_geojson_stream(
+    source: str | PathLike | BinaryIO | TextIO,
+    cache: RouteCache | None = None,
+    coord_system: str = "WGS84",
+    profiler: RouteProfiler | None = None
+) -> str:
     """
-    Функция для нахождения оптимального пути с помощью GeoJSON
+    Функция для нахождения оптимального пути по GeoJSON из файла или потока.
+
+    FeatureCollection читается по одному объекту (`parse_route_geojson_stream`), поэтому большие файлы
+    с запретными зонами не загружаются в память целиком. Объектов `restricted_polygons` может быть несколько,
+    каждый со своим `buffer_distance`. Маршрут формируется так же, как при `fast_io`
     """
 
-    route_data = _validate_route_geojson_to_data(geojson)
+    profiler = profiler or NULL_PROFILER
+
+    with profiler.capture():
+        with profiler.stage("parsing") as sizes:
+            route_search_data = RouteSearch(*parse_route_geojson_stream(source, coord_system))
+
+            if route_search_data.restricted_polygons is not None:
+                sizes["zone_vertices"] = shapely.get_num_coordinates(route_search_data.restricted_polygons)
+
+        if cache is not None:
+            with profiler.stage("cache_lookup"):
+                key = route_fingerprint(
+                    **route_search_data._asdict(), coord_system=coord_system, output="geojson"
+                )
+                cached_geojson = cache.get(key)
 
-    route_send_data = find_optimal_route_with_pydantic_model(route_data)
-    
-    geojson_to_send = _serialize_route_data_to_geojson(route_send_data)
-    return geojson_to_send
+            if cached_geojson is not None:
+                return cached_geojson
 
+        optimal_route = find_optimal_route(
+            **route_search_data._asdict(), coord_system=coord_system, profiler=profiler
+        )
 
-def find_optimal_route_with_pydantic_model(data: RouteFindDTO) -> RouteSendDTO:
+        with profiler.stage("serialization") as sizes:
+            geojson_to_send = serialize_route_to_geojson(optimal_route)
+            sizes["output_bytes"] = len(geojson_to_send)
+
+        if cache is not None:
+            cache.set(key, geojson_to_send)
+
+        return geojson_to_send
+
+
+def find_optimal_route_with_pydantic_model(data: RouteFindDTO, profiler: RouteProfiler | None = None) -> RouteSendDTO:
     """
     Функция для нахождения оптимального пути с помощью pydantic моделей
     """
 
-    route_search_data = _process_data_to_find_route(data)
+    profiler = profiler or NULL_PROFILER
+
+    with profiler.capture():
+        with profiler.stage("parsing"):
+            route_search_data = _process_data_to_find_route(data)
 
-    optimal_route = find_optimal_route(**route_search_data._asdict())
+        optimal_route = find_optimal_route(**route_search_data._asdict(), profiler=profiler)
 
-    route_send_data = _process_data_to_send_route(optimal_route)
+        with profiler.stage("serialization"):
+            route_send_data = _process_data_to_send_route(optimal_route)
 
-    return route_send_data
+        return route_send_data
 
 
 def find_optimal_route(
@@ -43,85 +139,366 @@ def find_optimal_route(
     finish_point: Point,
     restricted_polygons: MultiPolygon | None = None,
     buffer_distance: float | None = None,
-    coord_system: str = "WGS84"
+    coord_system: str = "WGS84",
+    graph_builder: GraphBuilder = "visibility",
+    cache: RouteCache | None = None,
+    profiler: RouteProfiler | None = None,
+    corridor_pruning: bool = True,
+    simplify_tolerance: float | None = None
 ) -> LineString:
     """
-    Функция для нахождения оптимального маршрута исходя из наличия зон запрета
-    """
-
-    fastest_route = LineString([start_point, finish_point])
-
-    # Проверка на наличие запретных зон
-    if not restricted_polygons:
-        return fastest_route
-
-    # Проверка на валидность запретных зон
-    if not restricted_polygons.is_valid:
-        raise ValueError("Запретные зоны не валидны: " + explain_validity(restricted_polygons))
-
-    # Буферизация запретных зон
-    if buffer_distance:
-        buffered = buffer_geometry_in_metres(restricted_polygons, buffer_distance)
-        restricted_polygons = _make_multipolygon(buffered)
-
-    # Проверка на пересечение самого оптимального маршрута (прямая от стартовой точки до финишной)
-    # с запретными зонами
-    if not (
-        fastest_route.crosses(restricted_polygons) or 
-        restricted_polygons.contains(fastest_route)
-    ):
-        return fastest_route
-    
-    # Проверка на наличие точек в запретных зонах
-    if (
-        restricted_polygons.contains(start_point) or 
-        restricted_polygons.contains(finish_point)
-    ):
-        raise ValueError("Точки не могут находиться в запретной зоне")
-
-    # Создание списка с вершинами
-    vertices = {(start_point.x, start_point.y), (finish_point.x, finish_point.y)}
-
-    for polygon in restricted_polygons.geoms:
-        # Проверка на наличие маршрута от начальной точки до финишной
-        # (проверяется, не запечатана ли начальная или конечная точки, т.е.не находится ли какая-то из этих точек
-        # в отверстии, которое находится в одном из многоугольников)
-        holes = MultiPolygon(tuple(Polygon(interior) for interior in polygon.interiors))
-        
-        start_point_in_holes = _exists_point_in_multipolygon(holes, start_point)
-        finish_point_in_holes = _exists_point_in_multipolygon(holes, finish_point)
-        
-        if start_point_in_holes:
-            raise ValueError("Невозможно проложить маршрут: начальная точка находится в отверстии одного из полигонов")
-        elif finish_point_in_holes:
-            raise ValueError("Невозможно проложить маршрут: конечная точка находится в отверстии одного из полигонов")
-
-        # Добавление вершин, которые находятся в запретных зонах
-        vertices.update(polygon.exterior.coords)
-    
-    # Создание списка ребер
-    edges = combinations(vertices, 2)
-
-    # Отбор тех ребер, которые не пересекают запретные зоны
-    filtered_edges = _filter_edges(edges, restricted_polygons)
-
-    # Создание графа
-    graph = Graph()
-
-    # Добавление вершин в граф
-    graph.add_nodes_from(vertices)
-
-    # Добавление тех ребер в граф, которые не пересекают запретные зоны
-    graph.add_edges_from(filtered_edges)
-
-    # Создание вызываемого объекта для вычисления веса ребер
-    geod = Geod(ellps=coord_system)
-    edge_weight = _EgdeWeight(geod)
-    
-    # Поиск кратчайшего пути
-    optimal_route = find_fastest_route_in_graph(graph, start_point, finish_point, edge_weight)
-
-    return optimal_route
+    Функция для нахождения оптимального маршрута исходя из наличия зон запрета.
+
+    Если передан кэш, найденный маршрут сохраняется в нем и при повторном запросе с теми же данными
+    не ищется заново. Если передан профилировщик, в нем сохраняются длительности этапов поиска
+    и размеры обрабатываемых данных. При `corridor_pruning` граф строится только для зон,
+    которые могут оказаться на пути маршрута. При `simplify_tolerance` запретные зоны упрощаются
+    наружу с допуском в метрах, маршрут при этом не проходит через исходные зоны
+    """
+
+    profiler = profiler or NULL_PROFILER
+
+    with profiler.capture():
+        if cache is not None:
+            with profiler.stage("cache_lookup"):
+                key = route_fingerprint(
+                    start_point, finish_point, restricted_polygons, buffer_distance, coord_system, graph_builder,
+                    simplify_tolerance
+                )
+                cached_geojson = cache.get(key)
+
+            if cached_geojson is not None:
+                return _route_from_cache(cached_geojson)
+
+        route_engine = RouteEngine(
+            restricted_polygons, buffer_distance, coord_system, graph_builder, profiler, simplify_tolerance
+        )
+
+        optimal_route = route_engine.find_route(start_point, finish_point, profiler, corridor_pruning)
+
+        if cache is not None:
+            cache.set(key, _route_to_cache(optimal_route))
+
+        return optimal_route
+
+
+def find_optimal_route_through_waypoints_with_geojson(geojson: str, profiler: RouteProfiler | None = None) -> str:
+    """
+    Функция для нахождения оптимального пути через промежуточные точки с помощью GeoJSON.
+
+    Промежуточные точки задаются объектом `waypoints` с геометрией MultiPoint и проходятся в порядке
+    его координат между `start_point` и `finish_point`. Результат - Feature с маршрутом, длинами участков
+    в свойстве `leg_lengths` и длиной всего маршрута в свойстве `length` в метрах
+    """
+
+    profiler = profiler or NULL_PROFILER
+
+    with profiler.capture():
+        with profiler.stage("parsing") as sizes:
+            sizes["input_bytes"] = len(geojson)
+
+            route_data = _validate_route_geojson_to_data(geojson)
+            route_search_data = _process_data_to_find_route(route_data)
+            waypoints = list(route_data.waypoints.geometry.shape.geoms) if route_data.waypoints else []
+
+        waypoint_route = find_optimal_route_through_waypoints(
+            [route_search_data.start_point, *waypoints, route_search_data.finish_point],
+            route_search_data.restricted_polygons,
+            route_search_data.buffer_distance,
+            profiler=profiler
+        )
+
+        with profiler.stage("serialization") as sizes:
+            geojson_to_send = RouteWaypointsSendDTO.model_validate({
+                "type": "Feature",
+                "geometry": waypoint_route.route,
+                "properties": {"leg_lengths": waypoint_route.leg_lengths, "length": waypoint_route.length}
+            }).model_dump_json()
+
+            sizes["output_bytes"] = len(geojson_to_send)
+
+        return geojson_to_send
+
+
+def find_optimal_route_through_waypoints(
+    points: Sequence[Point],
+    restricted_polygons: MultiPolygon | None = None,
+    buffer_distance: float | None = None,
+    coord_system: str = "WGS84",
+    graph_builder: GraphBuilder = "visibility",
+    profiler: RouteProfiler | None = None,
+    simplify_tolerance: float | None = None
+) -> WaypointRoute:
+    """
+    Функция для нахождения оптимального маршрута через точки в заданном порядке.
+
+    Граф между вершинами запретных зон строится один раз для всех участков маршрута, к нему присоединяются
+    все точки. Возвращается общий маршрут, длины участков и длина всего маршрута в метрах
+    """
+
+    profiler = profiler or NULL_PROFILER
+
+    with profiler.capture():
+        route_engine = RouteEngine(
+            restricted_polygons, buffer_distance, coord_system, graph_builder, profiler, simplify_tolerance
+        )
+
+        return route_engine.find_waypoint_route(points, profiler)
+
+
+def find_optimal_routes_with_geojson(geojson: str, workers: int | None = None) -> str:
+    """
+    Функция для нахождения нескольких оптимальных путей в одних и тех же запретных зонах с помощью GeoJSON
+    """
+
+    routes_data = RouteBatchFindDTO.model_validate_json(geojson)
+
+    routes_send_data = find_optimal_routes_with_pydantic_model(routes_data, workers)
+
+    return routes_send_data.model_dump_json()
+
+
+def find_optimal_routes_with_pydantic_model(data: RouteBatchFindDTO, workers: int | None = None) -> RouteBatchSendDTO:
+    """
+    Функция для нахождения нескольких оптимальных путей в одних и тех же запретных зонах с помощью pydantic моделей
+    """
+
+    pairs = [(start_point.geometry.shape, finish_point.geometry.shape) for start_point, finish_point in data.routes]
+
+    if data.restricted_polygons:
+        restricted_polygons = data.restricted_polygons.geometry.shape
+        buffer_distance = data.restricted_polygons.properties.get("buffer_distance")
+    else:
+        restricted_polygons = None
+        buffer_distance = None
+
+    results = find_optimal_routes(pairs, restricted_polygons, buffer_distance, workers)
+
+    return RouteBatchSendDTO.model_validate({
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": result.route,
+                "properties": {} if result.error is None else {"error": result.error}
+            }
+            for result in results
+        ]
+    })
+
+
+RouteResult = NamedTuple(
+    "RouteResult",
+    [
+        ("route", LineString | None),
+        ("error", str | None)
+    ]
+)
+
+
+def find_optimal_routes(
+    pairs: Iterable[tuple[Point, Point]],
+    restricted_polygons: MultiPolygon | None = None,
+    buffer_distance: float | None = None,
+    workers: int | None = None,
+    coord_system: str = "WGS84",
+    graph_builder: GraphBuilder = "visibility",
+    simplify_tolerance: float | None = None
+) -> list[RouteResult]:
+    """
+    Функция для нахождения оптимальных маршрутов между парами точек в одних и тех же запретных зонах.
+
+    Запретные зоны и граф видимости между их вершинами подготавливаются один раз и передаются процессам,
+    между которыми распределяется поиск маршрутов. Результаты возвращаются в порядке входных пар,
+    ошибка поиска маршрута для одной пары не прерывает обработку остальных
+    """
+
+    pairs = list(pairs)
+
+    # Без пар точек запретные зоны не подготавливаются и процессы не запускаются
+    if not pairs:
+        return []
+
+    route_engine = RouteEngine(
+        restricted_polygons, buffer_distance, coord_system, graph_builder, simplify_tolerance=simplify_tolerance
+    )
+    route_engine.compile()
+
+    # Процессов не больше, чем пар точек
+    workers = min(workers or os.cpu_count() or 1, len(pairs))
+
+    if workers <= 1:
+        return [_find_route_result(route_engine, *pair) for pair in pairs]
+
+    # Скомпилированные зоны передаются каждому процессу один раз при его запуске
+    with ProcessPoolExecutor(workers, initializer=_init_route_worker, initargs=(route_engine,)) as executor:
+        chunksize = max(1, len(pairs) // (workers * 4))
+        return list(executor.map(_find_route_in_worker, pairs, chunksize=chunksize))
+
+
+WkbRouteResults = NamedTuple(
+    "WkbRouteResults",
+    [
+        ("routes", np.ndarray),
+        ("lengths", np.ndarray),
+        ("errors", list[str | None])
+    ]
+)
+
+
+def find_optimal_routes_with_wkb(
+    start_points: Sequence[bytes] | np.ndarray,
+    finish_points: Sequence[bytes] | np.ndarray,
+    restricted_polygons: bytes | Sequence[bytes] | np.ndarray | None = None,
+    buffer_distance: float | None = None,
+    workers: int | None = None,
+    coord_system: str = "WGS84",
+    graph_builder: GraphBuilder = "visibility",
+    simplify_tolerance: float | None = None
+) -> WkbRouteResults:
+    """
+    Функция для нахождения оптимальных маршрутов между парами точек в формате WKB.
+
+    Начальные и конечные точки - массивы WKB одинаковой длины, запретные зоны - одна геометрия
+    или массив геометрий Polygon и MultiPolygon в WKB. Геометрии читаются и записываются векторными
+    `shapely.from_wkb` и `shapely.to_wkb` без GeoJSON. Возвращаются маршруты в WKB, их геодезические длины
+    в метрах и ошибки в порядке входных пар, для пар без маршрута маршрут - `None`, а длина - `nan`
+    """
+
+    pairs = _binary_pairs(points_from_wkb(start_points), points_from_wkb(finish_points))
+    zone = zone_from_wkb(restricted_polygons) if restricted_polygons is not None else None
+
+    results = find_optimal_routes(
+        pairs, zone, buffer_distance, workers, coord_system, graph_builder, simplify_tolerance
+    )
+    routes = [result.route for result in results]
+
+    return WkbRouteResults(
+        routes_to_wkb(routes), geodesic_lengths(routes, coord_system), [result.error for result in results]
+    )
+
+
+GeoArrowRouteResults = NamedTuple(
+    "GeoArrowRouteResults",
+    [
+        ("coords", np.ndarray),
+        ("offsets", np.ndarray),
+        ("lengths", np.ndarray),
+        ("errors", list[str | None])
+    ]
+)
+
+
+def find_optimal_routes_with_geoarrow(
+    start_points: np.ndarray | tuple[np.ndarray, np.ndarray],
+    finish_points: np.ndarray | tuple[np.ndarray, np.ndarray],
+    restricted_polygons: tuple[np.ndarray, Sequence[np.ndarray]] | None = None,
+    buffer_distance: float | None = None,
+    workers: int | None = None,
+    coord_system: str = "WGS84",
+    graph_builder: GraphBuilder = "visibility",
+    simplify_tolerance: float | None = None
+) -> GeoArrowRouteResults:
+    """
+    Функция для нахождения оптимальных маршрутов между парами точек в колоночной раскладке GeoArrow.
+
+    Точки - массивы координат (n, 2) или пары массивов x и y, запретные зоны - координаты и массивы
+    смещений Polygon или MultiPolygon (`shapely.to_ragged_array`). Маршруты возвращаются как координаты
+    и смещения LineString, вместе с геодезическими длинами в метрах и ошибками в порядке входных пар.
+    Для пар без маршрута линия пустая, а длина - `nan`. Буферы numpy можно получить из массивов Arrow без копирования
+    """
+
+    pairs = _binary_pairs(points_from_geoarrow(start_points), points_from_geoarrow(finish_points))
+    zone = zone_from_geoarrow(*restricted_polygons) if restricted_polygons is not None else None
+
+    results = find_optimal_routes(
+        pairs, zone, buffer_distance, workers, coord_system, graph_builder, simplify_tolerance
+    )
+    routes = [result.route for result in results]
+
+    return GeoArrowRouteResults(
+        *routes_to_geoarrow(routes), geodesic_lengths(routes, coord_system), [result.error for result in results]
+    )
+
+
+def route_distance_matrix(
+    origins: Sequence[Point],
+    destinations: Sequence[Point],
+    restricted_polygons: MultiPolygon | None = None,
+    buffer_distance: float | None = None,
+    coord_system: str = "WGS84",
+    graph_builder: GraphBuilder = "visibility",
+    return_routes: bool = False,
+    simplify_tolerance: float | None = None
+) -> DistanceMatrix:
+    """
+    Функция для вычисления длин оптимальных маршрутов в метрах от каждой начальной точки до каждой конечной.
+
+    Граф видимости между вершинами запретных зон строится один раз, для каждой начальной точки выполняется
+    один поиск, который находит расстояния сразу до всех конечных точек. Для недостижимых пар
+    расстояние равно `inf`. При `return_routes` возвращаются также сами маршруты
+    """
+
+    route_engine = RouteEngine(
+        restricted_polygons, buffer_distance, coord_system, graph_builder, simplify_tolerance=simplify_tolerance
+    )
+
+    return route_engine.distance_matrix(origins, destinations, return_routes)
+
+
+def find_approximate_route(
+    start_point: Point,
+    finish_point: Point,
+    restricted_polygons: MultiPolygon | None = None,
+    buffer_distance: float | None = None,
+    resolution: float = 1000.0,
+    coord_system: str = "WGS84",
+    profiler: RouteProfiler | None = None,
+    simplify_tolerance: float | None = None
+) -> ApproximateRoute:
+    """
+    Функция для приближенного поиска маршрута по растровой сетке с шагом `resolution` в метрах.
+
+    Граф видимости не строится, поэтому поиск подходит для наборов запретных зон из сотен тысяч вершин.
+    Маршрут не проходит через запретные зоны, вместе с ним возвращаются его длина в метрах и оценка
+    сверху того, насколько он длиннее точного маршрута `find_optimal_route`
+    """
+
+    profiler = profiler or NULL_PROFILER
+
+    with profiler.capture():
+        route_engine = RouteEngine(
+            restricted_polygons, buffer_distance, coord_system, profiler=profiler, simplify_tolerance=simplify_tolerance
+        )
+
+        return route_engine.find_approximate_route(start_point, finish_point, resolution, profiler)
+
+
+def _binary_pairs(start_points: np.ndarray, finish_points: np.ndarray) -> list[tuple[Point, Point]]:
+    if len(start_points) != len(finish_points):
+        raise ValueError("Каждой начальной точке должна соответствовать конечная точка")
+
+    return list(zip(start_points, finish_points))
+
+
+def _find_route_result(route_engine: RouteEngine, start_point: Point, finish_point: Point) -> RouteResult:
+    try:
+        return RouteResult(route_engine.find_route(start_point, finish_point), None)
+    except ValueError as error:
+        return RouteResult(None, str(error))
+
+
+_worker_route_engine: RouteEngine | None = None
+
+
+def _init_route_worker(route_engine: RouteEngine) -> None:
+    global _worker_route_engine
+    _worker_route_engine = route_engine
+
+
+def _find_route_in_worker(pair: tuple[Point, Point]) -> RouteResult:
+    assert _worker_route_engine is not None
+    return _find_route_result(_worker_route_engine, *pair)
 
 
 def _validate_route_geojson_to_data(geojson: str) -> RouteFindDTO:
@@ -140,6 +517,21 @@ def _serialize_route_data_to_geojson(data: RouteSendDTO) -> str:
     return data.model_dump_json()
 
 
+def _route_to_cache(route: LineString) -> str:
+    """
+    Маршрут `find_optimal_route` для сохранения в кэше: GeoJSON с числовыми координатами, который
+    записывается и читается без pydantic моделей и без потери точности
+    """
+
+    return shapely.to_geojson(route)
+
+
+def _route_from_cache(cached_geojson: str) -> LineString:
+    """Маршрут, сохраненный в кэше `_route_to_cache`"""
+
+    return shapely.from_geojson(cached_geojson)
+
+
 RouteSearch = NamedTuple(
     "RouteSearch", 
     [
@@ -151,6 +543,30 @@ RouteSearch = NamedTuple(
 )
 
 
+def parse_route_request(geojson: str | bytes, fast_io: bool = False) -> RouteSearch:
+    """
+    Функция для получения данных для поиска маршрута из GeoJSON в формате `RouteFindDTO`,
+    при `fast_io` - без pydantic моделей (`parse_route_geojson`)
+    """
+
+    if fast_io:
+        return RouteSearch(*parse_route_geojson(geojson))
+
+    return _process_data_to_find_route(_validate_route_geojson_to_data(geojson))
+
+
+def serialize_route(route: LineString, fast_io: bool = False) -> str:
+    """
+    Функция для формирования GeoJSON найденного маршрута в формате `RouteSendDTO`,
+    при `fast_io` - без pydantic моделей (`serialize_route_to_geojson`)
+    """
+
+    if fast_io:
+        return serialize_route_to_geojson(route)
+
+    return _serialize_route_data_to_geojson(_process_data_to_send_route(route))
+
+
 def _process_data_to_find_route(data: RouteFindDTO) -> RouteSearch:
     """
     Функция для передачи обработанных данных для последующего поиска маршрута
@@ -175,47 +591,3 @@ def _process_data_to_send_route(data: LineString) -> RouteSendDTO:
     """
 
     return RouteSendDTO.model_validate(data)
-
-
-def _make_multipolygon(geometry: Polygon | MultiPolygon) -> MultiPolygon:
-    """
-    Функция для создания объекта типа MultiPolygon
-    """
-    
-    if isinstance(geometry, MultiPolygon):
-        return geometry
-
-    return MultiPolygon([geometry])
-
-
-def _exists_point_in_multipolygon(polygon: MultiPolygon, point: Point) -> bool:
-    return any((polygon.contains(point), polygon.touches(point)))
-
-
-#! Долгое время работы
-def _filter_edges(
-    edges: Iterable[tuple[tuple[float, float], tuple[float, float]]],
-    zone: MultiPolygon
-) -> set[tuple[tuple[float, float], tuple[float, float]]]:
-    """
-    Функция для отбора тех ребер, которые не пересекают зону и не входят в него
-    """
-
-    filtered_edges = set() 
-
-    for edge in edges:
-        line = LineString(edge)
-        if not line.crosses(zone) and not zone.contains(line):
-            filtered_edges.add(edge)
-
-    return filtered_edges
-
-
-class _EgdeWeight:
-    def __init__(self, geod: Geod) -> None:
-        self._geod = geod
-
-    def __call__(self, u: tuple[float, float], v: tuple[float, float], d: Any | None = None) -> float:
-        ux, uy = u
-        vx, vy = v
-        return self._geod.inv(ux, uy, vx, vy)[2]
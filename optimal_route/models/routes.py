@@ -1,27 +1,29 @@
 from typing import Any
 
-from pydantic import BaseModel, model_validator, ValidationError
+from pydantic import BaseModel, model_validator
 
 from optimal_route.models.features import Feature, FeatureCollection
-from optimal_route.models.geometries import Point, MultiPolygon, LineString
+from optimal_route.models.geometries import Point, MultiPoint, MultiPolygon, LineString
 
 
 class RouteFindDTO(BaseModel):
     start_point: Feature[dict[str, Any], Point]
     finish_point: Feature[dict[str, Any], Point]
     restricted_polygons: Feature[dict[str, Any], MultiPolygon] | None
+    waypoints: Feature[dict[str, Any], MultiPoint] | None = None
 
     @model_validator(mode="before")
     def from_feature_collection(cls, data: Any):
         if not isinstance(data, dict):
-            raise ValidationError("Данные поданы в неверном формате")
+            raise ValueError("Данные поданы в неверном формате")
 
         feature_collection = FeatureCollection.model_validate(data)
 
         valid_dict = {
             "start_point": None,
             "finish_point": None,
-            "restricted_polygons": None
+            "restricted_polygons": None,
+            "waypoints": None
         }
 
         for feature in feature_collection:
@@ -32,6 +34,8 @@ class RouteFindDTO(BaseModel):
                 valid_dict["finish_point"] = feature
             elif name == "restricted_polygons":
                 valid_dict["restricted_polygons"] = feature
+            elif name == "waypoints":
+                valid_dict["waypoints"] = feature
 
         if not valid_dict["start_point"] or not valid_dict["finish_point"]:
             raise ValueError("Необходимо указать начальную и конечную точку")
@@ -41,3 +45,55 @@ class RouteFindDTO(BaseModel):
 
 class RouteSendDTO(LineString):
     pass
+
+
+class RouteWaypointsSendDTO(Feature[dict[str, Any], LineString]):
+    """
+    Маршрут через промежуточные точки: длины участков маршрута в метрах указаны в свойстве `leg_lengths`,
+    а длина всего маршрута - в свойстве `length`
+    """
+
+
+class RouteBatchFindDTO(BaseModel):
+    """
+    Данные для поиска нескольких маршрутов в одних и тех же запретных зонах:
+    i-я начальная точка составляет пару с i-й конечной точкой
+    """
+
+    routes: list[tuple[Feature[dict[str, Any], Point], Feature[dict[str, Any], Point]]]
+    restricted_polygons: Feature[dict[str, Any], MultiPolygon] | None
+
+    @model_validator(mode="before")
+    def from_feature_collection(cls, data: Any):
+        if not isinstance(data, dict):
+            raise ValueError("Данные поданы в неверном формате")
+
+        feature_collection = FeatureCollection.model_validate(data)
+
+        start_points = []
+        finish_points = []
+        restricted_polygons = None
+
+        for feature in feature_collection:
+            name = feature.properties.get("name")
+            if name == "start_point":
+                start_points.append(feature)
+            elif name == "finish_point":
+                finish_points.append(feature)
+            elif name == "restricted_polygons":
+                restricted_polygons = feature
+
+        if not start_points or len(start_points) != len(finish_points):
+            raise ValueError("Каждой начальной точке должна соответствовать конечная точка")
+
+        return {
+            "routes": list(zip(start_points, finish_points)),
+            "restricted_polygons": restricted_polygons
+        }
+
+
+class RouteBatchSendDTO(FeatureCollection[Feature[dict[str, Any], LineString | None]]):
+    """
+    Найденные маршруты в порядке входных пар точек.
+    Для пар, маршрут между которыми проложить невозможно, геометрия пустая, а причина указана в свойстве `error`
+    """
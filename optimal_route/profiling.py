@@ -0,0 +1,146 @@
+import cProfile
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, NamedTuple
+
+
+StageRecord = NamedTuple(
+    "StageRecord",
+    [
+        ("name", str),
+        ("duration", float),
+        ("sizes", dict[str, int])
+    ]
+)
+
+StageCallback = Callable[[str, float, dict[str, int]], None]
+
+
+class RouteProfiler:
+    """
+    Сбор длительностей этапов поиска маршрута и размеров обрабатываемых данных.
+
+    Передается в `find_optimal_route`, `find_optimal_route_with_pydantic_model`,
+    `find_optimal_route_with_geojson` и методы `RouteEngine`. Этапы, которые выполняются несколько раз
+    (например, отбор ребер порциями), суммируются в одну запись. `callback` вызывается после
+    каждого выполнения этапа с его названием, длительностью в секундах и размерами.
+
+    При `cprofile` и `trace_memory` на время вызова включаются `cProfile` и `tracemalloc`,
+    результаты доступны в `profile_stats`, `memory_peak` и `memory_snapshot`
+    """
+
+    def __init__(
+        self,
+        callback: StageCallback | None = None,
+        cprofile: bool = False,
+        trace_memory: bool = False
+    ) -> None:
+        self._callback = callback
+        self._cprofile = cprofile
+        self._trace_memory = trace_memory
+        self._stages: dict[str, StageRecord] = {}
+        self._capture_depth = 0
+
+        self.profile_stats: pstats.Stats | None = None
+        self.memory_peak: int | None = None
+        self.memory_snapshot: tracemalloc.Snapshot | None = None
+
+    @property
+    def stages(self) -> list[StageRecord]:
+        """Этапы в порядке их первого выполнения"""
+
+        return list(self._stages.values())
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, int]]:
+        """Замер длительности этапа, в полученный словарь записываются размеры данных этапа"""
+
+        sizes: dict[str, int] = {}
+        started = time.perf_counter()
+
+        try:
+            yield sizes
+        finally:
+            duration = time.perf_counter() - started
+            sizes = {key: int(value) for key, value in sizes.items()}
+
+            record = self._stages.get(name)
+            if record is None:
+                self._stages[name] = StageRecord(name, duration, sizes)
+            else:
+                total_sizes = record.sizes.copy()
+                for key, value in sizes.items():
+                    total_sizes[key] = total_sizes.get(key, 0) + value
+                self._stages[name] = StageRecord(name, record.duration + duration, total_sizes)
+
+            if self._callback is not None:
+                self._callback(name, duration, sizes)
+
+    @contextmanager
+    def capture(self) -> Iterator[None]:
+        """Включение `cProfile` и `tracemalloc` на время вызова, вложенные вызовы не перезапускают сбор"""
+
+        self._capture_depth += 1
+        if self._capture_depth > 1 or not (self._cprofile or self._trace_memory):
+            try:
+                yield
+            finally:
+                self._capture_depth -= 1
+            return
+
+        profile = cProfile.Profile() if self._cprofile else None
+        started_tracemalloc = self._trace_memory and not tracemalloc.is_tracing()
+
+        if started_tracemalloc:
+            tracemalloc.start()
+        if self._trace_memory:
+            tracemalloc.reset_peak()
+        if profile is not None:
+            profile.enable()
+
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self.profile_stats = pstats.Stats(profile)
+
+            if self._trace_memory:
+                self.memory_peak = tracemalloc.get_traced_memory()[1]
+                self.memory_snapshot = tracemalloc.take_snapshot()
+            if started_tracemalloc:
+                tracemalloc.stop()
+
+            self._capture_depth -= 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Собранные данные в виде словаря для отчетов и экспорта в системы метрик"""
+
+        report: dict[str, Any] = {
+            "stages": [
+                {"name": record.name, "duration": record.duration, "sizes": record.sizes}
+                for record in self._stages.values()
+            ]
+        }
+
+        if self.memory_peak is not None:
+            report["memory_peak"] = self.memory_peak
+
+        return report
+
+
+class _NullProfiler(RouteProfiler):
+    """Профилировщик, который ничего не собирает, используется, если профилировщик не передан"""
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, int]]:
+        yield {}
+
+    @contextmanager
+    def capture(self) -> Iterator[None]:
+        yield
+
+
+NULL_PROFILER = _NullProfiler()
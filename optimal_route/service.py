@@ -0,0 +1,243 @@
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from typing import NamedTuple
+
+from optimal_route.main import find_optimal_route_with_geojson
+
+
+# Наибольший размер тела запроса в байтах
+_MAX_BODY_SIZE = 64 * 1024 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout"
+}
+
+
+ServiceStats = NamedTuple(
+    "ServiceStats",
+    [
+        ("running", int),
+        ("queued", int),
+        ("coalesced", int),
+        ("rejected", int),
+        ("timed_out", int)
+    ]
+)
+
+
+class ServiceOverloaded(Exception):
+    """Очередь запросов, ожидающих вычисления, заполнена"""
+
+
+class RouteService:
+    """
+    Асинхронный поиск маршрутов по GeoJSON без блокировки цикла событий.
+
+    Поиск маршрута (`find_optimal_route_with_geojson`) выполняется в пуле из `workers` процессов,
+    одновременно вычисляется не больше `max_concurrency` маршрутов. Если вычисления ожидают
+    уже `max_queue` запросов, новый запрос отклоняется с `ServiceOverloaded`. Одинаковые запросы,
+    которые обрабатываются одновременно, объединяются в одно вычисление. Если результат не получен
+    за `timeout` секунд, возникает `TimeoutError`, а вычисление продолжается для остальных ожидающих его запросов
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_concurrency: int | None = None,
+        max_queue: int = 100,
+        timeout: float | None = 30.0,
+        fast_io: bool = False
+    ) -> None:
+        workers = workers or os.cpu_count() or 1
+
+        # Процессы пула запускаются по мере поступления запросов: при fork они унаследовали бы
+        # открытые соединения, и закрытие соединения клиентом не доходило бы до сервера
+        self._executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        self._semaphore = asyncio.Semaphore(max_concurrency or workers)
+        self._max_queue = max_queue
+        self._timeout = timeout
+        self._fast_io = fast_io
+
+        self._in_flight: dict[bytes, asyncio.Future[str]] = {}
+        self._running = 0
+        self._queued = 0
+        self._coalesced = 0
+        self._rejected = 0
+        self._timed_out = 0
+
+    @property
+    def stats(self) -> ServiceStats:
+        """Количество выполняемых и ожидающих вычислений, объединенных, отклоненных и просроченных запросов"""
+
+        return ServiceStats(self._running, self._queued, self._coalesced, self._rejected, self._timed_out)
+
+    async def find_route(self, geojson: str | bytes) -> str:
+        """Поиск маршрута по GeoJSON, результат и ошибки такие же, как у `find_optimal_route_with_geojson`"""
+
+        key = blake2b(geojson if isinstance(geojson, bytes) else geojson.encode(), digest_size=20).digest()
+
+        future = self._in_flight.get(key)
+        if future is None:
+            if self._queued >= self._max_queue:
+                self._rejected += 1
+                raise ServiceOverloaded("Слишком много запросов в очереди")
+
+            # Запрос учитывается в очереди сразу, чтобы запросы, пришедшие в одной итерации цикла событий,
+            # не прошли проверку размера очереди до запуска своих вычислений
+            self._queued += 1
+            future = asyncio.ensure_future(self._compute(key, geojson))
+            self._in_flight[key] = future
+        else:
+            self._coalesced += 1
+
+        try:
+            # Истечение времени ожидания одного запроса не отменяет общее вычисление
+            return await asyncio.wait_for(asyncio.shield(future), self._timeout)
+        except TimeoutError:
+            self._timed_out += 1
+            raise
+
+    async def close(self) -> None:
+        """Ожидание выполняемых вычислений и остановка пула процессов"""
+
+        await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        self._executor.shutdown()
+
+    async def _compute(self, key: bytes, geojson: str | bytes) -> str:
+        loop = asyncio.get_running_loop()
+
+        try:
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self._queued -= 1
+
+            self._running += 1
+            try:
+                route, error = await loop.run_in_executor(
+                    self._executor,
+                    _find_route_in_worker,
+                    geojson.decode() if isinstance(geojson, bytes) else geojson,
+                    self._fast_io
+                )
+            finally:
+                self._running -= 1
+                self._semaphore.release()
+        finally:
+            del self._in_flight[key]
+
+        if error is not None:
+            raise ValueError(error)
+
+        assert route is not None
+        return route
+
+
+def _find_route_in_worker(geojson: str, fast_io: bool) -> tuple[str | None, str | None]:
+    """Поиск маршрута в процессе пула, ошибка в данных передается текстом, так как не все исключения сериализуются"""
+
+    try:
+        return find_optimal_route_with_geojson(geojson, fast_io=fast_io), None
+    except ValueError as error:
+        # ValidationError pydantic - подкласс ValueError
+        return None, str(error)
+
+
+async def serve(service: RouteService, host: str = "127.0.0.1", port: int = 8080) -> asyncio.Server:
+    """
+    Запуск HTTP сервера для `RouteService`.
+
+    `POST /route` принимает GeoJSON в теле запроса и возвращает маршрут в GeoJSON (200),
+    ошибку в данных (400), отказ из-за заполненной очереди (503) или истечение времени ожидания (504).
+    `GET /stats` возвращает `RouteService.stats`. Соединения поддерживают keep-alive
+    """
+
+    return await asyncio.start_server(lambda reader, writer: _handle_connection(service, reader, writer), host, port)
+
+
+async def _handle_connection(service: RouteService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+
+            request = request_line.decode("latin-1").split(" ", 2)
+            if len(request) != 3:
+                await _respond(writer, 400, {"error": "Некорректная строка запроса"}, keep_alive=False)
+                break
+
+            method, path, version = request
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            content_length_header = headers.get("content-length", "0")
+            if not content_length_header.isdigit():
+                await _respond(writer, 400, {"error": "Некорректная длина запроса"}, keep_alive=False)
+                break
+
+            content_length = int(content_length_header)
+            if content_length > _MAX_BODY_SIZE:
+                await _respond(writer, 413, {"error": "Слишком большой запрос"}, keep_alive=False)
+                break
+
+            body = await reader.readexactly(content_length)
+            status, payload = await _route_response(service, method, path, body)
+
+            keep_alive = headers.get("connection", "").lower() != "close" and version.strip() == "HTTP/1.1"
+            await _respond(writer, status, payload, keep_alive)
+
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _route_response(service: RouteService, method: str, path: str, body: bytes) -> tuple[int, str | dict]:
+    if path == "/stats":
+        return 200, service.stats._asdict()
+
+    if path != "/route":
+        return 404, {"error": "Неизвестный адрес"}
+
+    if method != "POST":
+        return 405, {"error": "Ожидается запрос POST"}
+
+    try:
+        return 200, await service.find_route(body)
+    except ServiceOverloaded as error:
+        return 503, {"error": str(error)}
+    except TimeoutError:
+        return 504, {"error": "Превышено время поиска маршрута"}
+    except ValueError as error:
+        return 400, {"error": str(error)}
+    except Exception:
+        return 500, {"error": "Внутренняя ошибка сервиса"}
+
+
+async def _respond(writer: asyncio.StreamWriter, status: int, payload: str | dict, keep_alive: bool) -> None:
+    body = (payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)).encode()
+
+    writer.write(
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
@@ -0,0 +1,132 @@
+from typing import Any, Sequence
+
+import numpy as np
+import shapely
+from pyproj import Geod
+from shapely import GeometryType, LineString, MultiPolygon, Polygon
+from shapely.errors import GEOSException
+
+
+# Количество массивов смещений в раскладке GeoArrow для многоугольников и наборов многоугольников
+_GEOARROW_POLYGON_TYPES = {2: GeometryType.POLYGON, 3: GeometryType.MULTIPOLYGON}
+
+
+def points_from_wkb(points: Sequence[bytes] | np.ndarray) -> np.ndarray:
+    """Массив точек shapely из массива WKB, все геометрии должны быть непустыми точками"""
+
+    return _checked_points(_from_wkb(points))
+
+
+def points_from_geoarrow(coords: np.ndarray | tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    """
+    Массив точек shapely из координат GeoArrow: массив (n, 2) с чередующимися координатами
+    или пара массивов x и y
+    """
+
+    if isinstance(coords, tuple):
+        x, y = (np.asarray(values, dtype=float) for values in coords)
+    else:
+        coords = np.asarray(coords, dtype=float)
+        if coords.ndim != 2 or coords.shape[1] != 2:
+            raise ValueError("Координаты точек должны быть массивом размером (n, 2)")
+        x, y = coords[:, 0], coords[:, 1]
+
+    return _checked_points(shapely.points(x, y))
+
+
+def zone_from_wkb(zones: bytes | Sequence[bytes] | np.ndarray) -> MultiPolygon:
+    """
+    Запретные зоны из WKB: одна геометрия или массив геометрий Polygon и MultiPolygon.
+    Зоны нескольких геометрий объединяются, так как они могут перекрываться
+    """
+
+    if isinstance(zones, bytes):
+        zones = [zones]
+
+    return _merged_zone(_from_wkb(zones))
+
+
+def zone_from_geoarrow(coords: np.ndarray, offsets: Sequence[np.ndarray]) -> MultiPolygon:
+    """
+    Запретные зоны из массивов GeoArrow: координаты и смещения колец и многоугольников (Polygon)
+    или колец, многоугольников и наборов многоугольников (MultiPolygon)
+    """
+
+    if len(offsets) not in _GEOARROW_POLYGON_TYPES:
+        raise ValueError("Запретные зоны должны быть геометриями типа Polygon или MultiPolygon")
+
+    geometries = shapely.from_ragged_array(
+        _GEOARROW_POLYGON_TYPES[len(offsets)],
+        np.asarray(coords, dtype=float),
+        tuple(np.asarray(values) for values in offsets)
+    )
+
+    return _merged_zone(geometries)
+
+
+def routes_to_wkb(routes: Sequence[Any]) -> np.ndarray:
+    """Массив WKB маршрутов, для отсутствующих маршрутов - `None`"""
+
+    return shapely.to_wkb(np.asarray(routes, dtype=object))
+
+
+def routes_to_geoarrow(routes: Sequence[Any]) -> tuple[np.ndarray, np.ndarray]:
+    """Координаты и смещения маршрутов в раскладке GeoArrow, отсутствующие маршруты - пустые линии"""
+
+    if not len(routes):
+        return np.empty((0, 2)), np.zeros(1, dtype=np.int64)
+
+    # Раскладка GeoArrow строится только для геометрий одного типа,
+    # поэтому отсутствующие маршруты заменяются пустыми линиями
+    lines = np.array([LineString() if route is None else route for route in routes], dtype=object)
+
+    _, coords, (offsets,) = shapely.to_ragged_array(lines)
+    return coords, offsets.astype(np.int64)
+
+
+def geodesic_lengths(lines: Sequence[Any], coord_system: str = "WGS84") -> np.ndarray:
+    """Геодезические длины линий в метрах, вычисленные одним вызовом для всех отрезков, для `None` - `nan`"""
+
+    lines = np.asarray(lines, dtype=object)
+    coords, index = shapely.get_coordinates(lines, return_index=True)
+
+    # Отрезки - пары соседних координат одной линии
+    same_line = index[:-1] == index[1:]
+    starts, ends = coords[:-1][same_line], coords[1:][same_line]
+    segments = np.asarray(Geod(ellps=coord_system).inv(starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1])[2])
+
+    lengths = np.bincount(index[:-1][same_line], weights=segments, minlength=len(lines)).astype(float)
+    lengths[shapely.is_missing(lines)] = np.nan
+
+    return lengths
+
+
+def _from_wkb(geometries: Sequence[bytes] | np.ndarray) -> np.ndarray:
+    try:
+        return shapely.from_wkb(np.asarray(geometries, dtype=object), on_invalid="raise")
+    except (GEOSException, TypeError) as error:
+        raise ValueError(f"Некорректный WKB: {error}") from None
+
+
+def _checked_points(points: np.ndarray) -> np.ndarray:
+    if not np.all(shapely.get_type_id(points) == GeometryType.POINT) or shapely.is_empty(points).any():
+        raise ValueError("Начальные и конечные точки должны быть геометриями типа Point")
+
+    if not np.isfinite(shapely.get_coordinates(points)).all():
+        raise ValueError("Координаты должны быть конечными числами")
+
+    return points
+
+
+def _merged_zone(geometries: np.ndarray) -> MultiPolygon:
+    geometries = geometries[~shapely.is_missing(geometries)]
+
+    if not len(geometries):
+        return MultiPolygon()
+
+    if not np.isin(shapely.get_type_id(geometries), (GeometryType.POLYGON, GeometryType.MULTIPOLYGON)).all():
+        raise ValueError("Запретные зоны должны быть геометриями типа Polygon или MultiPolygon")
+
+    zone = geometries[0] if len(geometries) == 1 else shapely.union_all(geometries)
+
+    return MultiPolygon([part for part in shapely.get_parts(zone) if isinstance(part, Polygon)])
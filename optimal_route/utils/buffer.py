@@ -1,18 +1,34 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from hashlib import blake2b
+from threading import Lock
 from typing import TypeVar, overload
 
-from pyproj import Proj, Transformer, CRS
-from shapely.ops import transform
+import numpy as np
+import shapely
+from pyproj import Transformer
+from pyproj.enums import TransformDirection
 from shapely.geometry import MultiPolygon, Polygon
 from shapely.geometry.base import BaseGeometry
 
 
 default_crs = "WGS84"
 
+# Количество буферизованных наборов зон, которые хранятся для повторных запросов
+_BUFFERED_CACHE_SIZE = 32
+
+_buffered_cache: OrderedDict[tuple[bytes, float, str], Polygon | MultiPolygon] = OrderedDict()
+_buffered_cache_lock = Lock()
+
+
 @overload
 def buffer_geometry_in_metres(
     geometry: MultiPolygon,
     buffer_distance: float,
-    coord_system: str = ...
+    coord_system: str = ...,
+    workers: int | None = ...,
+    cache: bool = ...
 ) -> Polygon | MultiPolygon:
     ...
 
@@ -20,51 +36,114 @@ def buffer_geometry_in_metres(
 def buffer_geometry_in_metres(
     geometry: BaseGeometry,
     buffer_distance: float,
-    coord_system: str = ...
+    coord_system: str = ...,
+    workers: int | None = ...,
+    cache: bool = ...
 ) -> Polygon:
     ...
 
 
 def buffer_geometry_in_metres(  # type: ignore
-    geometry: BaseGeometry, 
+    geometry: BaseGeometry,
     buffer_distance: float,
-    coord_system: str = "WGS84"
+    coord_system: str = "WGS84",
+    workers: int | None = None,
+    cache: bool = True
 ) -> Polygon | MultiPolygon:
-    """Функция для буферизации запретных зон"""
+    """
+    Функция для буферизации запретных зон.
+
+    Каждый многоугольник MultiPolygon буферизуется в своей локальной проекции, при `workers > 1`
+    многоугольники обрабатываются параллельно в потоках. Результаты запоминаются по содержимому
+    геометрии и расстоянию буферизации, поэтому повторная буферизация тех же зон не выполняется.
+    При `cache=False` результат не запоминается и не ищется среди запомненных
+    """
+
+    if cache:
+        key = (blake2b(shapely.to_wkb(geometry)).digest(), float(buffer_distance), coord_system)
+
+        with _buffered_cache_lock:
+            if key in _buffered_cache:
+                _buffered_cache.move_to_end(key)
+                return _buffered_cache[key]
+
+    if isinstance(geometry, MultiPolygon):
+        polygons = list(geometry.geoms)
+
+        if workers and workers > 1 and len(polygons) > 1:
+            with ThreadPoolExecutor(workers) as executor:
+                buffered_polygons = list(executor.map(
+                    lambda polygon: _buffer_in_local_projection(polygon, buffer_distance, coord_system),
+                    polygons
+                ))
+        else:
+            buffered_polygons = [
+                _buffer_in_local_projection(polygon, buffer_distance, coord_system)
+                for polygon in polygons
+            ]
+
+        # Расширенные многоугольники могут перекрываться
+        buffered_geometry = shapely.union_all(buffered_polygons)
+    else:
+        buffered_geometry = _buffer_in_local_projection(geometry, buffer_distance, coord_system)
+
+    if not cache:
+        return buffered_geometry
+
+    with _buffered_cache_lock:
+        _buffered_cache[key] = buffered_geometry
+        while len(_buffered_cache) > _BUFFERED_CACHE_SIZE:
+            _buffered_cache.popitem(last=False)
+
+    return buffered_geometry
+
+
+def _buffer_in_local_projection(geometry: BaseGeometry, buffer_distance: float, coord_system: str) -> Polygon:
+    """Буферизация геометрической фигуры в азимутальной равнопромежуточной проекции с центром в ее центроиде"""
 
     # Получение центроида
     centroid = geometry.centroid
 
-    # Азимутальная равнопромежуточноя проекция
-    local_projection = Proj(
-        proj="aeqd",
-        ellps=coord_system,
-        datum=coord_system,
-        lat_0=centroid.y,
-        lon_0=centroid.x
-    )
-
     # Преобразование геометрической фигуры в локальную систему координат
-    geometry_local = _to_local(geometry, local_projection, coord_system)
+    geometry_local = _to_local(geometry, centroid.y, centroid.x, coord_system)
 
     # Буферизация геометрической фигуры
     buffered_geometry_local = geometry_local.buffer(buffer_distance, join_style="mitre")
 
-    # Преобразование обратно в WGS84
-    buffered_geometry = _from_local(buffered_geometry_local, local_projection, coord_system)
+    # Преобразование обратно в исходную систему координат
+    return _from_local(buffered_geometry_local, centroid.y, centroid.x, coord_system)
 
-    return buffered_geometry
+
+@lru_cache(maxsize=1024)
+def local_transformer(lat_0: float, lon_0: float, crs: str) -> Transformer:
+    """
+    Преобразование в азимутальную равнопромежуточную проекцию с заданным центром,
+    запоминается по эллипсоиду и центру проекции.
+
+    Преобразование задается цепочкой операций PROJ: она создается в сотни раз быстрее,
+    чем преобразование между двумя CRS, и не включает смену датума, которая здесь не нужна
+    """
+
+    return Transformer.from_pipeline(
+        "+proj=pipeline "
+        "+step +proj=unitconvert +xy_in=deg +xy_out=rad "
+        f"+step +proj=aeqd +ellps={crs} +lat_0={lat_0!r} +lon_0={lon_0!r}"
+    )
 
 
 BaseShapelyGeometry = TypeVar("BaseShapelyGeometry", bound=BaseGeometry)
 
 
-def _to_local(geometry: BaseShapelyGeometry, projection, crs: str) -> BaseShapelyGeometry:
+def _to_local(geometry: BaseShapelyGeometry, lat_0: float, lon_0: float, crs: str) -> BaseShapelyGeometry:
     """Преобразование геометрической фигуры в локальную систему координат"""
-    project_to_local = Transformer.from_proj(CRS(crs), projection, always_xy=True)
-    return transform(project_to_local.transform, geometry)
+    transformer = local_transformer(lat_0, lon_0, crs)
+    return shapely.transform(geometry, lambda coords: _transform_coords(transformer, coords, TransformDirection.FORWARD))
 
-def _from_local(geometry: BaseShapelyGeometry, projection, crs: str) -> BaseShapelyGeometry:
+def _from_local(geometry: BaseShapelyGeometry, lat_0: float, lon_0: float, crs: str) -> BaseShapelyGeometry:
     """Преобразование геометрической фигуры из локальной системы координат"""
-    project_to_wgs84 = Transformer.from_proj(projection, CRS(crs), always_xy=True)
-    return transform(project_to_wgs84.transform, geometry)
+    transformer = local_transformer(lat_0, lon_0, crs)
+    return shapely.transform(geometry, lambda coords: _transform_coords(transformer, coords, TransformDirection.INVERSE))
+
+def _transform_coords(transformer: Transformer, coords: np.ndarray, direction: TransformDirection) -> np.ndarray:
+    """Преобразование всех координат геометрической фигуры одним вызовом"""
+    return np.column_stack(transformer.transform(coords[:, 0], coords[:, 1], direction=direction))
@@ -0,0 +1,62 @@
+import numpy as np
+from pyproj import Geod
+from pyproj.enums import TransformDirection
+from shapely import Point, Polygon
+
+from optimal_route.utils.buffer import local_transformer
+
+
+# Запас, на который увеличивается эллипс, чтобы погрешность проекции не отсекала нужные зоны
+_CORRIDOR_MARGIN = 1.05
+
+# Длина коридора, начиная с которой эллипс не строится: локальная проекция на таких расстояниях сильно искажена
+_MAX_CORRIDOR_LENGTH = 5_000_000
+
+# Количество вершин многоугольника, которым приближается эллипс
+_CORRIDOR_SEGMENTS = 64
+
+
+def corridor_polygon(
+    geod: Geod,
+    start_point: Point,
+    finish_point: Point,
+    length: float,
+    coord_system: str = "WGS84"
+) -> Polygon | None:
+    """
+    Функция для построения коридора, в котором может проходить маршрут длиной не более `length` метров.
+
+    Коридор - эллипс с фокусами в начальной и конечной точках и большой осью `length`,
+    построенный в азимутальной равнопромежуточной проекции с центром между точками.
+    Для слишком длинных маршрутов возвращается `None`
+    """
+
+    if length > _MAX_CORRIDOR_LENGTH:
+        return None
+
+    # Центр проекции - середина геодезической линии между точками
+    azimuth, _, distance = geod.inv(start_point.x, start_point.y, finish_point.x, finish_point.y)
+    center_lon, center_lat, _ = geod.fwd(start_point.x, start_point.y, azimuth, distance / 2)
+
+    transformer = local_transformer(center_lat, center_lon, coord_system)
+    (start_x, finish_x), (start_y, finish_y) = transformer.transform(
+        [start_point.x, finish_point.x], [start_point.y, finish_point.y]
+    )
+
+    # Полуоси эллипса
+    focal_distance = np.hypot(finish_x - start_x, finish_y - start_y) / 2
+    semi_major = max(length / 2, focal_distance) * _CORRIDOR_MARGIN
+    semi_minor = np.sqrt(semi_major ** 2 - focal_distance ** 2)
+    rotation = np.arctan2(finish_y - start_y, finish_x - start_x)
+
+    angles = np.linspace(0, 2 * np.pi, _CORRIDOR_SEGMENTS, endpoint=False)
+    x = semi_major * np.cos(angles)
+    y = semi_minor * np.sin(angles)
+
+    center_x, center_y = (start_x + finish_x) / 2, (start_y + finish_y) / 2
+    ellipse_x = center_x + x * np.cos(rotation) - y * np.sin(rotation)
+    ellipse_y = center_y + x * np.sin(rotation) + y * np.cos(rotation)
+
+    lons, lats = transformer.transform(ellipse_x, ellipse_y, direction=TransformDirection.INVERSE)
+
+    return Polygon(np.column_stack((lons, lats)))
@@ -0,0 +1,395 @@
+import codecs
+import json
+from decimal import Decimal
+from os import PathLike
+from typing import Any, BinaryIO, Iterator, NamedTuple, TextIO
+
+import numpy as np
+import shapely
+from shapely import LineString, MultiPolygon, Point, Polygon
+from shapely.validation import explain_validity
+
+from optimal_route.utils.buffer import buffer_geometry_in_metres
+
+
+# Размер порции, которая читается из потока за один раз при потоковом разборе GeoJSON
+_STREAM_CHUNK_SIZE = 1 << 20
+
+_GEOMETRY_TYPES = {"Point", "MultiPoint", "LineString", "MultiLineString", "Polygon", "MultiPolygon", "GeometryCollection"}
+
+
+RouteGeoJSONData = NamedTuple(
+    "RouteGeoJSONData",
+    [
+        ("start_point", Point),
+        ("finish_point", Point),
+        ("restricted_polygons", MultiPolygon | None),
+        ("buffer_distance", float | None)
+    ]
+)
+
+
+def parse_route_geojson(geojson: str | bytes) -> RouteGeoJSONData:
+    """
+    Функция для быстрого получения данных для поиска маршрута из GeoJSON без pydantic моделей.
+
+    Координаты сразу читаются в массивы numpy с типом float, из которых создаются геометрии shapely.
+    Проверяются те же правила, что и в `RouteFindDTO`: структура FeatureCollection и объектов Feature,
+    порядок значений bbox, две координаты у каждой позиции, замкнутость колец многоугольников,
+    наличие начальной и конечной точек. Ошибки возвращаются в виде `ValueError`
+    """
+
+    try:
+        data = json.loads(geojson)
+    except json.JSONDecodeError as error:
+        raise ValueError(f"Некорректный JSON: {error}") from None
+
+    if not isinstance(data, dict):
+        raise ValueError("Данные поданы в неверном формате")
+
+    if data.get("type") != "FeatureCollection":
+        raise ValueError("Ожидается объект FeatureCollection")
+
+    _check_bbox(data)
+
+    features = data.get("features")
+    if not isinstance(features, list):
+        raise ValueError("FeatureCollection должен содержать список features")
+
+    named_features: dict[str, dict[str, Any]] = {}
+
+    for feature in features:
+        _check_feature(feature)
+
+        name = feature["properties"].get("name")
+        if name in ("start_point", "finish_point", "restricted_polygons"):
+            named_features[name] = feature
+
+    if "start_point" not in named_features or "finish_point" not in named_features:
+        raise ValueError("Необходимо указать начальную и конечную точку")
+
+    start_point = _parse_point(named_features["start_point"]["geometry"])
+    finish_point = _parse_point(named_features["finish_point"]["geometry"])
+
+    restricted_polygons = None
+    buffer_distance = None
+
+    if "restricted_polygons" in named_features:
+        restricted_feature = named_features["restricted_polygons"]
+        restricted_polygons = _parse_multipolygon(restricted_feature["geometry"])
+        buffer_distance = restricted_feature["properties"].get("buffer_distance")
+
+    return RouteGeoJSONData(start_point, finish_point, restricted_polygons, buffer_distance)
+
+
+def parse_route_geojson_stream(
+    source: str | PathLike | BinaryIO | TextIO,
+    coord_system: str = "WGS84",
+    chunk_size: int = _STREAM_CHUNK_SIZE
+) -> RouteGeoJSONData:
+    """
+    Функция для потокового получения данных для поиска маршрута из файла или потока с GeoJSON.
+
+    Объекты FeatureCollection читаются по одному (`iter_geojson_features`), каждый объект `restricted_polygons`
+    сразу преобразуется в геометрию shapely и буферизуется на свой `buffer_distance`, поэтому в памяти
+    одновременно находятся текст и словарь только одного объекта и уже прочитанные зоны. Объектов
+    `restricted_polygons` может быть несколько, их зоны объединяются. Запретные зоны возвращаются
+    уже буферизованными, а `buffer_distance` - `None`. Проверяются те же правила, что и в `parse_route_geojson`
+    """
+
+    if isinstance(source, str | PathLike):
+        with open(source, "rb") as stream:
+            return parse_route_geojson_stream(stream, coord_system, chunk_size)
+
+    points: dict[str, Point] = {}
+    zones: list[MultiPolygon] = []
+
+    for feature in iter_geojson_features(source, chunk_size):
+        name = feature["properties"].get("name")
+
+        if name in ("start_point", "finish_point"):
+            points[name] = _parse_point(feature["geometry"])
+        elif name == "restricted_polygons":
+            zone = _parse_multipolygon(feature["geometry"])
+            buffer_distance = feature["properties"].get("buffer_distance")
+
+            # Буферизация исправила бы невалидную зону, поэтому зона проверяется до нее, как в `RouteEngine`
+            if not zone.is_valid:
+                raise ValueError("Запретные зоны не валидны: " + explain_validity(zone))
+
+            # Зона буферизуется сразу, исходные координаты объекта после этого не хранятся
+            if buffer_distance:
+                zone = _make_multipolygon(buffer_geometry_in_metres(zone, buffer_distance, coord_system, cache=False))
+
+            zones.append(zone)
+
+    if "start_point" not in points or "finish_point" not in points:
+        raise ValueError("Необходимо указать начальную и конечную точку")
+
+    restricted_polygons = None
+
+    if len(zones) == 1:
+        restricted_polygons = zones[0]
+    elif zones:
+        # Зоны разных объектов могут перекрываться
+        restricted_polygons = _make_multipolygon(shapely.union_all(zones))
+
+    return RouteGeoJSONData(points["start_point"], points["finish_point"], restricted_polygons, None)
+
+
+def iter_geojson_features(stream: BinaryIO | TextIO, chunk_size: int = _STREAM_CHUNK_SIZE) -> Iterator[dict[str, Any]]:
+    """
+    Функция для потокового чтения объектов Feature из FeatureCollection.
+
+    Поток читается порциями по `chunk_size` символов, каждый объект Feature разбирается и проверяется,
+    как только прочитан целиком, прочитанный текст после этого освобождается. Ключи FeatureCollection
+    могут идти в любом порядке, тип FeatureCollection и bbox проверяются по мере чтения
+    """
+
+    reader = _JsonStreamReader(stream, chunk_size)
+    collection_type = None
+    has_features = False
+
+    reader.expect("{")
+
+    if not reader.consume("}"):
+        while True:
+            key = reader.value()
+            reader.expect(":")
+
+            if key == "features":
+                has_features = True
+                reader.expect("[")
+
+                if not reader.consume("]"):
+                    while True:
+                        feature = reader.value()
+                        _check_feature(feature)
+                        yield feature
+
+                        if reader.consume("]"):
+                            break
+                        reader.expect(",")
+            else:
+                value = reader.value()
+
+                if key == "type":
+                    collection_type = value
+                    if collection_type != "FeatureCollection":
+                        raise ValueError("Ожидается объект FeatureCollection")
+                elif key == "bbox":
+                    _check_bbox({"bbox": value})
+
+            if reader.consume("}"):
+                break
+            reader.expect(",")
+
+    reader.expect_end()
+
+    if collection_type != "FeatureCollection":
+        raise ValueError("Ожидается объект FeatureCollection")
+
+    if not has_features:
+        raise ValueError("FeatureCollection должен содержать список features")
+
+
+def serialize_route_to_geojson(route: LineString) -> str:
+    """
+    Функция для быстрой сериализации маршрута в GeoJSON без pydantic моделей.
+
+    Результат совпадает с `RouteSendDTO.model_validate(route).model_dump_json()`:
+    координаты записываются строками в том же десятичном представлении
+    """
+
+    positions = ",".join(
+        f'["{_format_coordinate(x)}","{_format_coordinate(y)}"]'
+        for x, y in shapely.get_coordinates(route).tolist()
+    )
+
+    return '{"type":"LineString","coordinates":[' + positions + ']}'
+
+
+class _JsonStreamReader:
+    """
+    Чтение значений JSON из потока по одному: текст дочитывается порциями, пока значение не разобрано целиком.
+    Если значение не помещается в прочитанный текст, размер следующей порции удваивается, поэтому большое значение
+    разбирается заново не больше логарифма его размера раз
+    """
+
+    def __init__(self, stream: BinaryIO | TextIO, chunk_size: int) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._json_decoder = json.JSONDecoder()
+        self._text = ""
+        self._position = 0
+        self._consumed = 0
+        self._eof = False
+
+    def value(self) -> Any:
+        self._skip_whitespace()
+        read_size = self._chunk_size
+
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._text, self._position)
+            except json.JSONDecodeError as error:
+                if self._eof:
+                    raise ValueError(f"Некорректный JSON: {error}") from None
+            else:
+                # Число в конце прочитанного текста может продолжаться в следующей порции
+                if end < len(self._text) or self._eof:
+                    self._position = end
+                    return value
+
+            self._read(read_size)
+            read_size *= 2
+
+    def consume(self, char: str) -> bool:
+        self._skip_whitespace()
+
+        if self._text.startswith(char, self._position):
+            self._position += 1
+            return True
+
+        return False
+
+    def expect(self, char: str) -> None:
+        if not self.consume(char):
+            raise ValueError(f"Некорректный JSON: ожидается '{char}' в позиции {self._offset()}")
+
+    def expect_end(self) -> None:
+        self._skip_whitespace()
+
+        if self._position < len(self._text):
+            raise ValueError(f"Некорректный JSON: лишние данные в позиции {self._offset()}")
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            text = self._text
+            position = self._position
+
+            while position < len(text) and text[position] in " \t\n\r":
+                position += 1
+
+            self._position = position
+            if position < len(text) or self._eof:
+                return
+
+            self._read(self._chunk_size)
+
+    def _read(self, size: int) -> None:
+        chunk = self._stream.read(size)
+        self._eof = not chunk
+
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk, final=self._eof)
+
+        # Разобранный текст отбрасывается
+        self._consumed += self._position
+        self._text = self._text[self._position:] + chunk
+        self._position = 0
+
+    def _offset(self) -> int:
+        return self._consumed + self._position
+
+
+def _make_multipolygon(geometry: Any) -> MultiPolygon:
+    """Многоугольники геометрии в виде MultiPolygon"""
+
+    return MultiPolygon([part for part in shapely.get_parts(geometry) if isinstance(part, Polygon)])
+
+
+def _check_feature(feature: Any) -> None:
+    if not isinstance(feature, dict) or feature.get("type", "Feature") != "Feature":
+        raise ValueError("Ожидается объект Feature")
+
+    if not isinstance(feature.get("properties"), dict):
+        raise ValueError("Свойства объекта Feature должны быть словарем")
+
+    feature_id = feature.get("id")
+    if feature_id is not None and (isinstance(feature_id, bool) or not isinstance(feature_id, int | str)):
+        raise ValueError("Идентификатор объекта Feature должен быть целым числом или строкой")
+
+    geometry = feature.get("geometry")
+    if not isinstance(geometry, dict) or geometry.get("type") not in _GEOMETRY_TYPES:
+        raise ValueError("Объект Feature должен содержать геометрию")
+
+    _check_bbox(feature)
+    _check_bbox(geometry)
+
+
+def _check_bbox(data: dict[str, Any]) -> None:
+    bbox = data.get("bbox")
+    if bbox is None:
+        return
+
+    min_lon, min_lat, max_lon, max_lat = _coordinates_array(bbox, (4,))
+
+    if min_lat > max_lat:
+        raise ValueError("Минимальная широта не может быть больше максимальной")
+
+    if min_lon > max_lon:
+        raise ValueError("Минимальная долгота не может быть больше максимальной")
+
+
+def _parse_point(geometry: dict[str, Any]) -> Point:
+    if geometry["type"] != "Point":
+        raise ValueError("Начальная и конечная точки должны быть геометрией типа Point")
+
+    return Point(_coordinates_array(geometry.get("coordinates"), (2,)))
+
+
+def _parse_multipolygon(geometry: dict[str, Any]) -> MultiPolygon:
+    if geometry["type"] != "MultiPolygon":
+        raise ValueError("Запретные зоны должны быть геометрией типа MultiPolygon")
+
+    coordinates = geometry.get("coordinates")
+    if not isinstance(coordinates, list) or any(not isinstance(polygon, list) for polygon in coordinates):
+        raise ValueError("Некорректные координаты MultiPolygon")
+
+    polygons = []
+
+    for polygon in coordinates:
+        rings = [_coordinates_array(ring, (-1, 2)) for ring in polygon]
+
+        for ring in rings:
+            if len(ring) < 4:
+                raise ValueError("Линейное кольцо должно содержать не менее 4 позиций")
+
+            if not np.array_equal(ring[0], ring[-1]):
+                raise ValueError("Все линейные кольца должны иметь одинаковые начальные и конечные координаты")
+
+        if rings:
+            polygons.append(Polygon(rings[0], rings[1:]))
+
+    return MultiPolygon(polygons)
+
+
+def _coordinates_array(coordinates: Any, shape: tuple[int, ...]) -> np.ndarray:
+    """Массив координат с проверкой формы и конечности значений"""
+
+    try:
+        array = np.asarray(coordinates, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError("Координаты должны быть числами") from None
+
+    if array.ndim != len(shape) or any(size not in (-1, actual) for size, actual in zip(shape, array.shape)):
+        raise ValueError("Некорректное количество координат")
+
+    if not np.isfinite(array).all():
+        raise ValueError("Координаты должны быть конечными числами")
+
+    return array
+
+
+def _format_coordinate(value: float) -> str:
+    """Десятичное представление координаты, как у `Decimal`, созданного из числа с плавающей точкой"""
+
+    text = repr(value)
+
+    # Экспоненциальная запись у float и Decimal различается, такие значения в координатах встречаются редко
+    if "e" in text:
+        return str(Decimal(text))
+
+    return text
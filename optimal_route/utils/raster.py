@@ -0,0 +1,267 @@
+from math import sqrt
+from typing import NamedTuple
+
+import numpy as np
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+
+# Наибольшее отношение длины пути по 8 направлениям решетки к длине отрезка между теми же точками
+OCTILE_FACTOR = sqrt(4 - 2 * sqrt(2))
+
+# Относительное изменение расстояний, при котором проходы `lattice_distances` прекращаются: сдвиг значений строки
+# при переходах вдоль нее меняет расстояния на единицы последнего разряда, и точного совпадения может не быть
+_LATTICE_TOLERANCE = 1e-12
+
+
+RasterGrid = NamedTuple(
+    "RasterGrid",
+    [
+        ("origin", tuple[float, float]),
+        ("resolution", float),
+        ("shape", tuple[int, int])
+    ]
+)
+
+
+def raster_grid(bounds: tuple[float, float, float, float], resolution: float, margin: int = 2) -> RasterGrid:
+    """Сетка из квадратных ячеек со стороной `resolution`, покрывающая `bounds` с запасом в `margin` ячеек"""
+
+    min_x, min_y, max_x, max_y = bounds
+    origin = (min_x - margin * resolution, min_y - margin * resolution)
+    shape = (
+        int(np.ceil((max_y - min_y) / resolution)) + 2 * margin,
+        int(np.ceil((max_x - min_x) / resolution)) + 2 * margin
+    )
+
+    return RasterGrid(origin, resolution, shape)
+
+
+def fill_cells(geometry: BaseGeometry, grid: RasterGrid) -> np.ndarray:
+    """
+    Функция для растеризации многоугольников: ячейки, центр которых лежит внутри `geometry`.
+
+    Заполнение выполняется построчно по правилу чет-нечет: для каждой стороны вычисляются точки пересечения
+    с горизонталями центров ячеек, а внутренние ячейки строки отмечаются накопленной четностью пересечений.
+    Все вычисления векторизованы и не зависят от числа многоугольников
+    """
+
+    rows, cols = grid.shape
+    (x_0, y_0), resolution = grid.origin, grid.resolution
+    counts = np.zeros(rows * (cols + 1), dtype=np.int32)
+
+    rings = shapely.get_rings(shapely.get_parts(geometry))
+    if len(rings):
+        coords, ring_idx = shapely.get_coordinates(rings, return_index=True)
+
+        # Стороны колец - пары соседних координат одного кольца
+        same_ring = ring_idx[:-1] == ring_idx[1:]
+        starts, ends = coords[:-1][same_ring], coords[1:][same_ring]
+
+        # Строки, горизонталь центра которых пересекает сторону: min_y <= y < max_y
+        min_y, max_y = np.minimum(starts[:, 1], ends[:, 1]), np.maximum(starts[:, 1], ends[:, 1])
+        first = np.clip(np.ceil((min_y - y_0) / resolution - 0.5), 0, rows).astype(np.int64)
+        last = np.clip(np.ceil((max_y - y_0) / resolution - 0.5), 0, rows).astype(np.int64)
+        crossings = np.maximum(last - first, 0)
+
+        side = np.repeat(np.arange(len(starts)), crossings)
+        row = first[side] + np.arange(len(side)) - np.repeat(np.cumsum(crossings) - crossings, crossings)
+
+        y = y_0 + (row + 0.5) * resolution
+        a, b = starts[side], ends[side]
+        x = a[:, 0] + (y - a[:, 1]) / (b[:, 1] - a[:, 1]) * (b[:, 0] - a[:, 0])
+        col = np.clip(np.ceil((x - x_0) / resolution - 0.5), 0, cols).astype(np.int64)
+
+        counts += np.bincount(row * (cols + 1) + col, minlength=len(counts)).astype(np.int32)
+
+    return (np.cumsum(counts.reshape(rows, cols + 1), axis=1)[:, :cols] % 2).astype(bool)
+
+
+def corner_coords(grid: RasterGrid, corners: np.ndarray) -> np.ndarray:
+    """Координаты углов ячеек по их номерам в решетке углов размером (rows + 1) x (cols + 1)"""
+
+    rows, cols = np.divmod(corners, grid.shape[1] + 1)
+    return np.column_stack((grid.origin[0] + cols * grid.resolution, grid.origin[1] + rows * grid.resolution))
+
+
+def lattice_distances(
+    free: np.ndarray,
+    resolution: float,
+    sources: np.ndarray,
+    source_distances: np.ndarray,
+    knight_moves: bool = False
+) -> np.ndarray:
+    """
+    Функция для вычисления кратчайших расстояний от источников до всех углов ячеек.
+
+    Переходы выполняются в 8 направлениях между соседними углами: по стороне ячейки, если хотя бы одна
+    из двух прилегающих к ней ячеек свободна, и по диагонали ячейки, если она свободна. При `knight_moves`
+    добавляются 8 переходов ходом коня через две свободные ячейки, и путь по решетке длиннее отрезка
+    не более чем на 2.7% вместо 8.2%. Ячейки за границей сетки считаются свободными.
+
+    Расстояния уточняются проходами сверху вниз и снизу вверх: каждая строка обновляется по предыдущим
+    строкам и вдоль себя в обе стороны векторно, проходы повторяются, пока расстояния заметно меняются.
+    Результат - массив (rows + 1) x (cols + 1), недостижимые углы - `inf`
+    """
+
+    horizontal, vertical, diagonal = _allowed_moves(free)
+    rows = free.shape[0]
+
+    distances = np.full((rows + 1, free.shape[1] + 1), np.inf)
+    np.minimum.at(distances.reshape(-1), sources, source_distances)
+
+    while True:
+        previous = distances.copy()
+
+        for row in range(rows + 1):
+            if row:
+                _relax_from_row(distances, row - 1, row, vertical[row - 1], diagonal[row - 1], resolution, knight_moves)
+            if knight_moves and row > 1:
+                _relax_from_second_row(distances, row - 2, row, free[row - 2] & free[row - 1], resolution)
+            _relax_along_row(distances[row], horizontal[row], resolution)
+
+        for row in range(rows - 1, -1, -1):
+            _relax_from_row(distances, row + 1, row, vertical[row], diagonal[row], resolution, knight_moves)
+            if knight_moves and row < rows - 1:
+                _relax_from_second_row(distances, row + 2, row, free[row] & free[row + 1], resolution)
+            _relax_along_row(distances[row], horizontal[row], resolution)
+
+        if np.allclose(distances, previous, rtol=_LATTICE_TOLERANCE, atol=0):
+            return distances
+
+
+def lattice_path(
+    distances: np.ndarray,
+    free: np.ndarray,
+    resolution: float,
+    initial: np.ndarray,
+    corner: int,
+    knight_moves: bool = False
+) -> np.ndarray:
+    """
+    Путь по решетке углов от `corner` к ближайшему источнику `lattice_distances`: на каждом шаге
+    выбирается переход, после которого оставшееся расстояние вместе с длиной перехода наименьшее.
+    `initial` - начальные расстояния источников, у остальных углов `inf`
+    """
+
+    horizontal, vertical, diagonal = _allowed_moves(free)
+    rows, cols = free.shape
+    padded = np.pad(free, 2, constant_values=True)
+
+    def cells_free(*cells: tuple[int, int]) -> bool:
+        return all(padded[row + 2, col + 2] for row, col in cells)
+
+    path = [corner]
+    row, col = divmod(corner, cols + 1)
+
+    while distances[row, col] < initial[row * (cols + 1) + col]:
+        moves = []
+        if col < cols and horizontal[row, col]:
+            moves.append((row, col + 1, resolution))
+        if col > 0 and horizontal[row, col - 1]:
+            moves.append((row, col - 1, resolution))
+        if row < rows and vertical[row, col]:
+            moves.append((row + 1, col, resolution))
+        if row > 0 and vertical[row - 1, col]:
+            moves.append((row - 1, col, resolution))
+
+        # Диагональ и ходы коня проходят через ячейки между углами
+        for row_step, col_step in _DIAGONAL_MOVES + (_KNIGHT_MOVES if knight_moves else ()):
+            next_row, next_col = row + row_step, col + col_step
+            if not (0 <= next_row <= rows and 0 <= next_col <= cols):
+                continue
+
+            first_row, first_col = min(row, next_row), min(col, next_col)
+            cells = [
+                (first_row + i, first_col + j)
+                for i in range(abs(row_step)) for j in range(abs(col_step))
+            ]
+            if cells_free(*cells):
+                moves.append((next_row, next_col, resolution * sqrt(row_step ** 2 + col_step ** 2)))
+
+        if not moves:
+            break
+
+        next_row, next_col, _ = min(moves, key=lambda move: distances[move[0], move[1]] + move[2])
+        if distances[next_row, next_col] >= distances[row, col]:
+            break
+
+        row, col = next_row, next_col
+        path.append(row * (cols + 1) + col)
+
+    return np.asarray(path)
+
+
+_DIAGONAL_MOVES = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+_KNIGHT_MOVES = ((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1))
+
+
+def _allowed_moves(free: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Допустимые переходы по горизонтальным и вертикальным сторонам ячеек и по диагоналям ячеек"""
+
+    padded = np.pad(free, 1, constant_values=True)
+
+    horizontal = padded[:-1, 1:-1] | padded[1:, 1:-1]
+    vertical = padded[1:-1, :-1] | padded[1:-1, 1:]
+
+    return horizontal, vertical, free
+
+
+def _relax_from_row(
+    distances: np.ndarray,
+    source: int,
+    target: int,
+    vertical: np.ndarray,
+    diagonal: np.ndarray,
+    resolution: float,
+    knight_moves: bool
+) -> None:
+    """Обновление строки углов `target` переходами из соседней строки `source` через строку ячеек между ними"""
+
+    source_row, target_row = distances[source], distances[target]
+    diagonal_step, knight_step = resolution * sqrt(2), resolution * sqrt(5)
+
+    np.minimum(target_row, np.where(vertical, source_row + resolution, np.inf), out=target_row)
+    np.minimum(target_row[1:], np.where(diagonal, source_row[:-1] + diagonal_step, np.inf), out=target_row[1:])
+    np.minimum(target_row[:-1], np.where(diagonal, source_row[1:] + diagonal_step, np.inf), out=target_row[:-1])
+
+    if knight_moves:
+        # Ход на два угла вдоль строки проходит через две соседние ячейки
+        pairs = diagonal[:-1] & diagonal[1:]
+        np.minimum(target_row[2:], np.where(pairs, source_row[:-2] + knight_step, np.inf), out=target_row[2:])
+        np.minimum(target_row[:-2], np.where(pairs, source_row[2:] + knight_step, np.inf), out=target_row[:-2])
+
+
+def _relax_from_second_row(distances: np.ndarray, source: int, target: int, cells: np.ndarray, resolution: float) -> None:
+    """Обновление строки углов `target` ходами коня из строки `source` через две строки ячеек между ними"""
+
+    source_row, target_row = distances[source], distances[target]
+    knight_step = resolution * sqrt(5)
+
+    np.minimum(target_row[1:], np.where(cells, source_row[:-1] + knight_step, np.inf), out=target_row[1:])
+    np.minimum(target_row[:-1], np.where(cells, source_row[1:] + knight_step, np.inf), out=target_row[:-1])
+
+
+def _relax_along_row(row: np.ndarray, allowed: np.ndarray, step: float) -> None:
+    """
+    Обновление строки углов переходами вдоль нее в обе стороны.
+
+    Расстояние слева направо - накопленный минимум `d[k] - k * step` плюс `c * step`. Запрещенные стороны делят
+    строку на участки: значения каждого следующего участка сдвигаются вниз на величину, превышающую любые
+    расстояния строки, поэтому минимум, перенесенный через запрещенную сторону, больше `limit` и отбрасывается
+    """
+
+    finite = row[np.isfinite(row)]
+    if not len(finite):
+        return
+
+    positions = np.arange(len(row)) * step
+    # Наибольшее расстояние, которое можно получить переходами внутри участка
+    limit = finite.max() + positions[-1]
+    offset = limit + positions[-1] + step
+
+    for values, moves, steps in ((row, allowed, positions), (row[::-1], allowed[::-1], positions)):
+        shifts = np.concatenate(([0], np.cumsum(~moves))) * offset
+        candidates = np.minimum.accumulate(values - steps - shifts) + steps + shifts
+        candidates[candidates > limit] = np.inf
+        np.minimum(values, candidates, out=values)
@@ -1,26 +1,243 @@
+from heapq import heapify, heappop, heappush
 from typing import Callable
 
-from networkx import Graph
-from networkx.exception import NetworkXNoPath
-from networkx.algorithms.shortest_paths.astar import astar_path
+import numpy as np
 from shapely.geometry import LineString, Point
 
 
-def find_fastest_route_in_graph(
-    graph: Graph, 
+class CsrGraph:
+    """
+    Компактный неориентированный граф с вершинами-индексами.
+
+    Смежность хранится в формате CSR: соседи вершины `i` - `indices[indptr[i]:indptr[i + 1]]`,
+    длины ребер до них - в тех же позициях массива `weights`. Каждое ребро хранится дважды,
+    по одному разу для каждой из его вершин
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray) -> None:
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, node_count: int, u: np.ndarray, v: np.ndarray, weights: np.ndarray) -> "CsrGraph":
+        """Построение графа из массивов вершин и длин ребер `u[i] - v[i]`"""
+
+        sources = np.concatenate((u, v))
+        targets = np.concatenate((v, u))
+        both_weights = np.concatenate((weights, weights))
+
+        order = np.argsort(sources, kind="stable")
+
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+
+        return cls(indptr, targets[order].astype(np.int32), both_weights[order].astype(np.float64))
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def number_of_edges(self) -> int:
+        return len(self.indices) // 2
+
+    @property
+    def nbytes(self) -> int:
+        """Объем памяти, занимаемый массивами графа"""
+
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
+
+    def neighbours(self, node: int) -> tuple[np.ndarray, np.ndarray]:
+        """Соседние вершины и длины ребер до них"""
+
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+
+def find_fastest_route_in_vertices(
+    vertices: np.ndarray,
+    start_point: Point,
+    finish_point: Point,
+    start_edges: tuple[np.ndarray, np.ndarray],
+    finish_edges: tuple[np.ndarray, np.ndarray],
+    neighbours: Callable[[int], tuple[np.ndarray, np.ndarray]],
+    heuristic: np.ndarray
+) -> LineString:
+    """
+    Поиск кратчайшего пути A* по вершинам, заданным индексами в `vertices`.
+
+    Ребра вершины (индексы соседних вершин и длины ребер) запрашиваются через `neighbours`,
+    когда поиск раскрывает эту вершину: из графа `CsrGraph` или вычисляются по мере поиска.
+    `start_edges` и `finish_edges` - вершины, видимые из начальной и конечной точек, и длины ребер до них,
+    `heuristic` - оценка расстояния от каждой вершины до конечной точки, не превышающая длины пути до нее
+    """
+
+    route, _ = find_fastest_route_with_length_in_vertices(
+        vertices, start_point, finish_point, start_edges, finish_edges, neighbours, heuristic
+    )
+    return route
+
+
+def find_fastest_route_with_length_in_vertices(
+    vertices: np.ndarray,
+    start_point: Point,
+    finish_point: Point,
+    start_edges: tuple[np.ndarray, np.ndarray],
+    finish_edges: tuple[np.ndarray, np.ndarray],
+    neighbours: Callable[[int], tuple[np.ndarray, np.ndarray]],
+    heuristic: np.ndarray
+) -> tuple[LineString, float]:
+    """
+    Поиск кратчайшего пути A*, как в `find_fastest_route_in_vertices`. Вместе с маршрутом возвращается
+    его длина - сумма длин ребер пути, найденная при поиске
+    """
+
+    count = len(vertices)
+    finish, start = count, count + 1
+
+    finish_lengths = np.full(count, np.inf)
+    finish_lengths[finish_edges[0]] = finish_edges[1]
+
+    heuristic = np.append(heuristic, (0.0, 0.0))
+    distances = np.full(count + 2, np.inf)
+    parents = np.full(count + 2, -1)
+    explored = np.zeros(count + 2, dtype=bool)
+
+    distances[start] = 0.0
+    queue = [(0.0, start)]
+
+    while queue:
+        _, node = heappop(queue)
+
+        if node == finish:
+            return LineString(_route_coords(vertices, parents, start_point, finish_point, finish)), float(distances[finish])
+
+        if explored[node]:
+            continue
+        explored[node] = True
+
+        if node == start:
+            indices, lengths = start_edges
+        else:
+            indices, lengths = neighbours(node)
+
+            # Ребро до конечной точки
+            if finish_lengths[node] < np.inf:
+                indices = np.append(indices, finish)
+                lengths = np.append(lengths, finish_lengths[node])
+
+        # Релаксация ребер выполняется сразу для всего массива соседей
+        new_distances = distances[node] + lengths
+        improved = new_distances < distances[indices]
+        if not improved.any():
+            continue
+
+        indices, new_distances = indices[improved], new_distances[improved]
+        distances[indices] = new_distances
+        parents[indices] = node
+
+        for neighbour, score in zip(indices.tolist(), (new_distances + heuristic[indices]).tolist()):
+            heappush(queue, (score, neighbour))
+
+    raise ValueError("Невозможно проложить маршрут: нет пути между начальной и конечной точками")
+
+
+def find_shortest_distances(
+    count: int,
+    start_edges: tuple[np.ndarray, np.ndarray],
+    neighbours: Callable[[int], tuple[np.ndarray, np.ndarray]],
+    targets: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Поиск кратчайших расстояний Дейкстрой от точки до вершин, заданных индексами от 0 до `count`.
+
+    `start_edges` - вершины, видимые из точки, и длины ребер до них. Поиск останавливается,
+    когда расстояния до всех вершин `targets` окончательно найдены. Возвращаются расстояния
+    (`inf` для недостижимых вершин) и предшественники вершин на кратчайших путях
+    (`-1` для вершин, соединенных с точкой напрямую)
+    """
+
+    distances = np.full(count, np.inf)
+    parents = np.full(count, -1)
+    explored = np.zeros(count, dtype=bool)
+
+    remaining = np.zeros(count, dtype=bool)
+    remaining[targets] = True
+    remaining_count = np.count_nonzero(remaining)
+
+    indices, lengths = start_edges
+    distances[indices] = lengths
+    queue = list(zip(lengths.tolist(), indices.tolist()))
+    heapify(queue)
+
+    while queue and remaining_count:
+        _, node = heappop(queue)
+
+        if explored[node]:
+            continue
+        explored[node] = True
+
+        if remaining[node]:
+            remaining_count -= 1
+
+        indices, lengths = neighbours(node)
+
+        # Релаксация ребер выполняется сразу для всего массива соседей
+        new_distances = distances[node] + lengths
+        improved = new_distances < distances[indices]
+        if not improved.any():
+            continue
+
+        indices, new_distances = indices[improved], new_distances[improved]
+        distances[indices] = new_distances
+        parents[indices] = node
+
+        for neighbour, distance in zip(indices.tolist(), new_distances.tolist()):
+            heappush(queue, (distance, neighbour))
+
+    return distances, parents
+
+
+def route_through_vertices(
+    vertices: np.ndarray,
+    parents: np.ndarray,
     start_point: Point,
-    finish_point: Point, 
-    edge_weight: str | Callable
+    finish_point: Point,
+    last: int
 ) -> LineString:
-    # Начальная и конечная точки
-    source = (start_point.x, start_point.y)
-    target = (finish_point.x, finish_point.y)
-
-    try:
-        optimal_route = astar_path(graph, source, target, weight=edge_weight)  # type: ignore
-        optimal_route = LineString(optimal_route)
-    except NetworkXNoPath:
-        raise ValueError("Невозможно проложить маршрут: нет пути между начальной и конечной точками")
-
-    return optimal_route
-    
\ No newline at end of file
+    """Маршрут от начальной точки через вершины до `last` по предшественникам из `find_shortest_distances` и до конечной точки"""
+
+    path = []
+    node = last
+    while node != -1:
+        path.append(node)
+        node = parents[node]
+
+    coords = [(start_point.x, start_point.y)]
+    coords.extend(map(tuple, vertices[path[::-1]].tolist()))
+    coords.append((finish_point.x, finish_point.y))
+
+    return LineString(coords)
+
+
+def _route_coords(
+    vertices: np.ndarray,
+    parents: np.ndarray,
+    start_point: Point,
+    finish_point: Point,
+    finish: int
+) -> list[tuple[float, float]]:
+    """Координаты пути от начальной точки до конечной по найденным предшественникам вершин"""
+
+    path = []
+    node = parents[finish]
+    while parents[node] != -1:
+        path.append(node)
+        node = parents[node]
+
+    coords = [(start_point.x, start_point.y)]
+    coords.extend(map(tuple, vertices[path[::-1]].tolist()))
+    coords.append((finish_point.x, finish_point.y))
+
+    return coords
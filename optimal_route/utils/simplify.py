@@ -0,0 +1,85 @@
+import numpy as np
+import shapely
+from pyproj.enums import TransformDirection
+from shapely.geometry import MultiPolygon, Polygon
+
+from optimal_route.utils.buffer import local_transformer
+
+
+# Доли допуска упрощения: на сколько зона расширяется перед упрощением и допуск самого упрощения.
+# Расширение с острыми углами отодвигает границу на расстояние от 1/2 до 3/4 допуска (`_MITRE_LIMIT`),
+# упрощенная граница отклоняется от расширенной не более чем на 1/4 допуска, поэтому она не заходит
+# внутрь исходной зоны, а от исходной границы удалена не более чем на допуск
+_EXPANSION_SHARE = 1 / 2
+_SIMPLIFICATION_SHARE = 1 / 4
+_MITRE_LIMIT = 1.5
+
+
+def simplify_geometry_in_metres(
+    geometry: Polygon | MultiPolygon,
+    tolerance: float,
+    coord_system: str = "WGS84"
+) -> MultiPolygon:
+    """
+    Функция для упрощения запретных зон наружу с допуском в метрах.
+
+    Перекрывающиеся зоны объединяются, после чего каждый многоугольник в своей локальной проекции
+    расширяется на половину допуска и упрощается алгоритмом Дугласа - Пекера с допуском в четверть.
+    Упрощенная зона всегда содержит исходную, поэтому маршрут в обход упрощенных зон
+    не проходит через исходные, и удалена от исходной границы не более чем на `tolerance`.
+    Если упрощение многоугольника не дает меньше вершин или не содержит исходный многоугольник,
+    остается исходный
+    """
+
+    polygons = shapely.get_parts(shapely.union_all(shapely.get_parts(geometry)))
+
+    simplified_polygons = [_simplify_in_local_projection(polygon, tolerance, coord_system) for polygon in polygons]
+
+    # Расширенные многоугольники могут перекрываться
+    simplified_geometry = shapely.union_all(simplified_polygons)
+
+    if isinstance(simplified_geometry, Polygon):
+        return MultiPolygon([simplified_geometry])
+
+    return simplified_geometry
+
+
+def _simplify_in_local_projection(polygon: Polygon, tolerance: float, coord_system: str) -> Polygon:
+    """
+    Упрощение многоугольника наружу в азимутальной равнопромежуточной проекции с центром в его центроиде.
+
+    Маршруты и видимость строятся по прямым отрезкам в долготе и широте, а прямой отрезок проекции
+    после обратного преобразования вершин может пройти внутрь исходной зоны (на высоких широтах - на градусы).
+    Поэтому содержание исходного многоугольника проверяется после обратного преобразования
+    """
+
+    centroid = polygon.centroid
+    transformer = local_transformer(centroid.y, centroid.x, coord_system)
+
+    polygon_local = shapely.transform(
+        polygon, lambda coords: np.column_stack(transformer.transform(coords[:, 0], coords[:, 1]))
+    )
+
+    simplified_local = shapely.simplify(
+        polygon_local.buffer(tolerance * _EXPANSION_SHARE, join_style="mitre", mitre_limit=_MITRE_LIMIT),
+        tolerance * _SIMPLIFICATION_SHARE,
+        preserve_topology=True
+    )
+
+    if (
+        not isinstance(simplified_local, Polygon) or
+        shapely.get_num_coordinates(simplified_local) >= shapely.get_num_coordinates(polygon_local)
+    ):
+        return polygon
+
+    simplified = shapely.transform(
+        simplified_local,
+        lambda coords: np.column_stack(
+            transformer.transform(coords[:, 0], coords[:, 1], direction=TransformDirection.INVERSE)
+        )
+    )
+
+    if not simplified.is_valid or not simplified.contains(polygon):
+        return polygon
+
+    return simplified
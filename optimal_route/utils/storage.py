@@ -0,0 +1,100 @@
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+# Сигнатура файла и выравнивание массивов, позволяющее читать их из отображенной в память области без копирования
+_MAGIC = b"ORARRAYS"
+_ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sQ")
+
+
+def write_arrays(path: str | Path, metadata: dict[str, Any], arrays: dict[str, np.ndarray]) -> None:
+    """
+    Функция для записи массивов numpy и метаданных в один файл.
+
+    Файл состоит из сигнатуры, заголовка в JSON с метаданными и расположением массивов
+    и самих массивов, выровненных по 64 байтам. Файл сначала записывается во временный
+    и затем заменяет существующий, поэтому процессы, которые уже читают старый файл, его не теряют
+    """
+
+    path = Path(path)
+    layout = {}
+    offset = 0
+
+    for name, array in arrays.items():
+        offset = _aligned(offset)
+        layout[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset += array.nbytes
+
+    header = json.dumps({"metadata": metadata, "arrays": layout}).encode()
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    try:
+        with open(temporary_path, "wb") as file:
+            file.write(_PREFIX.pack(_MAGIC, len(header)))
+            file.write(header)
+
+            for name, array in arrays.items():
+                file.seek(data_start + layout[name]["offset"])
+                file.write(np.ascontiguousarray(array).tobytes())
+
+            # Размер файла должен покрывать последний массив, даже если он пустой
+            file.truncate(data_start + offset)
+
+        os.replace(temporary_path, path)
+    finally:
+        if temporary_path.exists():
+            temporary_path.unlink()
+
+
+def read_arrays(path: str | Path, mmap: bool = True) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """
+    Функция для чтения массивов и метаданных, записанных `write_arrays`.
+
+    При `mmap` файл отображается в память только для чтения и массивы ссылаются на эту область:
+    данные загружаются с диска по мере обращения к ним, а несколько процессов, открывших один файл,
+    используют общие страницы памяти
+    """
+
+    with open(path, "rb") as file:
+        prefix = file.read(_PREFIX.size)
+        if len(prefix) != _PREFIX.size:
+            raise ValueError("Файл поврежден или имеет неизвестный формат")
+
+        magic, header_size = _PREFIX.unpack(prefix)
+        if magic != _MAGIC:
+            raise ValueError("Файл поврежден или имеет неизвестный формат")
+
+        header = json.loads(file.read(header_size))
+
+    data_start = _aligned(_PREFIX.size + header_size)
+
+    if mmap:
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+    else:
+        data = np.fromfile(path, dtype=np.uint8)
+
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        start = data_start + entry["offset"]
+        end = start + dtype.itemsize * int(np.prod(shape))
+
+        if end > len(data):
+            raise ValueError("Файл поврежден или имеет неизвестный формат")
+
+        arrays[name] = data[start:end].view(dtype).reshape(shape)
+
+    return header["metadata"], arrays
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
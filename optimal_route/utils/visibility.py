@@ -0,0 +1,535 @@
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+import shapely
+from shapely import MultiPolygon, STRtree
+from shapely.geometry.polygon import orient
+
+
+Coords = tuple[float, float]
+Edge = tuple[Coords, Coords]
+
+# Относительная погрешность, при которой знак ориентации тройки точек считается достоверным.
+# Значение с большим запасом перекрывает ошибку округления вычислений с плавающей точкой,
+# все сомнительные случаи перепроверяются точными предикатами GEOS
+_ORIENTATION_TOLERANCE = 1e-12
+
+# Доли длины отрезка, в которых берутся пробные точки: 1/2, 1/4, 3/4, 1/8, ...
+_SAMPLE_FRACTIONS = [(2 * i + 1) / 2 ** level for level in range(1, 5) for i in range(2 ** (level - 1))]
+
+# Относительное расстояние от границы зоны, на котором пробная точка заведомо лежит внутри нее
+# с учетом погрешности вычисления координат точки
+_SAMPLE_TOLERANCE = 1e-9
+
+# Запас в радианах, на который расширяются дуги касательных направлений в `tangent_pairs`.
+# Перекрывает и погрешность `arctan2`, и углы, при которых знак ориентации в `tangent_mask` недостоверен
+_TANGENT_ANGLE_TOLERANCE = 1e-9
+
+
+class EdgeFilter:
+    """
+    Векторизованный отбор ребер, которые не проходят через внутреннюю область запретных зон.
+
+    Ребро отсекается, если его внутренность пересекает внутренность хотя бы одного многоугольника зоны.
+    Для валидного MultiPolygon это эквивалентно условию `line.crosses(zone) or zone.contains(line)`.
+
+    Проверка выполняется сразу для массива отрезков:
+    - пробная точка отрезка, лежащая внутри зоны вдали от ее границы, доказывает, что ребро проходит через зону;
+    - остальные отрезки сопоставляются с близкими сторонами многоугольников через `STRtree`;
+    - собственное пересечение отрезка со стороной доказывает, что ребро проходит через зону;
+    - в вершинах многоугольника направление ребра сравнивается с внутренним углом;
+    - отрезки, для которых вычисления с плавающей точкой не дают однозначного ответа
+      (касания, коллинеарные участки), перепроверяются предикатами GEOS на подготовленных геометриях.
+
+    Если передана маска многоугольников `polygons` (в порядке `shapely.get_parts(zone)`), учитываются
+    только отмеченные многоугольники: так одним фильтром проверяется видимость среди части зон
+    """
+
+    def __init__(self, zone: MultiPolygon, chunk_size: int = 20_000) -> None:
+        self._zone = zone
+        self._chunk_size = chunk_size
+
+        self._boundary = shapely.boundary(zone)
+        shapely.prepare(zone)
+        shapely.prepare(self._boundary)
+
+        # Допуск пробных точек растет вместе с величиной координат
+        self._sample_tolerance = _SAMPLE_TOLERANCE * max(1.0, *map(abs, zone.bounds))
+
+        # Внешние кольца против часовой стрелки, внутренние по часовой:
+        # внутренняя область многоугольника всегда слева от стороны
+        self._polygons = _oriented_polygons(zone)
+        self._polygon_tree = STRtree(self._polygons)
+        shapely.prepare(self._polygons)
+
+        rings, ring_polygon_idx = shapely.get_rings(self._polygons, return_index=True)
+        coords, coord_ring_idx = shapely.get_coordinates(rings, return_index=True)
+
+        # Замыкающая координата кольца повторяет первую и не является отдельной вершиной
+        is_last = np.append(coord_ring_idx[1:] != coord_ring_idx[:-1], True)
+        vertices = coords[~is_last]
+        vertex_ring_idx = coord_ring_idx[~is_last]
+
+        # Соседние вершины в порядке обхода кольца
+        prev_idx, next_idx = _ring_neighbours(vertex_ring_idx)
+
+        self._vertices = vertices
+        self._vertex_polygon = ring_polygon_idx[vertex_ring_idx]
+        self._vertex_next = vertices[next_idx]
+        self._vertex_prev = vertices[prev_idx]
+
+        self._vertex_lookup: dict[Coords, list[int]] = {}
+        for idx, vertex in enumerate(map(tuple, vertices.tolist())):
+            self._vertex_lookup.setdefault(vertex, []).append(idx)
+
+        # Стороны многоугольников
+        self._sides_tree = STRtree(shapely.linestrings(np.stack((vertices, self._vertex_next), axis=1)))
+        self._sides_x0, self._sides_y0 = vertices.T.copy()
+        self._sides_x1, self._sides_y1 = self._vertex_next.T.copy()
+
+    def __reduce__(self) -> tuple[type["EdgeFilter"], tuple[MultiPolygon, int]]:
+        # Пространственные индексы и подготовленные геометрии строятся заново
+        return EdgeFilter, (self._zone, self._chunk_size)
+
+    def visible(self, starts: np.ndarray, ends: np.ndarray, polygons: np.ndarray | None = None) -> np.ndarray:
+        """
+        Маска отрезков `starts[i] -> ends[i]`, которые не проходят через запретные зоны
+        или через отмеченные в `polygons` многоугольники зон
+        """
+
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+
+        mask = np.ones(len(starts), dtype=bool)
+
+        # Отрезки обрабатываются порциями, чтобы ограничить потребление памяти
+        for offset in range(0, len(starts), self._chunk_size):
+            chunk = slice(offset, offset + self._chunk_size)
+            mask[chunk] = self._visible_chunk(starts[chunk], ends[chunk], polygons)
+
+        return mask
+
+    def filter(self, edges: Iterable[Edge]) -> set[Edge]:
+        """Отбор тех ребер, которые не пересекают зону и не входят в нее"""
+
+        edges = list(edges)
+        if not edges:
+            return set()
+
+        coords = np.asarray(edges, dtype=float)
+        mask = self.visible(coords[:, 0], coords[:, 1])
+
+        return {edge for edge, is_visible in zip(edges, mask) if is_visible}
+
+    def _visible_chunk(self, starts: np.ndarray, ends: np.ndarray, polygons: np.ndarray | None) -> np.ndarray:
+        mask = ~self._check_samples(starts, ends, polygons)
+
+        rest = np.flatnonzero(mask)
+        if len(rest):
+            mask[rest] = self._visible_remaining(starts[rest], ends[rest], polygons)
+
+        return mask
+
+    def _check_samples(self, starts: np.ndarray, ends: np.ndarray, polygons: np.ndarray | None) -> np.ndarray:
+        """Быстрый отбор отрезков, пробные точки которых лежат внутри зоны вдали от ее границы"""
+
+        blocked = np.zeros(len(starts), dtype=bool)
+
+        for fraction in _SAMPLE_FRACTIONS:
+            idx = np.flatnonzero(~blocked)
+            if not len(idx):
+                break
+
+            samples = starts[idx] + (ends[idx] - starts[idx]) * fraction
+
+            inside = shapely.contains_xy(self._zone, samples[:, 0], samples[:, 1])
+            idx, samples = idx[inside], samples[inside]
+
+            # Пробная точка доказывает пересечение, только если она лежит в отмеченном многоугольнике
+            if polygons is not None:
+                sample_idx, polygon_idx = self._polygon_tree.query(shapely.points(samples), predicate="within")
+                in_polygons = np.zeros(len(idx), dtype=bool)
+                in_polygons[sample_idx[polygons[polygon_idx]]] = True
+                idx, samples = idx[in_polygons], samples[in_polygons]
+
+            near_boundary = shapely.dwithin(self._boundary, shapely.points(samples), self._sample_tolerance)
+            blocked[idx[~near_boundary]] = True
+
+        return blocked
+
+    def _visible_remaining(self, starts: np.ndarray, ends: np.ndarray, polygons: np.ndarray | None) -> np.ndarray:
+        blocked = np.zeros(len(starts), dtype=bool)
+        uncertain = np.zeros(len(starts), dtype=bool)
+
+        self._check_sides(starts, ends, blocked, uncertain, polygons)
+        self._check_endpoints(starts, ends, blocked, uncertain, polygons)
+        self._check_endpoints(ends, starts, blocked, uncertain, polygons)
+
+        # Точная перепроверка сомнительных отрезков
+        recheck = np.flatnonzero(uncertain & ~blocked)
+        if len(recheck):
+            blocked[recheck] = ~self._visible_exact(starts[recheck], ends[recheck], polygons)
+
+        return ~blocked
+
+    def _check_sides(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        blocked: np.ndarray,
+        uncertain: np.ndarray,
+        polygons: np.ndarray | None
+    ) -> None:
+        """Поиск пересечений отрезков со сторонами многоугольников"""
+
+        lines = shapely.linestrings(np.stack((starts, ends), axis=1))
+        line_idx, side_idx = self._sides_tree.query(lines)
+
+        if polygons is not None:
+            marked = polygons[self._vertex_polygon[side_idx]]
+            line_idx, side_idx = line_idx[marked], side_idx[marked]
+
+        # Большинство пар отсекается по расположению концов стороны относительно прямой отрезка
+        px, py = starts[line_idx, 0], starts[line_idx, 1]
+        qx, qy = ends[line_idx, 0], ends[line_idx, 1]
+        ax, ay = self._sides_x0[side_idx], self._sides_y0[side_idx]
+        bx, by = self._sides_x1[side_idx], self._sides_y1[side_idx]
+
+        o1, o1_sure = _orientation_xy(px, py, qx, qy, ax, ay)
+        o2, o2_sure = _orientation_xy(px, py, qx, qy, bx, by)
+
+        rest = np.flatnonzero(~(o1_sure & o2_sure & (np.sign(o1) == np.sign(o2))))
+
+        line_idx = line_idx[rest]
+        px, py, qx, qy = px[rest], py[rest], qx[rest], qy[rest]
+        ax, ay, bx, by = ax[rest], ay[rest], bx[rest], by[rest]
+        o1, o1_sure, o2, o2_sure = o1[rest], o1_sure[rest], o2[rest], o2_sure[rest]
+
+        o3, o3_sure = _orientation_xy(ax, ay, bx, by, px, py)
+        o4, o4_sure = _orientation_xy(ax, ay, bx, by, qx, qy)
+
+        # Отрезок и сторона заведомо не пересекаются
+        apart = o3_sure & o4_sure & (np.sign(o3) == np.sign(o4))
+
+        # Собственное пересечение во внутренних точках отрезка и стороны
+        sure = o1_sure & o2_sure & o3_sure & o4_sure
+        crossing = sure & (np.sign(o1) != np.sign(o2)) & (np.sign(o3) != np.sign(o4))
+        blocked[line_idx[crossing]] = True
+
+        # Отрезок и сторона с общей вершиной, не лежащие на одной прямой, касаются только в ней.
+        # Такое касание проверяется по внутреннему углу многоугольника при вершине
+        a_is_end = ((ax == px) & (ay == py)) | ((ax == qx) & (ay == qy))
+        b_is_end = ((bx == px) & (by == py)) | ((bx == qx) & (by == qy))
+        shared = (a_is_end & o2_sure) | (b_is_end & o1_sure)
+
+        uncertain[line_idx[~(apart | crossing | shared)]] = True
+
+    def _check_endpoints(
+        self,
+        points: np.ndarray,
+        others: np.ndarray,
+        blocked: np.ndarray,
+        uncertain: np.ndarray,
+        polygons: np.ndarray | None
+    ) -> None:
+        """Проверка направления отрезка в его конечной точке `points[i]` в сторону `others[i]`"""
+
+        unique_points, inverse = np.unique(points, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        # Вершины многоугольников, совпадающие с конечными точками
+        occurrences = [self._vertex_lookup.get(point, ()) for point in map(tuple, unique_points.tolist())]
+        if polygons is not None:
+            occurrences = [
+                [idx for idx in occurrence if polygons[self._vertex_polygon[idx]]] for occurrence in occurrences
+            ]
+        counts = np.fromiter(map(len, occurrences), dtype=np.int64, count=len(occurrences))
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        vertex_idx = np.fromiter(
+            (idx for occurrence in occurrences for idx in occurrence),
+            dtype=np.int64,
+            count=int(offsets[-1])
+        )
+
+        # Конечные точки, которые не являются вершинами, не должны лежать внутри зон
+        is_vertex = counts[inverse] > 0
+        free = np.flatnonzero(~is_vertex)
+        if len(free):
+            free_points = shapely.points(points[free])
+            point_idx, polygon_idx = self._polygon_tree.query(free_points)
+            if polygons is not None:
+                marked = polygons[polygon_idx]
+                point_idx, polygon_idx = point_idx[marked], polygon_idx[marked]
+            inside = shapely.contains_xy(
+                self._polygons[polygon_idx],
+                points[free[point_idx], 0],
+                points[free[point_idx], 1]
+            )
+            blocked[free[point_idx[inside]]] = True
+
+        # Сопоставление каждой конечной точки со всеми вхождениями вершины в кольца
+        line_counts = counts[inverse]
+        line_idx = np.repeat(np.arange(len(points)), line_counts)
+        position = np.arange(len(line_idx)) - np.repeat(np.cumsum(line_counts) - line_counts, line_counts)
+        vertex = vertex_idx[np.repeat(offsets[inverse], line_counts) + position]
+
+        v = self._vertices[vertex]
+        after = self._vertex_next[vertex]
+        before = self._vertex_prev[vertex]
+        target = others[line_idx]
+
+        # Внутренний угол многоугольника при вершине - поворот против часовой стрелки
+        # от стороны к следующей вершине до стороны к предыдущей
+        turn, turn_sure = _orientation(v, after, before)
+        left_of_after, after_sure = _orientation(v, after, target)
+        right_of_before, before_sure = _orientation(v, target, before)
+
+        inside = np.where(
+            turn > 0,
+            (left_of_after > 0) & (right_of_before > 0),
+            (left_of_after > 0) | (right_of_before > 0)
+        )
+
+        sure = turn_sure & after_sure & before_sure
+        blocked[line_idx[sure & inside]] = True
+        uncertain[line_idx[~sure]] = True
+
+    def _visible_exact(self, starts: np.ndarray, ends: np.ndarray, polygons: np.ndarray | None) -> np.ndarray:
+        """Точная проверка отрезков предикатами GEOS"""
+
+        lines = shapely.linestrings(np.stack((starts, ends), axis=1))
+        line_idx, polygon_idx = self._polygon_tree.query(lines)
+
+        if polygons is not None:
+            marked = polygons[polygon_idx]
+            line_idx, polygon_idx = line_idx[marked], polygon_idx[marked]
+
+        lines = lines[line_idx]
+        polygons = self._polygons[polygon_idx]
+
+        # Внутренности пересекаются, если геометрии пересекаются, но не только касаются
+        blocked = shapely.intersects(polygons, lines) & ~shapely.touches(polygons, lines)
+
+        mask = np.ones(len(starts), dtype=bool)
+        mask[line_idx[blocked]] = False
+
+        return mask
+
+
+def filter_visible_edges(edges: Iterable[Edge], zone: MultiPolygon) -> set[Edge]:
+    """Функция для отбора тех ребер, которые не пересекают зону и не входят в нее"""
+
+    return EdgeFilter(zone).filter(edges)
+
+
+ZoneVertices = NamedTuple(
+    "ZoneVertices",
+    [
+        ("coords", np.ndarray),
+        ("prev", np.ndarray),
+        ("next", np.ndarray)
+    ]
+)
+
+
+def convex_vertices(zone: MultiPolygon) -> ZoneVertices:
+    """
+    Функция для отбора вершин внешних колец зоны, через которые может проходить кратчайший маршрут.
+
+    Кратчайший путь в обход препятствий изгибается только в выпуклых вершинах,
+    поэтому вогнутые вершины, замыкающие координаты колец и вершины, лежащие внутри других
+    многоугольников зоны, в граф не добавляются. Вершина отбрасывается, только если знак поворота
+    в ней вычислен достоверно, поэтому точки на прямых участках остаются.
+    Вместе с вершинами возвращаются соседние с ними вершины колец
+    """
+
+    # Внешние кольца против часовой стрелки: у выпуклой вершины поворот положительный
+    polygons = _oriented_polygons(zone)
+    coords, ring_idx = shapely.get_coordinates(shapely.get_exterior_ring(polygons), return_index=True)
+
+    # Замыкающая координата кольца повторяет первую
+    is_last = np.append(ring_idx[1:] != ring_idx[:-1], True)
+    vertices = coords[~is_last]
+    prev_idx, next_idx = _ring_neighbours(ring_idx[~is_last])
+    prev, next = vertices[prev_idx], vertices[next_idx]
+
+    # Вершина отбрасывается, только если она заведомо не выпуклая
+    turn, turn_sure = _orientation(prev, vertices, next)
+    convex = (turn > 0) | ~turn_sure
+    vertices, prev, next = vertices[convex], prev[convex], next[convex]
+
+    # Вершины, лежащие внутри других многоугольников зоны
+    outside = ~shapely.contains_xy(zone, vertices[:, 0], vertices[:, 1])
+    vertices, prev, next = vertices[outside], prev[outside], next[outside]
+
+    # Многоугольники могут касаться друг друга в общих вершинах.
+    # У таких вершин несколько пар соседей, поэтому соседи не указываются
+    _, first_idx, inverse, counts = np.unique(
+        vertices,
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+        return_counts=True
+    )
+    shared = counts[inverse.reshape(-1)] > 1
+
+    first_idx = np.sort(first_idx)
+    vertices, prev, next, shared = vertices[first_idx], prev[first_idx], next[first_idx], shared[first_idx]
+    prev[shared] = np.nan
+    next[shared] = np.nan
+
+    return ZoneVertices(vertices, prev, next)
+
+
+def tangent_mask(points: np.ndarray, prev: np.ndarray, next: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """
+    Функция для отбора отрезков `points[i] -> others[i]`, прямые которых касаются многоугольника в вершине `points[i]`.
+
+    Кратчайший путь в обход препятствий проходит только по касательным к ним отрезкам:
+    если соседние вершины кольца `prev[i]` и `next[i]` лежат по разные стороны от прямой,
+    путь через вершину можно сократить. Для вершин без указанных соседей отрезок считается касательным
+    """
+
+    o_prev, prev_sure = _orientation(points, others, prev)
+    o_next, next_sure = _orientation(points, others, next)
+
+    return ~(prev_sure & next_sure & (np.sign(o_prev) != np.sign(o_next)))
+
+
+def vertex_pairs(count: int, block_size: int = 2_000_000) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Функция для перебора всех пар индексов вершин `i < j` блоками ограниченного размера"""
+
+    rows = max(1, block_size // max(count, 1))
+
+    for row_start in range(0, count, rows):
+        u = np.arange(row_start, min(row_start + rows, count))
+        v = np.arange(row_start + 1, count)
+
+        u, v = np.meshgrid(u, v, indexing="ij")
+        upper = v > u
+
+        yield u[upper], v[upper]
+
+
+def tangent_pairs(
+    points: np.ndarray,
+    prev: np.ndarray,
+    next: np.ndarray,
+    block_size: int = 2_000_000
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Функция для перебора блоками пар индексов вершин `i < j`, отрезок между которыми может касаться
+    многоугольников в обеих вершинах.
+
+    Прямая касается многоугольника в вершине, если ее направление (по модулю π) лежит вне угла между
+    направлениями на соседние вершины кольца, то есть в дуге длиной `π - угол`. Касательный отрезок
+    возможен только между вершинами с пересекающимися дугами, а две дуги пересекаются, если начало одной
+    из них лежит в другой. Начала дуг сортируются, и для каждой вершины двоичным поиском находятся вершины,
+    начала дуг которых лежат в ее дуге, - без перебора всех O(n²) пар.
+
+    Дуги расширяются с запасом, поэтому перебор содержит все пары, которые пропускает `tangent_mask`.
+    Вершинам без указанных соседей соответствует полная дуга
+    """
+
+    count = len(points)
+    if count == 0:
+        return
+
+    prev_angle = np.arctan2(prev[:, 1] - points[:, 1], prev[:, 0] - points[:, 0])
+    next_angle = np.arctan2(next[:, 1] - points[:, 1], next[:, 0] - points[:, 0])
+
+    # Угол между направлениями на соседей и направление, от которого он отсчитывается против часовой стрелки
+    turn = np.mod(next_angle - prev_angle, 2 * np.pi)
+    inner = np.minimum(turn, 2 * np.pi - turn)
+    inner_start = np.where(turn <= np.pi, prev_angle, next_angle)
+
+    starts = np.mod(inner_start + inner - _TANGENT_ANGLE_TOLERANCE, np.pi)
+    lengths = np.pi - inner + 2 * _TANGENT_ANGLE_TOLERANCE
+
+    # Без соседей (или с совпадающими с вершиной соседями) касательной считается любая прямая
+    degenerate = (
+        ~np.isfinite(lengths) |
+        (lengths >= np.pi) |
+        np.all(prev == points, axis=1) |
+        np.all(next == points, axis=1)
+    )
+    starts[degenerate] = 0.0
+    lengths[degenerate] = np.pi
+    ends = starts + lengths
+
+    # Начала дуг дважды: второй раз сдвинутые на π, чтобы дуги, переходящие через π, занимали один диапазон
+    order = np.argsort(starts, kind="stable")
+    doubled_starts = np.concatenate([starts[order], starts[order] + np.pi])
+
+    lo = np.searchsorted(doubled_starts, starts, side="left")
+    hi = np.minimum(np.searchsorted(doubled_starts, ends, side="right"), lo + count)
+    row_ends = np.cumsum(hi - lo)
+
+    row_start = 0
+    while row_start < count:
+        offset = row_ends[row_start - 1] if row_start else 0
+        row_end = max(row_start + 1, int(np.searchsorted(row_ends, offset + block_size, side="right")))
+
+        rows = np.arange(row_start, row_end)
+        sizes = hi[rows] - lo[rows]
+        u = np.repeat(rows, sizes)
+        positions = np.arange(len(u)) - np.repeat(np.cumsum(sizes) - sizes - lo[rows], sizes)
+        v = order[positions % count]
+
+        # Если начало дуги `u` тоже лежит в дуге `v`, пара найдена дважды и остается при `u < v`.
+        # Проверка повторяет сравнения двоичного поиска, чтобы пара не пропала из-за округления
+        reverse = (
+            ((starts[v] <= starts[u]) & (starts[u] <= ends[v])) |
+            ((starts[v] <= starts[u] + np.pi) & (starts[u] + np.pi <= ends[v]))
+        )
+        unique = (u != v) & (~reverse | (u < v))
+        u, v = u[unique], v[unique]
+
+        yield np.minimum(u, v), np.maximum(u, v)
+
+        row_start = row_end
+
+
+def _oriented_polygons(zone: MultiPolygon) -> np.ndarray:
+    """Многоугольники зоны с внешними кольцами против часовой стрелки и внутренними по часовой"""
+
+    return np.array([orient(polygon) for polygon in shapely.get_parts(zone)], dtype=object)
+
+
+def _ring_neighbours(ring_idx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Индексы предыдущих и следующих вершин в порядке обхода колец"""
+
+    ring_start = np.searchsorted(ring_idx, ring_idx, side="left")
+    ring_end = np.searchsorted(ring_idx, ring_idx, side="right")
+    position = np.arange(len(ring_idx))
+
+    prev_idx = np.where(position == ring_start, ring_end - 1, position - 1)
+    next_idx = np.where(position + 1 == ring_end, ring_start, position + 1)
+
+    return prev_idx, next_idx
+
+
+def _orientation(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Ориентация троек точек (положительная - поворот против часовой стрелки)
+    и признак того, что знак ориентации вычислен достоверно
+    """
+
+    return _orientation_xy(a[:, 0], a[:, 1], b[:, 0], b[:, 1], c[:, 0], c[:, 1])
+
+
+def _orientation_xy(
+    ax: np.ndarray,
+    ay: np.ndarray,
+    bx: np.ndarray,
+    by: np.ndarray,
+    cx: np.ndarray,
+    cy: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    left = (bx - ax) * (cy - ay)
+    right = (by - ay) * (cx - ax)
+    orientation = left - right
+
+    sure = np.abs(orientation) > _ORIENTATION_TOLERANCE * (np.abs(left) + np.abs(right))
+
+    return orientation, sure
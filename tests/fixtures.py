@@ -0,0 +1,102 @@
+import json
+from typing import Any, Sequence
+
+import numpy as np
+import shapely
+from shapely import MultiPolygon, Point, Polygon
+
+
+START_POINT = Point(73.35857, 54.99629)
+FINISH_POINT = Point(82.88871, 54.98093)
+
+RESTRICTED_POLYGONS = MultiPolygon([
+    Polygon([(78.36354, 53.97930), (78.46006, 52.86596), (81.67985, 52.89925), (81.58333, 55.05971)])
+])
+BUFFER_DISTANCE = 1000
+
+# Точка внутри запретной зоны, маршрут от которой проложить невозможно
+POINT_IN_ZONE = Point(80, 54)
+
+
+def star_zones(
+    polygon_count: int,
+    vertices_per_polygon: int = 10,
+    convex: bool = False,
+    holes: bool = False,
+    clustered: bool = False,
+    seed: int = 0
+) -> MultiPolygon:
+    """
+    Объединение случайных звездчатых зон внутри прямоугольника (71, 51) - (87, 57.5).
+
+    При `convex` вершины зоны лежат на окружности, при `holes` в каждой зоне есть квадратное отверстие,
+    при `clustered` центры зон собраны в одну группу, и зоны перекрываются
+    """
+
+    rng = np.random.default_rng(seed)
+    low, high = ((77.0, 53.0), (81.0, 55.5)) if clustered else ((72.0, 52.0), (86.0, 56.5))
+    polygons = []
+
+    for center in rng.uniform(low, high, (polygon_count, 2)):
+        # Смещение углов не больше 0.4 шага оставляет отверстие внутри наименьшего радиуса зоны
+        step = 2 * np.pi / vertices_per_polygon
+        angles = (np.arange(vertices_per_polygon) + rng.uniform(-0.4, 0.4, vertices_per_polygon)) * step
+        radii = np.full(vertices_per_polygon, 0.8) if convex else rng.uniform(0.4, 0.8, vertices_per_polygon)
+        ring = center + np.column_stack((np.cos(angles), np.sin(angles))) * radii[:, None]
+        hole = [center + offset for offset in ((-0.1, -0.1), (-0.1, 0.1), (0.1, 0.1), (0.1, -0.1))]
+        polygons.append(Polygon(ring, [hole] if holes else None))
+
+    return MultiPolygon([part for part in shapely.get_parts(shapely.union_all(polygons)) if isinstance(part, Polygon)])
+
+
+def feature(geometry: Any, **properties: Any) -> dict[str, Any]:
+    """Feature GeoJSON с геометрией shapely"""
+
+    return {"type": "Feature", "geometry": geometry.__geo_interface__, "properties": properties}
+
+
+def feature_collection(
+    points: Sequence[tuple[str, Point]],
+    restricted_polygons: MultiPolygon | None = RESTRICTED_POLYGONS,
+    buffer_distance: float | None = BUFFER_DISTANCE
+) -> str:
+    """FeatureCollection с именованными точками и запретными зонами"""
+
+    features = [feature(point, name=name) for name, point in points]
+
+    if restricted_polygons is not None:
+        properties: dict[str, Any] = {"name": "restricted_polygons"}
+        if buffer_distance is not None:
+            properties["buffer_distance"] = buffer_distance
+        features.append(feature(restricted_polygons, **properties))
+
+    return json.dumps({"type": "FeatureCollection", "features": features})
+
+
+def route_request(
+    start_point: Point = START_POINT,
+    finish_point: Point = FINISH_POINT,
+    restricted_polygons: MultiPolygon | None = RESTRICTED_POLYGONS,
+    buffer_distance: float | None = BUFFER_DISTANCE
+) -> str:
+    """GeoJSON запроса маршрута в формате `find_optimal_route_with_geojson`"""
+
+    return feature_collection(
+        [("start_point", start_point), ("finish_point", finish_point)], restricted_polygons, buffer_distance
+    )
+
+
+def batch_request(
+    pairs: Sequence[tuple[Point, Point]],
+    restricted_polygons: MultiPolygon | None = RESTRICTED_POLYGONS,
+    buffer_distance: float | None = BUFFER_DISTANCE
+) -> str:
+    """GeoJSON запроса нескольких маршрутов в формате `find_optimal_routes_with_geojson`"""
+
+    points = [("start_point", start_point) for start_point, _ in pairs]
+    points += [("finish_point", finish_point) for _, finish_point in pairs]
+
+    return feature_collection(points, restricted_polygons, buffer_distance)
+
+
+ROUTE_REQUEST = route_request()
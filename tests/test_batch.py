@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from optimal_route.batch import run_batch
+from tests.fixtures import ROUTE_REQUEST
+
+
+MALFORMED_LINES = ["[1,2]", "42", '"text"', "{not json", '{"type":"FeatureCollection","features":[1]}']
+
+
+@pytest.mark.parametrize("fast_io", [False, True])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_malformed_lines_become_error_features(fast_io: bool, workers: int) -> None:
+    lines = [ROUTE_REQUEST, *MALFORMED_LINES, ROUTE_REQUEST]
+    output: list[str] = []
+
+    count = run_batch(lines, output.append, workers, fast_io=fast_io)
+
+    assert count == len(lines)
+    features = [json.loads(line) for line in output]
+
+    for feature in (features[0], features[-1]):
+        assert feature["geometry"]["type"] == "LineString"
+        assert feature["properties"] == {}
+
+    for feature in features[1:-1]:
+        assert feature["geometry"] is None
+        assert feature["properties"]["error"]
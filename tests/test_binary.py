@@ -0,0 +1,139 @@
+from typing import Any, Callable
+
+import numpy as np
+import pytest
+import shapely
+from pyproj import Geod
+from shapely import GeometryType, LineString, MultiPolygon, Point, box
+
+from optimal_route.engine import RouteEngine
+from optimal_route.main import find_optimal_routes_with_geoarrow, find_optimal_routes_with_wkb
+from optimal_route.utils.binary import (
+    geodesic_lengths, points_from_geoarrow, points_from_wkb, routes_to_geoarrow, routes_to_wkb, zone_from_geoarrow,
+    zone_from_wkb
+)
+from tests.fixtures import BUFFER_DISTANCE, FINISH_POINT, POINT_IN_ZONE, RESTRICTED_POLYGONS, START_POINT
+
+
+# Вторая зона частично перекрывает первую
+OVERLAPPING_ZONE = box(81, 54.5, 82, 55.5)
+ZONE = shapely.union_all([RESTRICTED_POLYGONS, OVERLAPPING_ZONE])
+
+START_POINTS = [START_POINT, Point(74, 52), POINT_IN_ZONE, FINISH_POINT]
+FINISH_POINTS = [FINISH_POINT, Point(75, 52.5), FINISH_POINT, START_POINT]
+
+GEOD = Geod(ellps="WGS84")
+
+
+def expected_routes() -> list[LineString | None]:
+    engine = RouteEngine(MultiPolygon(shapely.get_parts(ZONE).tolist()), BUFFER_DISTANCE)
+    return [
+        None if start_point == POINT_IN_ZONE else engine.find_route(start_point, finish_point)
+        for start_point, finish_point in zip(START_POINTS, FINISH_POINTS)
+    ]
+
+
+def assert_expected_results(routes: list[LineString | None], lengths: np.ndarray, errors: list[str | None]) -> None:
+    for route, expected, length, error in zip(routes, expected_routes(), lengths, errors):
+        if expected is None:
+            assert route is None or route.is_empty
+            assert np.isnan(length)
+            assert error
+        else:
+            assert route is not None and route.equals_exact(expected, 1e-9)
+            assert length == pytest.approx(GEOD.geometry_length(expected), rel=1e-9)
+            assert error is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_wkb_routes_match_engine_routes(workers: int) -> None:
+    zones = shapely.to_wkb([RESTRICTED_POLYGONS, OVERLAPPING_ZONE])
+
+    results = find_optimal_routes_with_wkb(
+        shapely.to_wkb(START_POINTS), shapely.to_wkb(FINISH_POINTS), zones, BUFFER_DISTANCE, workers
+    )
+
+    assert len(results.routes) == len(START_POINTS)
+    assert_expected_results(list(shapely.from_wkb(results.routes)), results.lengths, results.errors)
+
+
+def test_wkb_zone_in_one_geometry() -> None:
+    zone = zone_from_wkb(shapely.to_wkb(ZONE))
+
+    assert zone.equals(zone_from_wkb(shapely.to_wkb([RESTRICTED_POLYGONS, OVERLAPPING_ZONE])))
+    assert zone.equals(ZONE)
+    assert zone_from_wkb([None]).is_empty
+
+
+@pytest.mark.parametrize("interleaved", [True, False])
+def test_geoarrow_routes_match_engine_routes(interleaved: bool) -> None:
+    start_coords, finish_coords = shapely.get_coordinates(START_POINTS), shapely.get_coordinates(FINISH_POINTS)
+    if not interleaved:
+        start_coords, finish_coords = tuple(start_coords.T), tuple(finish_coords.T)
+
+    # Зоны в раскладке Polygon: отдельные многоугольники объединяются
+    _, zone_coords, zone_offsets = shapely.to_ragged_array([*RESTRICTED_POLYGONS.geoms, OVERLAPPING_ZONE])
+
+    results = find_optimal_routes_with_geoarrow(
+        start_coords, finish_coords, (zone_coords, zone_offsets), BUFFER_DISTANCE
+    )
+
+    routes = shapely.from_ragged_array(GeometryType.LINESTRING, results.coords, (results.offsets,))
+    assert results.offsets.dtype == np.int64
+    assert_expected_results(list(routes), results.lengths, results.errors)
+
+
+def test_geoarrow_multipolygon_zone() -> None:
+    geometry_type, coords, offsets = shapely.to_ragged_array([MultiPolygon([OVERLAPPING_ZONE]), RESTRICTED_POLYGONS])
+
+    assert geometry_type == GeometryType.MULTIPOLYGON
+    assert zone_from_geoarrow(coords, offsets).equals(ZONE)
+
+
+def test_empty_binary_input() -> None:
+    wkb_results = find_optimal_routes_with_wkb([], [], shapely.to_wkb(ZONE))
+    geoarrow_results = find_optimal_routes_with_geoarrow(np.empty((0, 2)), (np.empty(0), np.empty(0)))
+
+    assert len(wkb_results.routes) == 0 and len(wkb_results.lengths) == 0 and wkb_results.errors == []
+    assert geoarrow_results.coords.shape == (0, 2)
+    assert list(geoarrow_results.offsets) == [0]
+    assert len(geoarrow_results.lengths) == 0 and geoarrow_results.errors == []
+
+
+def test_missing_routes() -> None:
+    assert list(routes_to_wkb([None, None])) == [None, None]
+
+    coords, offsets = routes_to_geoarrow([None, None])
+    assert coords.shape == (0, 2)
+    assert list(offsets) == [0, 0, 0]
+
+    assert np.isnan(geodesic_lengths([None, None])).all()
+
+    route = LineString([START_POINT, FINISH_POINT])
+    lengths = geodesic_lengths([None, route, None])
+    assert np.isnan(lengths[[0, 2]]).all()
+    assert lengths[1] == pytest.approx(GEOD.geometry_length(route))
+
+
+@pytest.mark.parametrize(
+    "read",
+    [
+        lambda: points_from_wkb([b"not wkb"]),
+        lambda: points_from_wkb(shapely.to_wkb([RESTRICTED_POLYGONS])),
+        lambda: points_from_wkb(shapely.to_wkb([Point()])),
+        lambda: points_from_wkb(shapely.to_wkb([Point(np.inf, 1)])),
+        lambda: points_from_geoarrow(np.zeros((2, 3))),
+        lambda: points_from_geoarrow(np.array([[1.0, np.nan]])),
+        lambda: zone_from_wkb(shapely.to_wkb(START_POINT)),
+        lambda: zone_from_geoarrow(np.zeros((4, 2)), [np.array([0, 4])]),
+        lambda: find_optimal_routes_with_wkb(shapely.to_wkb(START_POINTS), shapely.to_wkb(FINISH_POINTS[:2])),
+        lambda: find_optimal_routes_with_geoarrow(np.zeros((2, 2)), np.zeros((3, 2)))
+    ],
+    ids=[
+        "bad-wkb", "polygon-points", "empty-point", "infinite-wkb", "three-columns", "nan-geoarrow", "point-zone",
+        "line-offsets", "wkb-lengths", "geoarrow-lengths"
+    ]
+)
+def test_invalid_binary_input_raises_value_error(read: Callable[[], Any]) -> None:
+    with pytest.raises(ValueError):
+        read()
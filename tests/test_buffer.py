@@ -0,0 +1,80 @@
+from collections import OrderedDict
+
+import pytest
+from pyproj import Geod
+from shapely import MultiPolygon, Point, Polygon, box
+
+import optimal_route.utils.buffer as buffer_module
+from optimal_route.utils.buffer import buffer_geometry_in_metres
+from tests.fixtures import RESTRICTED_POLYGONS, star_zones
+
+
+@pytest.fixture(autouse=True)
+def empty_buffered_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(buffer_module, "_buffered_cache", OrderedDict())
+
+
+@pytest.mark.parametrize("latitude", [0, 55, 70])
+def test_buffer_distance_is_in_metres(latitude: float) -> None:
+    zone = box(20, latitude, 20.1, latitude + 0.1)
+    buffered = buffer_geometry_in_metres(zone, 1000)
+
+    geod = Geod(ellps="WGS84")
+    for azimuth, (lon, lat) in [(0, (20.05, latitude + 0.1)), (90, (20.1, latitude + 0.05)), (180, (20.05, latitude))]:
+        inside_lon, inside_lat, _ = geod.fwd(lon, lat, azimuth, 990)
+        outside_lon, outside_lat, _ = geod.fwd(lon, lat, azimuth, 1010)
+
+        assert buffered.contains(Point(inside_lon, inside_lat))
+        assert not buffered.contains(Point(outside_lon, outside_lat))
+
+
+def test_overlapping_buffers_are_merged() -> None:
+    # Промежуток между многоугольниками около 700 м меньше двух расстояний буферизации
+    zone = MultiPolygon([box(80, 55, 80.1, 55.1), box(80.111, 55, 80.2, 55.1), box(81, 55, 81.1, 55.1)])
+    buffered = buffer_geometry_in_metres(zone, 1000)
+
+    assert isinstance(buffered, MultiPolygon)
+    assert len(buffered.geoms) == 2
+    assert buffered.is_valid
+    assert buffered.contains(zone)
+
+
+def test_parallel_buffering_matches_sequential() -> None:
+    zone = star_zones(12, seed=3)
+
+    sequential = buffer_geometry_in_metres(zone, 2000, cache=False)
+    parallel = buffer_geometry_in_metres(zone, 2000, workers=4, cache=False)
+
+    assert parallel.equals_exact(sequential, 0)
+
+
+def test_buffered_zones_are_cached_by_content() -> None:
+    buffered = buffer_geometry_in_metres(RESTRICTED_POLYGONS, 1000)
+
+    # Та же геометрия в другом объекте
+    same_zone = MultiPolygon([Polygon(RESTRICTED_POLYGONS.geoms[0].exterior.coords)])
+    assert buffer_geometry_in_metres(same_zone, 1000.0) is buffered
+
+    assert buffer_geometry_in_metres(RESTRICTED_POLYGONS, 2000) is not buffered
+    assert buffer_geometry_in_metres(RESTRICTED_POLYGONS, 1000, "GRS80") is not buffered
+
+
+def test_uncached_buffering_skips_cache() -> None:
+    buffered = buffer_geometry_in_metres(RESTRICTED_POLYGONS, 1000, cache=False)
+
+    assert not buffer_module._buffered_cache
+    assert buffer_geometry_in_metres(RESTRICTED_POLYGONS, 1000, cache=False) is not buffered
+    assert buffer_geometry_in_metres(RESTRICTED_POLYGONS, 1000) is not buffered
+
+
+def test_buffered_cache_evicts_least_recently_used(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(buffer_module, "_BUFFERED_CACHE_SIZE", 2)
+
+    first = buffer_geometry_in_metres(RESTRICTED_POLYGONS, 1000)
+    second = buffer_geometry_in_metres(RESTRICTED_POLYGONS, 2000)
+    assert buffer_geometry_in_metres(RESTRICTED_POLYGONS, 1000) is first
+
+    buffer_geometry_in_metres(RESTRICTED_POLYGONS, 3000)
+
+    assert buffer_geometry_in_metres(RESTRICTED_POLYGONS, 1000) is first
+    assert buffer_geometry_in_metres(RESTRICTED_POLYGONS, 2000) is not second
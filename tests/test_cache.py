@@ -0,0 +1,151 @@
+import pytest
+import shapely
+from shapely import MultiPolygon, Point
+
+from optimal_route import cache as cache_module
+from optimal_route.cache import MemoryRouteCache, RouteCacheStats, SqliteRouteCache, route_fingerprint
+from optimal_route.main import find_optimal_route, find_optimal_route_with_geojson
+from tests.fixtures import BUFFER_DISTANCE, FINISH_POINT, RESTRICTED_POLYGONS, ROUTE_REQUEST, START_POINT
+
+
+class Clock:
+    """Подменяемое время для проверки устаревания записей"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request: pytest.FixtureRequest, tmp_path):
+    caches = []
+
+    def make_cache(maxsize: int | None = None, ttl: float | None = None):
+        if request.param == "memory":
+            route_cache = MemoryRouteCache(maxsize or 1024, ttl)
+        else:
+            route_cache = SqliteRouteCache(tmp_path / f"routes{len(caches)}.sqlite", maxsize, ttl)
+        caches.append(route_cache)
+        return route_cache
+
+    yield make_cache
+
+    for route_cache in caches:
+        if isinstance(route_cache, SqliteRouteCache):
+            route_cache.close()
+
+
+def test_get_and_set(make_cache) -> None:
+    route_cache = make_cache()
+
+    assert route_cache.get("a") is None
+    route_cache.set("a", "route")
+
+    assert route_cache.get("a") == "route"
+    assert route_cache.stats == RouteCacheStats(hits=1, misses=1, evictions=0)
+
+
+def test_least_recently_used_entries_are_evicted(make_cache, clock: Clock) -> None:
+    route_cache = make_cache(maxsize=2)
+
+    route_cache.set("a", "1")
+    clock.now += 1
+    route_cache.set("b", "2")
+    clock.now += 1
+    assert route_cache.get("a") == "1"
+    clock.now += 1
+    route_cache.set("c", "3")
+
+    assert route_cache.get("b") is None
+    assert route_cache.get("a") == "1"
+    assert route_cache.get("c") == "3"
+    assert route_cache.stats.evictions == 1
+
+
+def test_expired_entries_are_evicted(make_cache, clock: Clock) -> None:
+    route_cache = make_cache(ttl=10)
+
+    route_cache.set("a", "1")
+    clock.now += 5
+    assert route_cache.get("a") == "1"
+
+    clock.now += 6
+    assert route_cache.get("a") is None
+    assert route_cache.stats == RouteCacheStats(hits=1, misses=1, evictions=1)
+
+
+def test_sqlite_cache_persists_between_connections(tmp_path) -> None:
+    path = tmp_path / "routes.sqlite"
+
+    route_cache = SqliteRouteCache(path)
+    route_cache.set("a", "route")
+    route_cache.close()
+
+    route_cache = SqliteRouteCache(path)
+    assert route_cache.get("a") == "route"
+    route_cache.close()
+
+
+def test_fingerprint_ignores_zone_order_and_number_types() -> None:
+    zone = MultiPolygon([RESTRICTED_POLYGONS.geoms[0], shapely.Polygon([(70, 50), (71, 50), (71, 51)])])
+    reordered = MultiPolygon(zone.geoms[::-1])
+
+    assert (
+        route_fingerprint(START_POINT, FINISH_POINT, zone, 1000) ==
+        route_fingerprint(START_POINT, FINISH_POINT, reordered, 1000.0)
+    )
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"finish_point": Point(82.88872, 54.98093)},
+        {"buffer_distance": 2000},
+        {"graph_builder": "tangent"},
+        {"simplify_tolerance": 100},
+        {"output": "geojson"}
+    ]
+)
+def test_fingerprint_depends_on_parameters(changes: dict) -> None:
+    parameters = {
+        "start_point": START_POINT,
+        "finish_point": FINISH_POINT,
+        "restricted_polygons": RESTRICTED_POLYGONS,
+        "buffer_distance": BUFFER_DISTANCE
+    }
+
+    assert route_fingerprint(**parameters) != route_fingerprint(**parameters | changes)
+
+
+@pytest.mark.parametrize("fast_io", [False, True])
+def test_geojson_hit_returns_stored_response(fast_io: bool) -> None:
+    route_cache = MemoryRouteCache()
+
+    response = find_optimal_route_with_geojson(ROUTE_REQUEST, route_cache, fast_io)
+
+    assert find_optimal_route_with_geojson(ROUTE_REQUEST, route_cache, not fast_io) == response
+    assert route_cache.stats.hits == 1
+
+
+def test_route_hit_returns_same_route() -> None:
+    route_cache = MemoryRouteCache()
+
+    route = find_optimal_route(START_POINT, FINISH_POINT, RESTRICTED_POLYGONS, BUFFER_DISTANCE, cache=route_cache)
+    cached_route = find_optimal_route(START_POINT, FINISH_POINT, RESTRICTED_POLYGONS, BUFFER_DISTANCE, cache=route_cache)
+
+    assert cached_route.equals_exact(route, 0)
+    assert route_cache.stats.hits == 1
+
+    # Ответ функций, работающих с GeoJSON, хранится под другим ключом
+    find_optimal_route_with_geojson(ROUTE_REQUEST, route_cache)
+    assert route_cache.stats.hits == 1
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from pyproj import Geod
+from shapely import MultiPolygon, Point, box
+
+from optimal_route.engine import RouteEngine
+from optimal_route.main import route_distance_matrix
+from tests.fixtures import BUFFER_DISTANCE, FINISH_POINT, POINT_IN_ZONE, RESTRICTED_POLYGONS, START_POINT
+
+
+# Запретная зона и многоугольник с отверстием, в котором находится точка
+HOLE_ZONE = MultiPolygon([
+    *RESTRICTED_POLYGONS.geoms,
+    box(76, 56, 78, 58).difference(box(76.5, 56.5, 77.5, 57.5))
+])
+POINT_IN_HOLE = Point(77, 57)
+
+ORIGINS = [START_POINT, Point(73, 52), POINT_IN_ZONE, POINT_IN_HOLE, Point(80, 57)]
+DESTINATIONS = [FINISH_POINT, Point(84, 53), START_POINT, POINT_IN_HOLE, Point(77, 59)]
+
+GEOD = Geod(ellps="WGS84")
+
+
+@pytest.mark.parametrize("graph_builder", ["visibility", "tangent", "lazy"])
+def test_distance_matrix_matches_pairwise_routes(graph_builder: str) -> None:
+    matrix = route_distance_matrix(
+        ORIGINS, DESTINATIONS, HOLE_ZONE, BUFFER_DISTANCE, graph_builder=graph_builder, return_routes=True
+    )
+    engine = RouteEngine(HOLE_ZONE, BUFFER_DISTANCE, graph_builder=graph_builder)
+
+    assert matrix.distances.shape == (len(ORIGINS), len(DESTINATIONS))
+    assert matrix.routes is not None
+
+    for i, origin in enumerate(ORIGINS):
+        for j, destination in enumerate(DESTINATIONS):
+            if POINT_IN_ZONE in (origin, destination) or POINT_IN_HOLE in (origin, destination):
+                assert matrix.distances[i, j] == np.inf
+                assert matrix.routes[i][j] is None
+                continue
+
+            route = engine.find_route(origin, destination)
+            assert matrix.distances[i, j] == pytest.approx(GEOD.geometry_length(route), rel=1e-9, abs=1e-6)
+            assert GEOD.geometry_length(matrix.routes[i][j]) == pytest.approx(matrix.distances[i, j], rel=1e-9)
+
+
+def test_distance_matrix_without_routes() -> None:
+    matrix = route_distance_matrix(ORIGINS[:2], DESTINATIONS[:2], HOLE_ZONE, BUFFER_DISTANCE)
+    expected = route_distance_matrix(ORIGINS[:2], DESTINATIONS[:2], HOLE_ZONE, BUFFER_DISTANCE, return_routes=True)
+
+    assert matrix.routes is None
+    assert np.array_equal(matrix.distances, expected.distances)
+
+
+def test_distance_matrix_without_zones_is_geodesic() -> None:
+    matrix = route_distance_matrix(ORIGINS, DESTINATIONS)
+
+    for i, origin in enumerate(ORIGINS):
+        for j, destination in enumerate(DESTINATIONS):
+            _, _, distance = GEOD.inv(origin.x, origin.y, destination.x, destination.y)
+            assert matrix.distances[i, j] == pytest.approx(distance, abs=1e-6)
+
+
+def test_empty_distance_matrix() -> None:
+    matrix = route_distance_matrix([], DESTINATIONS, HOLE_ZONE, return_routes=True)
+
+    assert matrix.distances.shape == (0, len(DESTINATIONS))
+    assert matrix.routes == []
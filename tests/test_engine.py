@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+import shapely
+from shapely import MultiPolygon, Point, Polygon, box
+
+from optimal_route.engine import RouteEngine
+from optimal_route.main import find_optimal_route
+from optimal_route.profiling import RouteProfiler
+from tests.fixtures import (
+    BUFFER_DISTANCE, FINISH_POINT, POINT_IN_ZONE, RESTRICTED_POLYGONS, START_POINT, star_zones
+)
+
+
+BASE_ZONE = star_zones(8, seed=2)
+
+# Зона, перекрывающая одну из исходных зон, и отдельная зона
+OVERLAPPING_ZONE = shapely.buffer(BASE_ZONE.geoms[0].centroid, 1.5, quad_segs=3)
+SEPARATE_ZONE = Polygon([(88.5, 58.5), (89.5, 58.5), (89.5, 59.5), (88.5, 59.5)])
+
+ROUTE_POINTS = [(Point(70.1, 50.1), Point(89.9, 59.9)), (Point(70.1, 59.9), Point(89.9, 50.1))]
+
+
+@pytest.mark.parametrize("graph_builder", ["visibility", "tangent", "lazy"])
+def test_reused_engine_matches_find_optimal_route(graph_builder: str) -> None:
+    stages: list[str] = []
+    profiler = RouteProfiler(lambda name, duration, sizes: stages.append(name))
+    engine = RouteEngine(BASE_ZONE, BUFFER_DISTANCE, graph_builder=graph_builder, profiler=profiler)
+
+    for start_point, finish_point in [*ROUTE_POINTS, (START_POINT, FINISH_POINT), (FINISH_POINT, START_POINT)]:
+        expected = find_optimal_route(
+            start_point, finish_point, BASE_ZONE, BUFFER_DISTANCE, graph_builder=graph_builder
+        )
+        assert engine.find_route(start_point, finish_point, profiler).equals_exact(expected, 1e-9)
+
+    # Зоны буферизуются только при создании движка, а граф строится не больше одного раза
+    assert stages.count("buffering") == 1
+    assert stages.count("graph_construction") <= 1
+
+
+def test_engine_rejects_unreachable_points_and_invalid_input() -> None:
+    engine = RouteEngine(RESTRICTED_POLYGONS, BUFFER_DISTANCE)
+
+    with pytest.raises(ValueError):
+        engine.find_route(START_POINT, POINT_IN_ZONE)
+    with pytest.raises(ValueError):
+        engine.find_route(POINT_IN_ZONE, FINISH_POINT)
+    with pytest.raises(ValueError):
+        RouteEngine(MultiPolygon([Polygon([(70, 50), (72, 52), (72, 50), (70, 52)])]))
+    with pytest.raises(ValueError):
+        RouteEngine(RESTRICTED_POLYGONS, graph_builder="unknown")  # type: ignore[arg-type]
+
+    # После ошибки движок продолжает искать маршруты
+    assert not engine.find_route(START_POINT, FINISH_POINT).crosses(RESTRICTED_POLYGONS)
+
+
+def test_engine_without_zones_returns_direct_route() -> None:
+    route = RouteEngine().find_route(START_POINT, FINISH_POINT)
+
+    assert list(route.coords) == [(START_POINT.x, START_POINT.y), (FINISH_POINT.x, FINISH_POINT.y)]
+
+
+def graph_edges(engine: RouteEngine) -> dict[tuple[tuple[float, float], tuple[float, float]], float]:
+    """Ребра графа по координатам вершин с длинами"""
+
+    engine.compile()
+    graph = engine._graph
+    coords = [tuple(point) for point in np.asarray(engine._vertices_coords).tolist()]
+
+    u = np.repeat(np.arange(len(graph.indptr) - 1), np.diff(graph.indptr))
+    return {
+        (coords[i], coords[j]): weight
+        for i, j, weight in zip(u.tolist(), graph.indices.tolist(), graph.weights.tolist())
+        if coords[i] < coords[j]
+    }
+
+
+def rebuilt_engine(zones: list[Polygon], **parameters) -> RouteEngine:
+    """Движок, построенный заново для зон, перекрывающиеся зоны объединяются"""
+
+    restricted_polygons = MultiPolygon(zones)
+
+    if not restricted_polygons.is_valid:
+        union = shapely.union_all(zones)
+        restricted_polygons = MultiPolygon([part for part in shapely.get_parts(union) if isinstance(part, Polygon)])
+
+    return RouteEngine(restricted_polygons, **parameters)
+
+
+def assert_same_engine(engine: RouteEngine, expected: RouteEngine) -> None:
+    edges, expected_edges = graph_edges(engine), graph_edges(expected)
+
+    assert edges.keys() == expected_edges.keys()
+    assert list(edges.values()) == pytest.approx([expected_edges[edge] for edge in edges])
+
+    for start_point, finish_point in ROUTE_POINTS:
+        route = engine.find_route(start_point, finish_point)
+        assert route.equals_exact(expected.find_route(start_point, finish_point), 1e-9)
+
+
+# Буфер объединения зон отличается от объединения буферов в координатах вершин,
+# поэтому при буферизации добавляются только зоны, не перекрывающие исходные
+@pytest.mark.parametrize(
+    "parameters, added_zones",
+    [
+        ({"graph_builder": "visibility"}, [OVERLAPPING_ZONE, SEPARATE_ZONE]),
+        ({"graph_builder": "tangent"}, [OVERLAPPING_ZONE, SEPARATE_ZONE]),
+        ({"graph_builder": "visibility", "buffer_distance": 5000}, [SEPARATE_ZONE]),
+        ({"graph_builder": "tangent", "simplify_tolerance": 0.05}, [OVERLAPPING_ZONE, SEPARATE_ZONE])
+    ],
+    ids=["visibility", "tangent", "buffered", "simplified"]
+)
+def test_add_and_remove_zone_match_rebuilt_engine(parameters: dict, added_zones: list[Polygon]) -> None:
+    engine = RouteEngine(BASE_ZONE, **parameters)
+    engine.compile()
+    zones = list(BASE_ZONE.geoms)
+
+    zone_ids = [engine.add_zone(zone) for zone in added_zones]
+    assert_same_engine(engine, rebuilt_engine([*zones, *added_zones], **parameters))
+
+    engine.remove_zone(zone_ids[0])
+    engine.remove_zone(1)
+    assert_same_engine(engine, rebuilt_engine([zones[0], *zones[2:], *added_zones[1:]], **parameters))
+
+
+def test_remove_unknown_zone() -> None:
+    engine = RouteEngine(BASE_ZONE)
+
+    with pytest.raises(ValueError):
+        engine.remove_zone(len(BASE_ZONE.geoms))
+
+
+# Стена между точками выходит за начальный коридор, а обходы стены перекрыты зонами вне него.
+# Дальние зоны не попадают в коридор и после его расширения
+CORRIDOR_ZONE = MultiPolygon([
+    box(79.9, 52.0, 80.1, 58.5),
+    box(78.0, 56.6, 78.6, 57.6),
+    box(78.0, 52.4, 78.6, 53.4),
+    box(70.2, 59.2, 70.8, 59.8),
+    box(89.2, 50.2, 89.8, 50.8)
+])
+
+
+@pytest.mark.parametrize("graph_builder", ["visibility", "tangent", "lazy"])
+def test_expanded_corridor_route_matches_full_search(graph_builder: str) -> None:
+    start_point, finish_point = Point(76, 55), Point(84, 55)
+    corridors: list[dict[str, int]] = []
+
+    def callback(name: str, duration: float, sizes: dict[str, int]) -> None:
+        if name == "corridor":
+            corridors.append(sizes)
+
+    route = RouteEngine(CORRIDOR_ZONE, graph_builder=graph_builder).find_route(
+        start_point, finish_point, RouteProfiler(callback), corridor_pruning=True
+    )
+    expected = RouteEngine(CORRIDOR_ZONE, graph_builder=graph_builder).find_route(
+        start_point, finish_point, corridor_pruning=False
+    )
+
+    assert [sizes["kept_zones"] for sizes in corridors] == [1, 3]
+    assert route.equals_exact(expected, 1e-12)
+    assert not route.crosses(CORRIDOR_ZONE)
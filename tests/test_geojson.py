@@ -0,0 +1,235 @@
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+import shapely
+from shapely import LineString, MultiPolygon, Point, box
+
+from optimal_route.main import (
+    find_optimal_route, find_optimal_route_with_geojson, find_optimal_route_with_geojson_stream,
+    parse_route_request, serialize_route
+)
+from optimal_route.utils.buffer import buffer_geometry_in_metres
+from optimal_route.utils.geojson import iter_geojson_features, parse_route_geojson_stream
+from tests.fixtures import (
+    BUFFER_DISTANCE, FINISH_POINT, RESTRICTED_POLYGONS, ROUTE_REQUEST, START_POINT, feature, route_request
+)
+
+
+def modified_request(modify: Any) -> str:
+    """Запрос маршрута, измененный функцией `modify`"""
+
+    data = json.loads(ROUTE_REQUEST)
+    modify(data)
+    return json.dumps(data)
+
+
+def assert_same_search(search: Any, expected: Any) -> None:
+    assert search.start_point.equals_exact(expected.start_point, 0)
+    assert search.finish_point.equals_exact(expected.finish_point, 0)
+    assert search.buffer_distance == expected.buffer_distance
+
+    if expected.restricted_polygons is None:
+        assert search.restricted_polygons is None
+    else:
+        assert search.restricted_polygons.equals_exact(expected.restricted_polygons, 0)
+
+
+@pytest.mark.parametrize(
+    "geojson",
+    [
+        ROUTE_REQUEST,
+        route_request(restricted_polygons=None),
+        route_request(buffer_distance=None),
+        # Прочие объекты и ключи, bbox, объекты в другом порядке
+        modified_request(lambda data: data["features"].append(feature(Point(1, 2), name="other"))),
+        modified_request(lambda data: data.update(bbox=[70, 50, 90, 60], name="request")),
+        modified_request(lambda data: data["features"].reverse())
+    ],
+    ids=["zones", "no-zones", "no-buffer", "other-feature", "bbox", "reversed"]
+)
+def test_fast_parsing_matches_pydantic_models(geojson: str) -> None:
+    assert_same_search(parse_route_request(geojson, fast_io=True), parse_route_request(geojson))
+    assert_same_search(parse_route_request(geojson.encode(), fast_io=True), parse_route_request(geojson))
+
+
+def set_geometry(index: int, geometry: Any) -> Any:
+    """Замена геометрии объекта запроса с индексом `index`"""
+
+    return lambda data: data["features"][index].update(geometry=geometry)
+
+
+@pytest.mark.parametrize(
+    "geojson",
+    [
+        "{not json",
+        "[]",
+        modified_request(lambda data: data.update(type="Feature")),
+        modified_request(lambda data: data.update(features={})),
+        modified_request(lambda data: data["features"].pop(1)),
+        modified_request(lambda data: data.update(bbox=[90, 50, 70, 60])),
+        modified_request(lambda data: data["features"][0].pop("properties")),
+        modified_request(set_geometry(0, {"type": "Point", "coordinates": [73.0]})),
+        modified_request(set_geometry(0, {"type": "Point", "coordinates": [73.0, 55.0, 1.0, 2.0]})),
+        modified_request(set_geometry(0, {"type": "Point", "coordinates": ["east", 55.0]})),
+        modified_request(set_geometry(1, {"type": "LineString", "coordinates": [[73.0, 55.0], [74.0, 55.0]]})),
+        modified_request(set_geometry(2, {"type": "MultiPolygon", "coordinates": [[[[78, 53], [79, 53], [79, 54]]]]}))
+    ],
+    ids=[
+        "not-json", "not-object", "not-collection", "features-not-list", "no-finish", "bbox-order", "no-properties",
+        "short-position", "long-position", "string-coordinate", "not-point", "unclosed-ring"
+    ]
+)
+@pytest.mark.parametrize("fast_io", [False, True])
+def test_invalid_requests_raise_value_error(geojson: str, fast_io: bool) -> None:
+    with pytest.raises(ValueError):
+        parse_route_request(geojson, fast_io)
+
+
+@pytest.mark.parametrize(
+    "route",
+    [
+        find_optimal_route(*parse_route_request(ROUTE_REQUEST)),
+        LineString([START_POINT, FINISH_POINT]),
+        LineString([(0.1, 1e-7), (-179.99999999999997, 89.123456789)])
+    ],
+    ids=["found", "direct", "precision"]
+)
+def test_fast_serialization_matches_pydantic_models(route: LineString) -> None:
+    geojson = serialize_route(route, fast_io=True)
+
+    assert geojson == serialize_route(route)
+    assert LineString([tuple(map(float, point)) for point in json.loads(geojson)["coordinates"]]).equals_exact(route, 0)
+
+
+def stream_request(data: dict[str, Any], keys: list[str] | None = None) -> str:
+    """Запрос с ключами FeatureCollection в заданном порядке и неанглийским текстом в свойствах"""
+
+    data = {key: data[key] for key in keys or data}
+    for item in data.get("features", []):
+        item["properties"].setdefault("описание", "запретная зона №1")
+
+    return json.dumps(data, ensure_ascii=False, indent=1)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+@pytest.mark.parametrize("binary", [False, True])
+@pytest.mark.parametrize("keys", [None, ["features", "type"]], ids=["type-first", "features-first"])
+def test_stream_parsing_matches_fast_parsing(chunk_size: int, binary: bool, keys: list[str] | None) -> None:
+    geojson = stream_request(json.loads(ROUTE_REQUEST), keys)
+    stream = io.BytesIO(("\ufeff" + geojson).encode()) if binary else io.StringIO(geojson)
+
+    parsed = parse_route_geojson_stream(stream, chunk_size=chunk_size)
+    expected = parse_route_request(ROUTE_REQUEST, fast_io=True)
+
+    assert parsed.start_point.equals_exact(expected.start_point, 0)
+    assert parsed.finish_point.equals_exact(expected.finish_point, 0)
+
+    # Зоны возвращаются уже буферизованными
+    assert parsed.buffer_distance is None
+    assert parsed.restricted_polygons is not None
+    assert len(parsed.restricted_polygons.geoms) == 1
+    assert parsed.restricted_polygons.geoms[0].equals_exact(
+        buffer_geometry_in_metres(expected.restricted_polygons, BUFFER_DISTANCE, cache=False), 0
+    )
+
+
+def test_stream_route_matches_route_from_text(tmp_path: Path) -> None:
+    path = tmp_path / "request.geojson"
+    path.write_text(ROUTE_REQUEST)
+
+    expected = find_optimal_route_with_geojson(ROUTE_REQUEST, fast_io=True)
+
+    assert find_optimal_route_with_geojson_stream(path) == expected
+    assert find_optimal_route_with_geojson_stream(str(path)) == expected
+    with open(path, "rb") as stream:
+        assert find_optimal_route_with_geojson_stream(stream) == expected
+
+
+def test_multiple_restricted_features_are_merged() -> None:
+    separate_zone = MultiPolygon([box(76, 55.5, 77, 56.5)])
+    overlapping_zone = MultiPolygon([box(81, 54.5, 82, 55.5)])
+
+    data = json.loads(ROUTE_REQUEST)
+    data["features"] += [
+        feature(separate_zone, name="restricted_polygons", buffer_distance=5000),
+        feature(overlapping_zone, name="restricted_polygons")
+    ]
+
+    parsed = parse_route_geojson_stream(io.StringIO(json.dumps(data)), chunk_size=100)
+
+    expected = shapely.union_all([
+        buffer_geometry_in_metres(RESTRICTED_POLYGONS, BUFFER_DISTANCE, cache=False),
+        buffer_geometry_in_metres(separate_zone, 5000, cache=False),
+        overlapping_zone
+    ])
+    assert parsed.restricted_polygons is not None
+    assert len(parsed.restricted_polygons.geoms) == 2
+    assert parsed.restricted_polygons.symmetric_difference(expected).area < 1e-12
+
+    route = find_optimal_route(*parsed)
+    assert not route.crosses(parsed.restricted_polygons)
+
+
+def test_stream_without_restricted_features() -> None:
+    parsed = parse_route_geojson_stream(io.StringIO(route_request(restricted_polygons=None)))
+
+    assert parsed.restricted_polygons is None
+    assert parsed.buffer_distance is None
+
+
+def stream_text(modify: Any) -> str:
+    """Текст запроса, измененный функцией `modify`"""
+
+    data = json.loads(ROUTE_REQUEST)
+    modify(data)
+    return json.dumps(data)
+
+
+@pytest.mark.parametrize(
+    "geojson",
+    [
+        "",
+        "[]",
+        "{}",
+        stream_text(lambda data: data.pop("type")),
+        stream_text(lambda data: data.update(type="Feature")),
+        stream_text(lambda data: data.pop("features")),
+        stream_text(lambda data: data.update(bbox=[90, 50, 70, 60])),
+        stream_text(lambda data: data.update(bbox=[70, 60, 90, 50])),
+        stream_text(lambda data: data.update(bbox=[70, 50, 90])),
+        stream_text(lambda data: data.update(bbox="70,50,90,60")),
+        stream_text(lambda data: data["features"][0].update(bbox=[74, 55, 73, 56])),
+        stream_text(lambda data: data["features"].pop(0)),
+        stream_text(lambda data: data["features"].append(1)),
+        stream_text(lambda data: data["features"][2]["geometry"].update(
+            coordinates=[[[[78, 53], [80, 55], [80, 53], [78, 55], [78, 53]]]]
+        )),
+        ROUTE_REQUEST[:-10],
+        ROUTE_REQUEST + "{}",
+        ROUTE_REQUEST.replace(", ", ",, ", 1)
+    ],
+    ids=[
+        "empty", "array", "empty-object", "no-type", "wrong-type", "no-features", "bbox-longitude", "bbox-latitude",
+        "bbox-short", "bbox-string", "feature-bbox", "no-start", "not-feature", "invalid-zone", "truncated",
+        "trailing-data", "extra-comma"
+    ]
+)
+@pytest.mark.parametrize("chunk_size", [3, 1 << 20])
+def test_invalid_streams_raise_value_error(geojson: str, chunk_size: int) -> None:
+    with pytest.raises(ValueError):
+        parse_route_geojson_stream(io.StringIO(geojson), chunk_size=chunk_size)
+
+
+def test_features_are_read_one_by_one() -> None:
+    geojson = stream_text(lambda data: data["features"].append("not a feature"))
+    features = iter_geojson_features(io.StringIO(geojson), chunk_size=16)
+
+    # Объекты выдаются по мере чтения, ошибка в объекте обнаруживается только при его чтении
+    assert [next(features)["properties"]["name"] for _ in range(3)] == [
+        "start_point", "finish_point", "restricted_polygons"
+    ]
+    with pytest.raises(ValueError):
+        next(features)
@@ -0,0 +1,98 @@
+import tracemalloc
+
+import pytest
+
+from optimal_route.main import find_optimal_route, find_optimal_route_with_geojson, parse_route_request
+from optimal_route.profiling import RouteProfiler, StageRecord
+from tests.fixtures import BUFFER_DISTANCE, FINISH_POINT, RESTRICTED_POLYGONS, ROUTE_REQUEST, START_POINT
+
+
+def test_repeated_stages_are_summed() -> None:
+    calls: list[tuple[str, dict[str, int]]] = []
+    profiler = RouteProfiler(lambda name, duration, sizes: calls.append((name, sizes)))
+
+    for count in (2, 3):
+        with profiler.stage("edge_filtering") as sizes:
+            sizes["kept_edges"] = count
+    with profiler.stage("search") as sizes:
+        sizes["expanded_nodes"] = 5
+
+    assert [record.name for record in profiler.stages] == ["edge_filtering", "search"]
+    assert profiler.stages[0].sizes == {"kept_edges": 5}
+    assert calls == [
+        ("edge_filtering", {"kept_edges": 2}), ("edge_filtering", {"kept_edges": 3}), ("search", {"expanded_nodes": 5})
+    ]
+
+
+def test_stage_is_recorded_on_error() -> None:
+    profiler = RouteProfiler()
+
+    with pytest.raises(ValueError):
+        with profiler.stage("parsing"):
+            raise ValueError
+
+    assert [record.name for record in profiler.stages] == ["parsing"]
+
+
+ZONE_STAGES = ["zone_validation", "buffering", "holes", "vertices", "edge_filter_index", "point_checks"]
+GRAPH_STAGES = ["edge_generation", "edge_filtering", "edge_lengths", "graph_construction", "terminal_edges", "search"]
+
+
+@pytest.mark.parametrize(
+    "graph_builder, expected_stages",
+    [
+        ("visibility", ZONE_STAGES + GRAPH_STAGES),
+        ("tangent", ZONE_STAGES + GRAPH_STAGES),
+        ("lazy", ZONE_STAGES + ["terminal_edges", "lazy_edges", "search"])
+    ]
+)
+def test_route_stages_are_reported(graph_builder: str, expected_stages: list[str]) -> None:
+    calls: list[StageRecord] = []
+    profiler = RouteProfiler(lambda name, duration, sizes: calls.append(StageRecord(name, duration, sizes)))
+
+    find_optimal_route(
+        START_POINT, FINISH_POINT, RESTRICTED_POLYGONS, BUFFER_DISTANCE,
+        graph_builder=graph_builder, profiler=profiler, corridor_pruning=False
+    )
+
+    names = [record.name for record in profiler.stages]
+    assert names == expected_stages
+    assert {record.name for record in calls} == set(names)
+    assert all(record.duration >= 0 for record in profiler.stages)
+
+    sizes = {record.name: record.sizes for record in profiler.stages}
+    assert sizes["zone_validation"]["zone_vertices"] == 5
+    assert sizes["vertices"]["vertices"] == 4
+    assert sizes["search"]["expanded_nodes"] > 0
+
+    # Длительность этапа равна сумме длительностей его выполнений
+    for record in profiler.stages:
+        assert record.duration == pytest.approx(sum(call.duration for call in calls if call.name == record.name))
+
+
+def test_geojson_stages_report_sizes() -> None:
+    profiler = RouteProfiler()
+
+    geojson = find_optimal_route_with_geojson(ROUTE_REQUEST, profiler=profiler)
+
+    sizes = {record.name: record.sizes for record in profiler.stages}
+    assert [record.name for record in profiler.stages][0] == "parsing"
+    assert sizes["parsing"]["input_bytes"] == len(ROUTE_REQUEST)
+    assert sizes["serialization"]["output_bytes"] == len(geojson)
+    assert "search" in sizes
+
+
+def test_profile_and_memory_capture() -> None:
+    profiler = RouteProfiler(cprofile=True, trace_memory=True)
+
+    find_optimal_route(*parse_route_request(ROUTE_REQUEST), profiler=profiler)
+
+    assert profiler.profile_stats is not None
+    assert profiler.profile_stats.total_calls > 0  # type: ignore[attr-defined]
+    assert profiler.memory_peak and profiler.memory_peak > 0
+    assert profiler.memory_snapshot is not None
+    assert not tracemalloc.is_tracing()
+
+    report = profiler.as_dict()
+    assert report["memory_peak"] == profiler.memory_peak
+    assert [stage["name"] for stage in report["stages"]] == [record.name for record in profiler.stages]
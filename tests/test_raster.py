@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+import shapely
+from pyproj import Geod
+from shapely import MultiPolygon, Point, Polygon
+
+from optimal_route.engine import RouteEngine
+from optimal_route.main import find_approximate_route
+from optimal_route.utils.raster import OCTILE_FACTOR, fill_cells, lattice_distances, raster_grid
+from tests.fixtures import BUFFER_DISTANCE, FINISH_POINT, POINT_IN_ZONE, RESTRICTED_POLYGONS, START_POINT, star_zones
+
+
+GEOD = Geod(ellps="WGS84")
+
+
+def test_fill_cells_marks_cells_with_centers_inside() -> None:
+    polygon = Polygon([(0.3, 0.2), (9.7, 1.1), (5.2, 8.9), (4.9, 4.1)], [[(4.13, 2.07), (6.21, 2.18), (5.07, 3.31)]])
+    grid = raster_grid(polygon.bounds, 0.5)
+
+    cells = fill_cells(polygon, grid)
+
+    rows, cols = np.indices(grid.shape)
+    xs = grid.origin[0] + (cols + 0.5) * grid.resolution
+    ys = grid.origin[1] + (rows + 0.5) * grid.resolution
+    assert np.array_equal(cells, shapely.contains_xy(polygon, xs, ys))
+
+
+def test_free_lattice_distances_are_close_to_straight_lines() -> None:
+    free = np.ones((12, 15), dtype=bool)
+
+    distances = lattice_distances(free, 2.0, np.array([0]), np.zeros(1))
+    knight_distances = lattice_distances(free, 2.0, np.array([0]), np.zeros(1), knight_moves=True)
+
+    rows, cols = np.indices(distances.shape)
+    straight = 2.0 * np.hypot(rows, cols)
+    octile = 2.0 * (np.abs(rows - cols) + np.sqrt(2) * np.minimum(rows, cols))
+
+    assert np.allclose(distances, octile)
+    assert np.all(distances <= straight * OCTILE_FACTOR + 1e-9)
+    assert np.all(knight_distances >= straight - 1e-9)
+    assert np.all(knight_distances <= distances + 1e-9)
+    assert knight_distances[2, 1] == pytest.approx(2.0 * np.sqrt(5))
+
+
+@pytest.mark.parametrize("knight_moves", [False, True])
+def test_blocked_cells_only_lengthen_lattice_paths(knight_moves: bool) -> None:
+    free = np.random.default_rng(0).random((20, 20)) > 0.3
+    # Угол (5, 5) окружен занятыми ячейками
+    free[4:6, 4:6] = False
+
+    sources, source_distances = np.array([0, 440]), np.array([0.0, 3.0])
+    distances = lattice_distances(free, 1.0, sources, source_distances, knight_moves)
+    free_distances = lattice_distances(np.ones_like(free), 1.0, sources, source_distances, knight_moves)
+
+    assert np.all(distances >= free_distances - 1e-9)
+    assert distances[5, 5] == np.inf
+    assert distances.reshape(-1)[440] == 3.0
+
+
+def exact_length(zone: MultiPolygon, buffer_distance: float | None, start_point: Point, finish_point: Point) -> float:
+    route = RouteEngine(zone, buffer_distance).find_route(start_point, finish_point)
+    return GEOD.geometry_length(route)
+
+
+@pytest.mark.parametrize(
+    "zone, buffer_distance, start_point, finish_point, resolution",
+    [
+        (RESTRICTED_POLYGONS, BUFFER_DISTANCE, START_POINT, FINISH_POINT, 1000),
+        (RESTRICTED_POLYGONS, BUFFER_DISTANCE, START_POINT, FINISH_POINT, 5000),
+        (star_zones(8, seed=5), None, Point(71, 54), Point(87, 54.5), 5000),
+        (star_zones(8, holes=True, seed=6), 2000, Point(71, 56), Point(87, 52), 4000)
+    ],
+    ids=["fine", "coarse", "stars", "holes"]
+)
+def test_approximate_route_is_bounded_by_exact_route(
+    zone: MultiPolygon,
+    buffer_distance: float | None,
+    start_point: Point,
+    finish_point: Point,
+    resolution: float
+) -> None:
+    route, length, error_bound = find_approximate_route(start_point, finish_point, zone, buffer_distance, resolution)
+    exact = exact_length(zone, buffer_distance, start_point, finish_point)
+
+    assert route.coords[0] == start_point.coords[0] and route.coords[-1] == finish_point.coords[0]
+    assert not route.crosses(zone) and not zone.contains(route)
+    assert length == pytest.approx(GEOD.geometry_length(route), rel=1e-9)
+
+    # Нижняя граница длины точного маршрута не превышает его длину
+    assert exact <= length * (1 + 1e-9)
+    assert 0 < length - error_bound <= exact * (1 + 1e-9)
+
+
+def test_direct_approximate_route_has_no_error() -> None:
+    start_point, finish_point = Point(73, 52), Point(75, 52.5)
+
+    for zone in (RESTRICTED_POLYGONS, None):
+        route, length, error_bound = find_approximate_route(start_point, finish_point, zone)
+
+        assert list(route.coords) == [start_point.coords[0], finish_point.coords[0]]
+        assert length == pytest.approx(GEOD.geometry_length(route))
+        assert error_bound == 0
+
+
+@pytest.mark.parametrize(
+    "start_point, resolution",
+    [(POINT_IN_ZONE, 1000), (START_POINT, 1)],
+    ids=["point-in-zone", "too-many-cells"]
+)
+def test_approximate_route_errors(start_point: Point, resolution: float) -> None:
+    with pytest.raises(ValueError):
+        find_approximate_route(start_point, FINISH_POINT, RESTRICTED_POLYGONS, BUFFER_DISTANCE, resolution)
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from shapely import Point
+
+from optimal_route import main
+from optimal_route.main import find_optimal_route, find_optimal_routes, find_optimal_routes_with_geojson
+from tests.fixtures import (
+    BUFFER_DISTANCE,
+    FINISH_POINT,
+    POINT_IN_ZONE,
+    RESTRICTED_POLYGONS,
+    START_POINT,
+    batch_request,
+    feature_collection
+)
+
+
+PAIRS = [
+    (START_POINT, FINISH_POINT),
+    (POINT_IN_ZONE, FINISH_POINT),
+    (FINISH_POINT, START_POINT),
+    (Point(75, 58), Point(84, 52))
+]
+
+
+def test_empty_pairs_do_not_prepare_zones(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*args, **kwargs):
+        raise AssertionError("Запретные зоны не должны подготавливаться")
+
+    monkeypatch.setattr(main, "RouteEngine", fail)
+    monkeypatch.setattr(main, "ProcessPoolExecutor", fail)
+
+    assert find_optimal_routes([], RESTRICTED_POLYGONS, BUFFER_DISTANCE, workers=4) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_routes_are_returned_in_input_order(workers: int) -> None:
+    results = find_optimal_routes(PAIRS, RESTRICTED_POLYGONS, BUFFER_DISTANCE, workers)
+
+    assert len(results) == len(PAIRS)
+    for (start_point, finish_point), result in zip(PAIRS, results):
+        if start_point == POINT_IN_ZONE:
+            assert result.route is None and result.error
+        else:
+            expected = find_optimal_route(start_point, finish_point, RESTRICTED_POLYGONS, BUFFER_DISTANCE)
+            assert result.error is None
+            assert result.route.equals_exact(expected, 1e-12)
+
+
+def test_geojson_batch_reports_errors_per_route() -> None:
+    collection = json.loads(find_optimal_routes_with_geojson(batch_request(PAIRS), workers=1))
+
+    assert [feature["geometry"] is None for feature in collection["features"]] == [False, True, False, False]
+    assert collection["features"][1]["properties"]["error"]
+
+
+@pytest.mark.parametrize(
+    "geojson",
+    [
+        "[1, 2]",
+        feature_collection([("start_point", START_POINT), ("start_point", START_POINT), ("finish_point", FINISH_POINT)])
+    ]
+)
+def test_geojson_batch_rejects_invalid_data(geojson: str) -> None:
+    with pytest.raises(ValueError):
+        find_optimal_routes_with_geojson(geojson)
@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import pytest
+
+from optimal_route.main import find_optimal_route_with_geojson
+from optimal_route.service import RouteService, ServiceOverloaded, serve
+from tests.fixtures import ROUTE_REQUEST
+
+
+async def http_request(port: int, request: bytes) -> tuple[int, dict | str]:
+    """Отправка запроса в сервис, возвращаются код ответа и тело ответа"""
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(request)
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(body)
+
+
+def post(body: str | bytes, path: str = "/route") -> bytes:
+    body = body.encode() if isinstance(body, str) else body
+    return (
+        f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+
+
+def run_with_service(scenario, **parameters):
+    async def main():
+        service = RouteService(workers=1, **parameters)
+        server = await serve(service, port=0)
+        try:
+            return await scenario(service, server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+
+    return asyncio.run(main())
+
+
+def test_identical_requests_are_coalesced() -> None:
+    async def scenario(service: RouteService, port: int):
+        routes = await asyncio.gather(*(service.find_route(ROUTE_REQUEST) for _ in range(3)))
+        return routes, service.stats
+
+    routes, stats = run_with_service(scenario)
+
+    assert routes == [find_optimal_route_with_geojson(ROUTE_REQUEST)] * 3
+    assert stats.coalesced == 2
+    assert stats.running == stats.queued == 0
+
+
+def test_full_queue_rejects_requests() -> None:
+    async def scenario(service: RouteService, port: int):
+        requests = [ROUTE_REQUEST, ROUTE_REQUEST.replace("73.35857", "73.35858")]
+        return await asyncio.gather(*(service.find_route(request) for request in requests), return_exceptions=True)
+
+    first, second = run_with_service(scenario, max_concurrency=1, max_queue=1)
+
+    assert isinstance(first, str)
+    assert isinstance(second, ServiceOverloaded)
+
+
+@pytest.mark.parametrize(
+    "request_bytes",
+    [
+        post("[1,2]"),
+        post("{not json"),
+        post('{"type":"FeatureCollection","features":[]}'),
+        b"GARBAGE\r\n\r\n",
+        b"POST /route HTTP/1.1\r\nContent-Length: abc\r\n\r\n"
+    ],
+    ids=["array", "invalid-json", "no-points", "request-line", "content-length"]
+)
+def test_malformed_input_gets_bad_request(request_bytes: bytes) -> None:
+    async def scenario(service: RouteService, port: int):
+        return await http_request(port, request_bytes)
+
+    status, payload = run_with_service(scenario)
+
+    assert status == 400
+    assert payload["error"]
+
+
+def test_route_request_over_http() -> None:
+    async def scenario(service: RouteService, port: int):
+        return await http_request(port, post(ROUTE_REQUEST))
+
+    status, payload = run_with_service(scenario)
+
+    assert status == 200
+    assert payload["type"] == "LineString"
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+import shapely
+from pyproj import Geod
+from shapely import MultiPolygon, Point, Polygon
+
+from optimal_route.main import find_optimal_route
+from optimal_route.utils.simplify import simplify_geometry_in_metres
+
+
+# Зона с северной стороной вдоль геодезической линии на высокой широте: в долготе и широте
+# сторона выгнута к полюсу, а в локальной проекции почти прямая
+GEODESIC_EDGE = Geod(ellps="WGS84").npts(20, 70, 40, 70, 200)
+GEODESIC_TOP = max(lat for _, lat in GEODESIC_EDGE)
+HIGH_LATITUDE_ZONE = Polygon([(20, 65), (40, 65), (40, 70), *reversed(GEODESIC_EDGE), (20, 70)])
+
+
+def detailed_zone() -> Polygon:
+    """Многоугольник с мелкими неровностями границы, которые убираются упрощением"""
+
+    rng = np.random.default_rng(0)
+    angles = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    radii = 0.4 + rng.uniform(-0.005, 0.005, len(angles))
+    return Polygon(np.column_stack((80 + np.cos(angles) * radii, 55 + np.sin(angles) * radii)))
+
+
+@pytest.mark.parametrize("tolerance", [100, 1000, 5000])
+def test_simplified_zone_contains_high_latitude_zone(tolerance: float) -> None:
+    assert simplify_geometry_in_metres(HIGH_LATITUDE_ZONE, tolerance).contains(HIGH_LATITUDE_ZONE)
+
+
+def test_route_around_simplified_zone_avoids_original_zone() -> None:
+    route = find_optimal_route(
+        Point(22, GEODESIC_TOP + 0.003),
+        Point(28, GEODESIC_TOP + 0.003),
+        MultiPolygon([HIGH_LATITUDE_ZONE]),
+        simplify_tolerance=1000
+    )
+
+    assert not route.intersects(HIGH_LATITUDE_ZONE)
+
+
+@pytest.mark.parametrize("tolerance", [100, 1000])
+def test_simplification_reduces_vertices_outward(tolerance: float) -> None:
+    zone = detailed_zone()
+    simplified = simplify_geometry_in_metres(zone, tolerance)
+
+    assert simplified.contains(zone)
+    assert shapely.get_num_coordinates(simplified) < shapely.get_num_coordinates(zone)
+    assert shapely.hausdorff_distance(simplified, zone) < tolerance / 111_000 * 2
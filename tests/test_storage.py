@@ -0,0 +1,134 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from shapely import Point
+
+from optimal_route.engine import RouteEngine
+from optimal_route.utils.storage import read_arrays, write_arrays
+from tests.fixtures import BUFFER_DISTANCE, FINISH_POINT, RESTRICTED_POLYGONS, START_POINT, star_zones
+
+
+ARRAYS = {
+    "bytes": np.arange(13, dtype=np.uint8),
+    "empty": np.empty(0, dtype=np.int64),
+    "coords": np.linspace(0, 1, 14).reshape(7, 2),
+    "indices": np.array([3, -1, 2], dtype=np.int32),
+    "flags": np.array([True, False, True])
+}
+
+ZONE = star_zones(8, seed=4)
+ROUTE_POINTS = [(START_POINT, FINISH_POINT), (Point(70.5, 51.5), Point(87.5, 57)), (Point(70.5, 57), Point(87.5, 51.5))]
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_arrays_round_trip(tmp_path: Path, mmap: bool) -> None:
+    path = tmp_path / "arrays.bin"
+    metadata = {"version": 1, "key": "зоны", "nested": {"items": [1, 2.5, None]}}
+
+    write_arrays(path, metadata, ARRAYS)
+    loaded_metadata, arrays = read_arrays(path, mmap)
+
+    assert loaded_metadata == metadata
+    assert arrays.keys() == ARRAYS.keys()
+    for name, array in ARRAYS.items():
+        assert arrays[name].dtype == array.dtype
+        assert np.array_equal(arrays[name], array)
+
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_mapped_arrays_are_aligned_and_read_only(tmp_path: Path) -> None:
+    path = tmp_path / "arrays.bin"
+    write_arrays(path, {}, ARRAYS)
+
+    _, arrays = read_arrays(path)
+
+    for array in arrays.values():
+        assert array.ctypes.data % 64 == 0
+        assert not array.flags.writeable
+
+
+def test_rewritten_file_does_not_change_mapped_arrays(tmp_path: Path) -> None:
+    path = tmp_path / "arrays.bin"
+    write_arrays(path, {}, {"values": np.arange(4.0)})
+    _, arrays = read_arrays(path)
+
+    write_arrays(path, {}, {"values": np.zeros(4)})
+
+    assert np.array_equal(arrays["values"], np.arange(4.0))
+    assert np.array_equal(read_arrays(path)[1]["values"], np.zeros(4))
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"ORARR", b"NOTARRAY" + bytes(8), None],
+    ids=["empty", "short", "magic", "truncated"]
+)
+def test_corrupted_file_raises_value_error(tmp_path: Path, content: bytes | None) -> None:
+    path = tmp_path / "arrays.bin"
+
+    if content is None:
+        write_arrays(path, {}, ARRAYS)
+        content = path.read_bytes()[:-16]
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError):
+        read_arrays(path)
+
+
+@pytest.mark.parametrize("graph_builder", ["visibility", "tangent", "lazy"])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_saved_engine_finds_same_routes(tmp_path: Path, graph_builder: str, mmap: bool) -> None:
+    path = tmp_path / "zones.bin"
+    engine = RouteEngine(ZONE, BUFFER_DISTANCE, graph_builder=graph_builder)
+    engine.save(path)
+
+    loaded = RouteEngine.load(path, engine.key, mmap)
+
+    assert loaded.key == engine.key
+    assert loaded.restricted_polygons is not None
+    assert loaded.restricted_polygons.equals_exact(engine.restricted_polygons, 0)
+
+    for start_point, finish_point in ROUTE_POINTS:
+        assert loaded.find_route(start_point, finish_point).equals_exact(engine.find_route(start_point, finish_point), 0)
+
+    with pytest.raises(ValueError):
+        loaded.add_zone(RESTRICTED_POLYGONS)
+
+
+def test_saved_engine_without_zones(tmp_path: Path) -> None:
+    path = tmp_path / "zones.bin"
+    RouteEngine().save(path)
+
+    loaded = RouteEngine.load(path)
+
+    assert loaded.restricted_polygons is None
+    assert loaded.find_route(START_POINT, FINISH_POINT).equals_exact(RouteEngine().find_route(START_POINT, FINISH_POINT), 0)
+
+
+def test_load_rejects_other_zones(tmp_path: Path) -> None:
+    path = tmp_path / "zones.bin"
+    RouteEngine(ZONE, BUFFER_DISTANCE).save(path)
+
+    for engine in (
+        RouteEngine(ZONE, 2 * BUFFER_DISTANCE),
+        RouteEngine(ZONE, BUFFER_DISTANCE, graph_builder="tangent"),
+        RouteEngine(RESTRICTED_POLYGONS, BUFFER_DISTANCE)
+    ):
+        with pytest.raises(ValueError):
+            RouteEngine.load(path, engine.key)
+
+
+def test_open_compiles_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "zones.bin"
+
+    engine = RouteEngine.open(path, ZONE, BUFFER_DISTANCE)
+    assert path.exists()
+
+    # Повторное открытие загружает файл без компиляции зон
+    monkeypatch.setattr(RouteEngine, "__init__", lambda *args, **kwargs: pytest.fail("зоны скомпилированы заново"))
+    loaded = RouteEngine.open(path, ZONE, BUFFER_DISTANCE)
+
+    assert loaded.key == engine.key
+    assert loaded.find_route(START_POINT, FINISH_POINT).equals_exact(engine.find_route(START_POINT, FINISH_POINT), 0)
@@ -0,0 +1,165 @@
+import heapq
+from itertools import combinations
+
+import numpy as np
+import pytest
+import shapely
+from pyproj import Geod
+from shapely import LineString, MultiPolygon, Point, Polygon
+
+from optimal_route.engine import RouteEngine
+from optimal_route.utils.visibility import (
+    EdgeFilter, convex_vertices, filter_visible_edges, tangent_mask, tangent_pairs, vertex_pairs
+)
+from tests.fixtures import star_zones
+
+
+def legacy_filter_edges(edges, zone: MultiPolygon) -> set:
+    """Исходный отбор ребер: проверка каждого ребра против всего MultiPolygon"""
+
+    return {edge for edge in edges if not LineString(edge).crosses(zone) and not zone.contains(LineString(edge))}
+
+
+def zone_edges(zone: MultiPolygon) -> list:
+    """Все пары вершин внешних и внутренних колец зоны"""
+
+    vertices = {
+        coords
+        for polygon in zone.geoms
+        for ring in (polygon.exterior, *polygon.interiors)
+        for coords in ring.coords
+    }
+    return list(combinations(sorted(vertices), 2))
+
+
+# Касание сторон и вершин, ребра вдоль сторон и через отверстие
+HANDMADE_ZONE = MultiPolygon([
+    Polygon([(0, 0), (4, 0), (4, 4), (0, 4)], [[(1, 1), (1, 3), (3, 3), (3, 1)]]),
+    Polygon([(4, 4), (6, 4), (6, 6), (4, 6)]),
+    Polygon([(7, 0), (9, 2), (7, 4), (8, 2)])
+])
+
+
+@pytest.mark.parametrize(
+    "zone",
+    [
+        HANDMADE_ZONE,
+        star_zones(12),
+        star_zones(12, convex=True),
+        star_zones(12, clustered=True),
+        star_zones(12, holes=True),
+        star_zones(12, holes=True, clustered=True, seed=1)
+    ],
+    ids=["handmade", "concave", "convex", "concave-clustered", "holes", "holes-clustered"]
+)
+def test_filter_visible_edges_matches_legacy_filter(zone: MultiPolygon) -> None:
+    edges = zone_edges(zone)
+
+    assert filter_visible_edges(edges, zone) == legacy_filter_edges(edges, zone)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_polygon_mask_matches_filter_of_marked_polygons(seed: int) -> None:
+    zone = star_zones(12, holes=True, seed=seed)
+    polygons = shapely.get_parts(zone)
+
+    rng = np.random.default_rng(seed)
+    marked = rng.random(len(polygons)) < 0.5
+    marked[0] = True
+
+    edges = np.array(zone_edges(zone))
+    starts, ends = edges[:, 0], edges[:, 1]
+
+    expected = EdgeFilter(MultiPolygon(polygons[marked].tolist())).visible(starts, ends)
+    assert np.array_equal(EdgeFilter(zone).visible(starts, ends, marked), expected)
+
+
+# Вогнутые вершины (2, 2) и (6, 1), точка (1, 0) на прямом участке и общая вершина (4, 0) двух многоугольников
+CONCAVE_ZONE = MultiPolygon([
+    Polygon([(0, 0), (1, 0), (4, 0), (4, 4), (2, 2), (0, 4)]),
+    Polygon([(4, 0), (7, 0), (7, 2), (6, 1)])
+])
+
+
+def test_convex_vertices_drop_reflex_vertices() -> None:
+    vertices = convex_vertices(CONCAVE_ZONE)
+    coords = [tuple(point) for point in vertices.coords.tolist()]
+
+    # Поворот в точке на прямом участке не определен достоверно, поэтому она остается в графе
+    assert sorted(coords) == [(0, 0), (0, 4), (1, 0), (4, 0), (4, 4), (7, 0), (7, 2)]
+
+    # У общей вершины многоугольников нет единственной пары соседей
+    shared = coords.index((4, 0))
+    assert np.isnan(vertices.prev[shared]).all() and np.isnan(vertices.next[shared]).all()
+
+    corner = coords.index((4, 4))
+    assert {tuple(vertices.prev[corner]), tuple(vertices.next[corner])} == {(4, 0), (2, 2)}
+
+
+@pytest.mark.parametrize(
+    "zone",
+    [
+        CONCAVE_ZONE,
+        star_zones(10, holes=True, seed=0),
+        star_zones(10, convex=True, clustered=True, seed=1),
+        star_zones(30, vertices_per_polygon=40, convex=True, seed=2)
+    ],
+    ids=["concave", "holes", "convex-clustered", "convex"]
+)
+@pytest.mark.parametrize("block_size", [7, 2_000_000])
+def test_tangent_pairs_cover_tangent_edges(zone: MultiPolygon, block_size: int) -> None:
+    points, prev, next = convex_vertices(zone)
+
+    pairs = [pair for u, v in tangent_pairs(points, prev, next, block_size) for pair in zip(u.tolist(), v.tolist())]
+
+    tangent = set()
+    for u, v in vertex_pairs(len(points)):
+        mask = tangent_mask(points[u], prev[u], next[u], points[v]) & tangent_mask(points[v], prev[v], next[v], points[u])
+        tangent.update(zip(u[mask].tolist(), v[mask].tolist()))
+
+    # Каждая пара перебирается один раз, и среди пар есть все касательные отрезки
+    assert all(u < v for u, v in pairs)
+    assert len(pairs) == len(set(pairs))
+    assert tangent <= set(pairs)
+
+
+def shortest_route_length(zone: MultiPolygon, start_point: Point, finish_point: Point) -> float:
+    """Длина кратчайшего маршрута по графу видимости между всеми вершинами зоны (алгоритм Дейкстры)"""
+
+    geod = Geod(ellps="WGS84")
+    points = sorted({
+        coords for polygon in zone.geoms for ring in (polygon.exterior, *polygon.interiors) for coords in ring.coords
+    })
+    points = [start_point.coords[0], *points, finish_point.coords[0]]
+
+    neighbours: dict[tuple, list[tuple[float, tuple]]] = {point: [] for point in points}
+    for start, end in filter_visible_edges(combinations(points, 2), zone):
+        length = geod.line_length([start[0], end[0]], [start[1], end[1]])
+        neighbours[start].append((length, end))
+        neighbours[end].append((length, start))
+
+    distances = {points[0]: 0.0}
+    queue = [(0.0, points[0])]
+    while queue:
+        distance, point = heapq.heappop(queue)
+        if point == points[-1]:
+            return distance
+        for length, neighbour in neighbours[point]:
+            if distance + length < distances.get(neighbour, np.inf):
+                distances[neighbour] = distance + length
+                heapq.heappush(queue, (distance + length, neighbour))
+
+    return np.inf
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_route_over_convex_vertices_is_shortest(seed: int) -> None:
+    zone = star_zones(10, holes=True, seed=seed)
+    start_point, finish_point = Point(70.5, 51 + seed), Point(87.5, 57 - seed)
+
+    route = RouteEngine(zone).find_route(start_point, finish_point)
+
+    assert not route.crosses(zone)
+    assert Geod(ellps="WGS84").geometry_length(route) == pytest.approx(
+        shortest_route_length(zone, start_point, finish_point), rel=1e-9
+    )
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+from pyproj import Geod
+from shapely import LineString, MultiPoint, Point
+
+from optimal_route.engine import RouteEngine
+from optimal_route.main import find_optimal_route_through_waypoints, find_optimal_route_through_waypoints_with_geojson
+from optimal_route.profiling import RouteProfiler
+from tests.fixtures import (
+    BUFFER_DISTANCE, FINISH_POINT, POINT_IN_ZONE, RESTRICTED_POLYGONS, START_POINT, feature, route_request
+)
+
+
+# Маршрут огибает зону с севера, затем с юга, последний участок идет по прямой
+WAYPOINTS = [Point(80, 56), Point(80, 52), Point(84, 52.5)]
+POINTS = [START_POINT, *WAYPOINTS, FINISH_POINT]
+
+GEOD = Geod(ellps="WGS84")
+
+
+@pytest.mark.parametrize("graph_builder", ["visibility", "tangent", "lazy"])
+def test_waypoint_route_matches_legs(graph_builder: str) -> None:
+    stages: list[str] = []
+    profiler = RouteProfiler(lambda name, duration, sizes: stages.append(name))
+
+    route, leg_lengths, length = find_optimal_route_through_waypoints(
+        POINTS, RESTRICTED_POLYGONS, BUFFER_DISTANCE, graph_builder=graph_builder, profiler=profiler
+    )
+
+    engine = RouteEngine(RESTRICTED_POLYGONS, BUFFER_DISTANCE, graph_builder=graph_builder)
+    legs = [engine.find_route(start_point, finish_point) for start_point, finish_point in zip(POINTS, POINTS[1:])]
+
+    assert leg_lengths == pytest.approx([GEOD.geometry_length(leg) for leg in legs], rel=1e-9)
+    assert length == pytest.approx(sum(leg_lengths), rel=1e-12)
+    assert length == pytest.approx(GEOD.geometry_length(route), rel=1e-9)
+
+    # Маршрут проходит через все точки в заданном порядке, точки между участками не повторяются
+    coords = list(route.coords)
+    assert coords == [point for leg in legs for point in leg.coords[:-1]] + [FINISH_POINT.coords[0]]
+    positions = [coords.index(point.coords[0]) for point in POINTS]
+    assert positions == sorted(positions)
+    assert not route.crosses(engine.restricted_polygons)
+
+    # Граф строится один раз, вершины, видимые из каждой точки, вычисляются один раз
+    assert stages.count("graph_construction") <= 1
+    assert stages.count("terminal_edges") <= len(POINTS)
+
+
+def test_two_point_route_matches_find_route() -> None:
+    route, leg_lengths, length = find_optimal_route_through_waypoints(
+        [START_POINT, FINISH_POINT], RESTRICTED_POLYGONS, BUFFER_DISTANCE
+    )
+
+    expected = RouteEngine(RESTRICTED_POLYGONS, BUFFER_DISTANCE).find_route(START_POINT, FINISH_POINT)
+    assert route.equals_exact(expected, 0)
+    assert leg_lengths == [length]
+
+
+def test_repeated_waypoint_and_no_zones() -> None:
+    route, leg_lengths, length = find_optimal_route_through_waypoints([START_POINT, START_POINT, FINISH_POINT])
+
+    assert leg_lengths[0] == 0
+    assert list(route.coords) == [START_POINT.coords[0], START_POINT.coords[0], FINISH_POINT.coords[0]]
+    assert length == pytest.approx(GEOD.geometry_length(LineString([START_POINT, FINISH_POINT])))
+
+
+@pytest.mark.parametrize(
+    "points",
+    [[START_POINT], [START_POINT, POINT_IN_ZONE, FINISH_POINT]],
+    ids=["one-point", "waypoint-in-zone"]
+)
+def test_invalid_waypoints_raise_value_error(points: list[Point]) -> None:
+    with pytest.raises(ValueError):
+        find_optimal_route_through_waypoints(points, RESTRICTED_POLYGONS, BUFFER_DISTANCE)
+
+
+def test_waypoint_route_with_geojson() -> None:
+    data = json.loads(route_request())
+    data["features"].append(feature(MultiPoint(WAYPOINTS), name="waypoints"))
+
+    result = json.loads(find_optimal_route_through_waypoints_with_geojson(json.dumps(data)))
+    expected = find_optimal_route_through_waypoints(POINTS, RESTRICTED_POLYGONS, BUFFER_DISTANCE)
+
+    assert result["type"] == "Feature"
+    assert LineString([tuple(map(float, point)) for point in result["geometry"]["coordinates"]]).equals_exact(
+        expected.route, 0
+    )
+    assert result["properties"]["leg_lengths"] == pytest.approx(expected.leg_lengths)
+    assert result["properties"]["length"] == pytest.approx(expected.length)
+
+    # Без промежуточных точек маршрут состоит из одного участка
+    result = json.loads(find_optimal_route_through_waypoints_with_geojson(route_request()))
+    assert len(result["properties"]["leg_lengths"]) == 1